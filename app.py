@@ -1,17 +1,211 @@
-from xml.parsers.expat import model
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from neuro_modules import ui  # Az önce yarattığımız görselci
 from neuro_modules import market_data
 from neuro_modules import news_scraper
 from neuro_modules import ai_engine
+from neuro_modules import telemetry
+from neuro_modules.pipeline import Stage, run_stages
+from neuro_modules.analysis_store import get_analysis_store, EXPORT_FORMATS
+import os
+import time
+import threading
 
 
 # Sayfa Ayarları
 st.set_page_config(page_title="NeuroQuant v2.0", page_icon="🧠", layout="wide")
 
+def _streamlit_thread_initializer():
+    """Havuzdaki iş parçacıklarına Streamlit oturum bağlamını taşır (st.error vb. çalışsın)."""
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+# --- ANALİZ ÖNBELLEĞİ ---
+# Streamlit her etkileşimde (sekme, Gemini butonu...) main'i baştan çalıştırır.
+# Analiz paketi oturumda saklanır; TTL dolana ya da "Yenile"ye basılana kadar
+# veri, haber, LSTM ve FinBERT tekrar çalışmaz, sadece çıktı yeniden çizilir.
+ANALYSIS_PERIOD = "1y"
+ANALYSIS_TTL = float(os.environ.get("NEUROQUANT_ANALYSIS_TTL", 300))  # saniye
+ANALYSIS_CACHE_SIZE = 8  # Oturum başına saklanan en fazla hisse
+
+def _analysis_key(ticker):
+    """
+    (ticker, period, gün): Günlük barlarda yeni işlem günü yeni veri demektir;
+    gün değişince eski paket kendiliğinden geçersiz olur. Gün içi tazelik TTL ile sağlanır.
+    """
+    return (ticker, ANALYSIS_PERIOD, time.strftime('%Y-%m-%d'))
+
+def get_analysis(ticker, force=False, ttl=ANALYSIS_TTL):
+    """
+    Hisse için analiz paketini döndürür; taze kopya varsa hattı çalıştırmaz.
+
+    Returns:
+        (analysis, from_cache): analysis None olabilir (modeller yüklenemediyse)
+    """
+    cache = st.session_state.setdefault('analysis_cache', {})
+    key = _analysis_key(ticker)
+    entry = cache.get(key)
+    if entry is not None and not force and time.time() - entry['created_at'] < ttl:
+        return entry['analysis'], True
+
+    # Zorla yenilemede OHLCV önbelleği de atlanır (yoksa aynı barlar yeniden analiz edilir)
+    analysis = run_analysis(ticker, refresh=force)
+    if analysis is not None:
+        analysis['store_id'] = save_analysis(ticker, analysis)
+        cache.pop(key, None)
+        cache[key] = {'analysis': analysis, 'created_at': time.time(),
+                      'last_bar': analysis['df'].index[-1]}
+        # En eski girdileri at (dict ekleme sırasını korur)
+        while len(cache) > ANALYSIS_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    return analysis, False
+
+def save_analysis(ticker, analysis):
+    """Analizi kalıcı depoya yazar; kimliği döndürür (yazılamazsa None, analiz yine gösterilir)."""
+    try:
+        return get_analysis_store().save(ticker, analysis, period=ANALYSIS_PERIOD)
+    except Exception as e:
+        st.warning(f"Analiz depoya kaydedilemedi: {e}")
+        return None
+
+def render_downloads(ticker, analysis):
+    """
+    Dışa aktarımlar depodan, sadece butona basılınca üretilir (her yeniden çizimde
+    df.to_csv() çalışmaz). Kayıt yoksa bellekteki tablodan üretilir.
+    """
+    store_id = analysis.get('store_id')
+    labels = {'csv': "💾 Tüm Verileri ve İndikatörleri İndir (Excel/CSV)", 'parquet': "📦 Parquet Olarak İndir"}
+    for column, fmt in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS):
+        if store_id:
+            data = lambda fmt=fmt: get_analysis_store().export(store_id, fmt)
+        elif fmt == 'csv':
+            data = lambda: analysis['df'].to_csv().encode('utf-8')
+        else:
+            data = lambda: analysis['df'].to_parquet()
+        column.download_button(
+            label=labels[fmt],
+            data=data,
+            file_name=f"{ticker}_analiz_verisi.{fmt}",
+            mime=EXPORT_FORMATS[fmt],
+            use_container_width=True
+        )
+
+def render_decision_history(ticker):
+    """Depodaki geçmiş kararlar (sadece SQLite dizini okunur, hiçbir şey yeniden hesaplanmaz)."""
+    with st.expander("🗂️ Karar Geçmişi"):
+        today = pd.Timestamp.now().normalize()
+        picked = st.date_input("Tarih Aralığı", value=(today - pd.Timedelta(days=30), today), key="history_range")
+        # Aralık seçilirken (tek tarih tıklanmış) date_input 1 elemanlı tuple döner
+        if isinstance(picked, (tuple, list)):
+            if not picked:
+                return
+            start, end = picked[0], picked[-1]
+        else:
+            start = end = picked
+        table = get_analysis_store().decisions(ticker, start=pd.Timestamp(start),
+                                               end=pd.Timestamp(end) + pd.Timedelta(days=1))
+        if table.empty:
+            st.info("Bu aralıkta kayıtlı analiz yok.")
+            return
+        table = table[['created_at', 'price', 'rsi', 'change_pct', 'sentiment', 'decision', 'explanation']]
+        st.dataframe(table.rename(columns={
+            'created_at': 'Zaman', 'price': 'Fiyat', 'rsi': 'RSI', 'change_pct': 'Beklenen Değişim (%)',
+            'sentiment': 'Duygu', 'decision': 'Karar', 'explanation': 'Gerekçe'}).round(
+                {'Fiyat': 2, 'RSI': 2, 'Beklenen Değişim (%)': 2, 'Duygu': 2}),
+            use_container_width=True, hide_index=True)
+
+def analysis_age(ticker):
+    """Önbellekteki paketin yaşı (sn) ve son bar zamanı; yoksa (None, None)."""
+    entry = st.session_state.get('analysis_cache', {}).get(_analysis_key(ticker))
+    if entry is None:
+        return None, None
+    return time.time() - entry['created_at'], entry['last_bar']
+
+def run_analysis(ticker, refresh=False):
+    """
+    Analiz hattını aşama grafiği olarak çalıştırır:
+
+        models ─────────┐
+        market ─┬──> predict ──┐
+                ├──> scenarios │ (bantlar, karara girmez)
+                │              ├──> decision
+        news ───┴──> sentiment ┘
+
+    Veri ve haber çekimi (G/Ç) birbirinden ve model yüklemeden bağımsızdır;
+    tahmin, girdileri hazır olur olmaz başlar. Aşama süreleri session_state'e yazılır.
+    refresh=True ise piyasa verisi önbellek tazeliğine bakılmadan sağlayıcıdan tazelenir.
+
+    Returns:
+        dict veya None (modeller yüklenemediyse)
+    """
+    def predict(brains, df):
+        model, scaler, _ = brains
+        if not model: return None
+        return ai_engine.predict_future(model, scaler, df)
+
+    def scenarios(brains, df):
+        model, scaler, _ = brains
+        if not model: return None
+        return ai_engine.forecast_scenarios(model, scaler, df)
+
+    def sentiment(brains, news_list):
+        _, _, sentiment_pipe = brains
+        if not sentiment_pipe: return None
+        return ai_engine.score_news(sentiment_pipe, news_list)
+
+    def decide(future_preds, sentiment_result, df):
+        if future_preds is None or sentiment_result is None: return None
+        avg_sentiment, _, risky_news = sentiment_result
+        current_rsi = df['RSI'].iloc[-1]
+        return ai_engine.make_final_decision(future_preds, avg_sentiment, risky_news, current_rsi)
+
+    stages = [
+        # 2. Beyinleri Yükle (Cache sayesinde hızlıdır)
+        Stage("models", ai_engine.load_brains),
+        # 3. Veri Toplama (Data Pipeline)
+        Stage("market", lambda: market_data.get_rich_market_data(
+            ticker, period=ANALYSIS_PERIOD, max_age=0 if refresh else None)),
+        Stage("news", lambda: news_scraper.get_google_news(ticker)),
+        # 4. Analiz (Intelligence Layer): a) Teknik Tahmin  b) Duygu Analizi  c) Karar
+        Stage("predict", predict, deps=("models", "market")),
+        Stage("scenarios", scenarios, deps=("models", "market")),
+        Stage("sentiment", sentiment, deps=("models", "news")),
+        Stage("decision", decide, deps=("predict", "sentiment", "market")),
+    ]
+    results, timings = run_stages(stages, max_workers=4, initializer=_streamlit_thread_initializer())
+    st.session_state['stage_timings'] = timings
+    telemetry.observe("analysis", timings['_total'])
+
+    if results['decision'] is None:
+        return None
+    return {
+        'df': results['market'],
+        'news_list': results['news'],
+        'future_preds': results['predict'],
+        'scenarios': results['scenarios'],
+        'sentiment': results['sentiment'],
+        'decision': results['decision'],
+        'timings': timings,
+    }
+
+def render_stage_timings(timings):
+    """Aşama sürelerini (duvar saati) küçük bir tabloda gösterir."""
+    stages = sorted((t['start'], name, t['seconds']) for name, t in timings.items() if name != '_total')
+    rows = [{"Aşama": name, "Başlangıç (sn)": f"{start:.2f}", "Süre (sn)": f"{seconds:.2f}"}
+            for start, name, seconds in stages]
+    total = timings.get('_total', 0)
+    serial = sum(seconds for _, _, seconds in stages)
+    with st.expander(f"⏱️ Analiz Süresi: {total:.2f} sn (sıralı olsaydı ~{serial:.2f} sn)"):
+        st.table(pd.DataFrame(rows))
+
 def main():
+    # NEUROQUANT_METRICS_PORT verildiyse /metrics uç noktası (süreç başına bir kez)
+    telemetry.start_metrics_server()
+
     # 1. Kenar Çubuğunu Çiz ve Girdileri Al
     ticker, btn_press = ui.render_sidebar()
 
@@ -53,165 +247,151 @@ def main():
     # is_clicked True ise (Butona basıldıysa) VEYA ticker değiştiyse çalıştırabiliriz.
     # Şimdilik sadece butona basınca çalışsın.
     if is_clicked:
-        # 2. Beyinleri Yükle (Cache sayesinde hızlıdır)
-        # Scaler'ı sildik, sadece 2 değişken alıyoruz
-        model, scaler, sentiment_pipe = ai_engine.load_brains()
+        # Yenile: TTL beklemeden veriyi ve analizi baştan üret
+        refresh_col, info_col = st.columns([1, 4])
+        force = refresh_col.button("🔄 Verileri Yenile")
+
+        t0 = time.perf_counter()
+        with st.spinner(f'{ticker} için yapay zeka çalışıyor...'):
+            try:
+                # 2-4. Model yükleme, veri toplama ve analiz, paralel aşama grafiğiyle
+                # (Önbellekte taze paket varsa hiçbiri çalışmaz)
+                analysis, from_cache = get_analysis(ticker, force=force)
+            except Exception as e:
+                st.error(f"Bir hata oluştu: {e}")
+                return
 
-        if not model or not sentiment_pipe:
+        age, last_bar = analysis_age(ticker)
+        if from_cache and age is not None:
+            info_col.caption(f"⚡ Önbellekten ({(time.perf_counter() - t0) * 1000:.1f} ms) | "
+                             f"Analiz {age:.0f} sn önce | Son bar: {last_bar} | "
+                             f"Otomatik yenileme: {max(ANALYSIS_TTL - age, 0):.0f} sn sonra")
+
+        if analysis is None:
             st.error("Modeller yüklenemedi! Lütfen kurulumu kontrol et.")
             return
 
-        with st.spinner(f'{ticker} için yapay zeka çalışıyor...'):
-            try:
-                # 3. Veri Toplama (Data Pipeline)
-                df = market_data.get_rich_market_data(ticker, period="1y")
-                news_list = news_scraper.get_google_news(ticker)
-                
-                # 4. Analiz (Intelligence Layer)
-                # a) Teknik Tahmin
-                last_60_days = df.tail(60)
-                # Verimizin adı 'df', onu gönderiyoruz
-                future_preds = ai_engine.predict_future(model, scaler, df)
-                
-                # b) Duygu Analizi (Veto Mekanizmalı)
-                avg_sentiment, label, risky_news = ai_engine.score_news(sentiment_pipe, news_list)
-                
-                # c) Karar Mekanizması (Logic Layer)
-                current_rsi = df['RSI'].iloc[-1]
-                decision, color, explanation = ai_engine.make_final_decision(
-                    future_preds, avg_sentiment, risky_news, current_rsi
-                )
-                
-                # 5. Ekrana Basma (UI Layer)
-                current_price = df['Close'].iloc[-1]
-                
-                ui.render_header(ticker, current_price)
-                ui.render_veto_warning(risky_news) 
-                
-                # SEKMELİ YAPI (TABS)
-                tab1, tab2, tab3 = st.tabs(["🚀 Ana Özet", "📊 Teknik Detaylar", "📰 Haber Masası"])
+        df = analysis['df']
+        news_list = analysis['news_list']
+        future_preds = analysis['future_preds']
+        avg_sentiment, label, risky_news = analysis['sentiment']
+        decision, color, explanation = analysis['decision']
 
+        try:
+            # 5. Ekrana Basma (UI Layer)
+            current_price = df['Close'].iloc[-1]
+            
+            ui.render_header(ticker, current_price)
+            ui.render_veto_warning(risky_news) 
+            
+            # SEKMELİ YAPI (TABS)
+            tab1, tab2, tab3 = st.tabs(["🚀 Ana Özet", "📊 Teknik Detaylar", "📰 Haber Masası"])
 
-                with tab1:
-                    # Eski usül temiz görünüm
-                    ui.render_decision_gauge(decision, color, explanation, avg_sentiment)
-                    ui.render_chart(df, future_preds)
-                    # --- ZAMAN DİLİMİ AYARI (ui.py'ye dokunmadan ekliyoruz) ---
-                
-                with tab2:
-                    # Yeni Hacim ve RSI Grafikleri
-                    ui.render_technical_charts(df)
-                
-                    # --- EKLENEN KISIM: Yeni Grafikler ---
-                    with st.expander("📊 Gelişmiş Teknik Analiz (Bollinger & MACD)", expanded=True):
-                        # 1. Bollinger Grafiği
-                        st.caption("Bollinger Bantları (Volatilite)")
-                        fig_bb = go.Figure()
-                        fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Upper'], name='Üst Bant', line=dict(color='gray', width=1, dash='dot')))
-                        fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Lower'], name='Alt Bant', line=dict(color='gray', width=1, dash='dot'), fill='tonexty'))
-                        fig_bb.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Fiyat', line=dict(color='blue', width=2)))
-                        fig_bb.update_layout(height=300, margin=dict(l=0,r=0,t=0,b=0))
-                        st.plotly_chart(fig_bb, use_container_width=True)
-                        
-                        # 2. MACD Grafiği
-                        st.caption("MACD (Trend Yönü)")
-                        fig_macd = go.Figure()
-                        fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='green')))
-                        fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='Sinyal', line=dict(color='red')))
-                        fig_macd.update_layout(height=200, margin=dict(l=0,r=0,t=0,b=0))
-                        st.plotly_chart(fig_macd, use_container_width=True)
-                # -------------------------------------
-                    
-                with tab3:
-                    # Yeni Haber Kartları (AI Puanlı)
-                    ui.render_news_cards(news_list)
-                    
-                # --- GÜNCELLEME BİTTİ ---
-
-                # --- SİNYAL ÖZET TABLOSU (Auto-Interpreter) ---
-                st.markdown("---")
-                st.subheader("🤖 Algoritmik Sinyal Özeti")
-                
-                # En son verileri alalım
-                last_rsi = df['RSI'].iloc[-1]
-                last_macd = df['MACD'].iloc[-1]
-                last_macd_signal = df['MACD_Signal'].iloc[-1]
-                last_close = df['Close'].iloc[-1]
-                last_bb_upper = df['BB_Upper'].iloc[-1]
-                last_bb_lower = df['BB_Lower'].iloc[-1]
-                
-                # 1. RSI Yorumu
-                if last_rsi < 30:
-                    rsi_signal = "🟢 GÜÇLÜ AL (Aşırı Satım)"
-                elif last_rsi > 70:
-                    rsi_signal = "🔴 GÜÇLÜ SAT (Aşırı Alım)"
-                else:
-                    rsi_signal = "⚪ NÖTR"
-                    
-                # 2. MACD Yorumu
-                if last_macd > last_macd_signal:
-                    macd_signal = "🟢 AL (Pozitif Trend)"
-                else:
-                    macd_signal = "🔴 SAT (Negatif Trend)"
-                    
-                # 3. Bollinger Yorumu
-                if last_close > last_bb_upper:
-                    bb_signal = "🔴 SAT (Fiyat Çok Yüksek)"
-                elif last_close < last_bb_lower:
-                    bb_signal = "🟢 AL (Fiyat Çok Düşük)"
-                else:
-                    bb_signal = "⚪ NÖTR (Bant İçinde)"
-
-                # Tabloyu Oluştur
-                signal_data = {
-                    "İndikatör": ["RSI (Momentum)", "MACD (Trend)", "Bollinger (Volatilite)"],
-                    "Değer": [f"{last_rsi:.2f}", f"{last_macd:.2f}", f"{last_close:.2f}"],
-                    "Yapay Zeka Sinyali": [rsi_signal, macd_signal, bb_signal]
-                }
-                st.table(pd.DataFrame(signal_data))
-                
 
-                # ----------------------------------------------
-                st.markdown("---")
-                st.subheader("✨ Yapay Zeka Yorumu (Teknik + Haberler)")
+            with tab1:
+                # Eski usül temiz görünüm
+                ui.render_decision_gauge(decision, color, explanation, avg_sentiment)
+                ui.render_chart(df, future_preds, analysis.get('scenarios'))
+                # --- ZAMAN DİLİMİ AYARI (ui.py'ye dokunmadan ekliyoruz) ---
+            
+            with tab2:
+                # Görünür aralık: Seyreltme bütçesi sadece bu aralığa harcanır
+                visible = ui.visible_range(df, ui.render_range_selector())
+
+                # Yeni Hacim ve RSI Grafikleri
+                ui.render_technical_charts(visible)
+            
+                # --- EKLENEN KISIM: Yeni Grafikler ---
+                with st.expander("📊 Gelişmiş Teknik Analiz (Bollinger & MACD)", expanded=True):
+                    ui.render_advanced_charts(visible)
+            # -------------------------------------
                 
-                if st.button("🤖 Piyasayı Yorumla (Gemini)"):
-                    with st.spinner("Gemini teknik verileri ve haberleri sentezliyor..."):
-                        # Fonksiyonu YENİ parametrelerle çağırıyoruz
-                        ai_comment = ai_engine.ask_gemini(
-                            ticker, 
-                            last_close, 
-                            last_rsi, 
-                            macd_signal, 
-                            decision,
-                            news_list,      # <-- Yeni eklendi: Haber Listesi
-                            avg_sentiment   # <-- Yeni eklendi: Duygu Skoru
-                        )
-                        
-                        # Sonucu Göster
-                        st.info(ai_comment)
-                        st.caption("Not: Bu yorum Google Gemini yapay zekası tarafından oluşturulmuştur.")
-                # ------------------------------------------
+            with tab3:
+                # Yeni Haber Kartları (AI Puanlı)
+                ui.render_news_cards(news_list)
                 
-                # ----------------------------------------------
+            # --- GÜNCELLEME BİTTİ ---
 
-                st.markdown("---")
-                st.subheader("📥 Analiz Çıktısı")
+            # --- SİNYAL ÖZET TABLOSU (Auto-Interpreter) ---
+            st.markdown("---")
+            st.subheader("🤖 Algoritmik Sinyal Özeti")
+            
+            # En son verileri alalım
+            last_rsi = df['RSI'].iloc[-1]
+            last_macd = df['MACD'].iloc[-1]
+            last_macd_signal = df['MACD_Signal'].iloc[-1]
+            last_close = df['Close'].iloc[-1]
+            last_bb_upper = df['BB_Upper'].iloc[-1]
+            last_bb_lower = df['BB_Lower'].iloc[-1]
+            
+            # 1. RSI Yorumu
+            if last_rsi < 30:
+                rsi_signal = "🟢 GÜÇLÜ AL (Aşırı Satım)"
+            elif last_rsi > 70:
+                rsi_signal = "🔴 GÜÇLÜ SAT (Aşırı Alım)"
+            else:
+                rsi_signal = "⚪ NÖTR"
                 
-                    # Veriyi CSV formatına çeviriyoruz (Risk yok, sadece format değişiyor)
-                csv_data = df.to_csv().encode('utf-8')
-                    
-                st.download_button(
-                    label="💾 Tüm Verileri ve İndikatörleri İndir (Excel/CSV)",
-                    data=csv_data,
-                    file_name=f"{ticker}_analiz_verisi.csv",
-                    mime='text/csv',
-                    use_container_width=True
-                )
+            # 2. MACD Yorumu
+            if last_macd > last_macd_signal:
+                macd_signal = "🟢 AL (Pozitif Trend)"
+            else:
+                macd_signal = "🔴 SAT (Negatif Trend)"
                 
+            # 3. Bollinger Yorumu
+            if last_close > last_bb_upper:
+                bb_signal = "🔴 SAT (Fiyat Çok Yüksek)"
+            elif last_close < last_bb_lower:
+                bb_signal = "🟢 AL (Fiyat Çok Düşük)"
+            else:
+                bb_signal = "⚪ NÖTR (Bant İçinde)"
 
-            except Exception as e:
-                st.error(f"Bir hata oluştu: {e}")
+            # Tabloyu Oluştur
+            signal_data = {
+                "İndikatör": ["RSI (Momentum)", "MACD (Trend)", "Bollinger (Volatilite)"],
+                "Değer": [f"{last_rsi:.2f}", f"{last_macd:.2f}", f"{last_close:.2f}"],
+                "Yapay Zeka Sinyali": [rsi_signal, macd_signal, bb_signal]
+            }
+            st.table(pd.DataFrame(signal_data))
+            
+
+            # ----------------------------------------------
+            st.markdown("---")
+            st.subheader("✨ Yapay Zeka Yorumu (Teknik + Haberler)")
+            
+            if st.button("🤖 Piyasayı Yorumla (Gemini)"):
+                # Yanıt parça parça gelir; ilk kelimeler hemen görünür
+                placeholder = st.empty()
+                placeholder.info("Gemini teknik verileri ve haberleri sentezliyor...")
+                ai_comment = ""
+                for chunk in ai_engine.ask_gemini_stream(
+                    ticker, 
+                    last_close, 
+                    last_rsi, 
+                    macd_signal, 
+                    decision,
+                    news_list,      # <-- Yeni eklendi: Haber Listesi
+                    avg_sentiment   # <-- Yeni eklendi: Duygu Skoru
+                ):
+                    ai_comment += chunk
+                    placeholder.info(ai_comment + " ▌")
+
+                # Sonucu Göster
+                placeholder.info(ai_comment)
+                st.caption("Not: Bu yorum Google Gemini yapay zekası tarafından oluşturulmuştur.")
+            # ------------------------------------------
+            
+            # ----------------------------------------------
+
+            st.markdown("---")
+            st.subheader("📥 Analiz Çıktısı")
+            render_downloads(ticker, analysis)
+            render_decision_history(ticker)
+            render_stage_timings(analysis['timings'])
+            
+
+        except Exception as e:
+            st.error(f"Bir hata oluştu: {e}")
                 
     else:
         st.info("👈 Analizi başlatmak için soldaki butona basınız.")
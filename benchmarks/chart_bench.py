@@ -0,0 +1,155 @@
+"""
+Grafik Yükü Ölçümü: Tam çözünürlüklü SVG vs bütçeli (LTTB + WebGL) figürler.
+
+Teknik sekmedeki dört figür (hacim, RSI, Bollinger, MACD) sentetik OHLCV üzerinde
+iki şekilde kurulur:
+  - once  : Eski kurulum; her nokta go.Scatter / go.Bar (nokta başına renk listesi) olarak gider
+  - sonra : ui.build_*_figure + budget_figure (figür başına nokta bütçesi, CHART_MODE)
+
+Ölçülenler (figür başına):
+  - JSON bayt (st.plotly_chart'ın tarayıcıya gönderdiği yük ~ fig.to_json())
+  - Kurulum + serileştirme süresi (sunucu tarafı, medyan ms)
+  - Tarayıcı çizim süresi (--render): kaleido kuruluysa figür PNG'ye çizdirilir;
+    plotly.js'in headless Chrome'daki çizim süresidir (yoksa atlanır)
+
+Kullanım:
+    python benchmarks/chart_bench.py                        # 1y / 5y günlük, 1y saatlik, 3 ay dakikalık
+    python benchmarks/chart_bench.py --bars 1260 100000 --budget 2000 --render --json charts.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neuro_modules import ui
+from neuro_modules.indicators import compute_indicators
+
+# (etiket, bar sayısı, bar aralığı)
+SCENARIOS = [("1y günlük", 252, "B"), ("5y günlük", 1260, "B"),
+             ("1y saatlik", 252 * 7, "h"), ("3 ay dakikalık", 63 * 390, "min")]
+
+
+def synthetic_bars(n, freq, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    df = pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) * 1.002,
+                       'Low': np.minimum(open_, close) * 0.998, 'Close': close,
+                       'Volume': rng.integers(1_000_000, 5_000_000, n).astype(float)},
+                      index=pd.date_range('2020-01-01', periods=n, freq=freq))
+    return compute_indicators(df)
+
+
+def legacy_figures(df):
+    """Eski kurulum (bu değişiklikten önceki app.py / ui.py): Her nokta, SVG izler."""
+    colors = ['#2ecc71' if c >= o else '#e74c3c' for c, o in zip(df['Close'], df['Open'])]
+    fig_vol = go.Figure(data=[go.Bar(x=df.index, y=df['Volume'], marker_color=colors)])
+    fig_rsi = go.Figure(data=[go.Scatter(x=df.index, y=df['RSI'], mode='lines',
+                                         line=dict(color='#9b59b6', width=2), name='RSI')])
+    fig_rsi.add_hline(y=70, line_dash="dot", line_color="red", annotation_text="Aşırı Alım")
+    fig_rsi.add_hline(y=30, line_dash="dot", line_color="green", annotation_text="Aşırı Satım")
+    fig_bb = go.Figure()
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Upper'], name='Üst Bant', line=dict(color='gray', width=1, dash='dot')))
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Lower'], name='Alt Bant', line=dict(color='gray', width=1, dash='dot'), fill='tonexty'))
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Fiyat', line=dict(color='blue', width=2)))
+    fig_macd = go.Figure()
+    fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='green')))
+    fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='Sinyal', line=dict(color='red')))
+    return {'volume': fig_vol, 'rsi': fig_rsi, 'bollinger': fig_bb, 'macd': fig_macd}
+
+
+def build_figures(df, budget):
+    """
+    budget=None: Eski kurulum. Aksi halde ui'deki figür kurucuları, bu nokta bütçesiyle.
+    Hacim / RSI tüm görünür aralığı gösterir (uzun aralık seçildiğindeki yük).
+    """
+    if budget is None:
+        return legacy_figures(df)
+    original = ui.budget_figure
+    ui.budget_figure = lambda fig: original(fig, max_points=budget)
+    try:
+        return {'volume': ui.build_volume_figure(df), 'rsi': ui.build_rsi_figure(df),
+                'bollinger': ui.build_bollinger_figure(df), 'macd': ui.build_macd_figure(df)}
+    finally:
+        ui.budget_figure = original
+
+
+def measure(df, budget, repeat):
+    times, figs = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        figs = build_figures(df, budget)
+        payloads = {name: fig.to_json() for name, fig in figs.items()}
+        times.append(time.perf_counter() - t0)
+    return {
+        'bytes': {name: len(p.encode('utf-8')) for name, p in payloads.items()},
+        'points': {name: sum(len(t.x) for t in fig.data) for name, fig in figs.items()},
+        'trace_types': sorted({t.type for fig in figs.values() for t in fig.data}),
+        'server_ms': 1000 * statistics.median(times),
+    }, figs
+
+
+def render_ms(figs, repeat):
+    """kaleido ile PNG çizimi (plotly.js + headless Chrome). Yoksa None."""
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return None
+    for fig in figs.values():  # Isınma: Chrome bir kez açılsın
+        fig.to_image(format='png', width=900, height=300)
+        break
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for fig in figs.values():
+            fig.to_image(format='png', width=900, height=300)
+        runs.append(time.perf_counter() - t0)
+    return 1000 * statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', help="Sadece bu bar sayıları (dakikalık frekansla)")
+    parser.add_argument('--budget', type=int, default=ui.CHART_MAX_POINTS, help="Figür başına nokta bütçesi")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--render', action='store_true', help="Tarayıcı çizim süresini de ölç (kaleido)")
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    scenarios = [(f"{n} bar", n, "min") for n in args.bars] if args.bars else SCENARIOS
+
+    report = {'budget': args.budget, 'mode': ui.CHART_MODE, 'scenarios': {}}
+    print(f"{'Senaryo':16} {'Mod':6} {'Nokta':>8} {'JSON (KB)':>10} {'Sunucu (ms)':>12} {'Çizim (ms)':>11}  İzler")
+    print("-" * 84)
+    for label, n, freq in scenarios:
+        df = synthetic_bars(n, freq)
+        report['scenarios'][label] = {}
+        for mode, budget in (('once', None), ('sonra', args.budget)):
+            res, figs = measure(df, budget, args.repeat)
+            res['render_ms'] = render_ms(figs, args.repeat) if args.render else None
+            report['scenarios'][label][mode] = res
+            render = f"{res['render_ms']:.0f}" if res['render_ms'] is not None else "-"
+            print(f"{label:16} {mode:6} {sum(res['points'].values()):>8} {sum(res['bytes'].values()) / 1024:>10.1f} "
+                  f"{res['server_ms']:>12.1f} {render:>11}  {','.join(res['trace_types'])}")
+        before, after = (sum(report['scenarios'][label][m]['bytes'].values()) for m in ('once', 'sonra'))
+        print(f"{'':16} ➜ Yük {before / max(after, 1):.1f}x küçüldü")
+    if args.render and report['scenarios'] and all(
+            r['render_ms'] is None for s in report['scenarios'].values() for r in s.values()):
+        print("ℹ️ kaleido kurulu değil: Çizim süresi atlandı (pip install kaleido)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+LSTM Motor Karşılaştırması: Keras (TensorFlow) vs saf NumPy.
+
+Her motor TEMİZ bir Python sürecinde ölçülür:
+  - load_s   : import + model yükleme süresi (sn)
+  - rss_mb   : yükleme sonrası RSS artışı (MB)
+  - batch N  : N pencerelik tek 'predict' çağrısının medyan süresi (ms)
+Ayrıca iki motorun aynı girdideki en büyük çıktı farkı (parite) raporlanır.
+
+Kullanım:
+    python benchmarks/lstm_backend_bench.py
+    python benchmarks/lstm_backend_bench.py --batches 1 64 1024 --json lstm.json
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ['keras', 'numpy']
+
+_CHILD = r"""
+import os, sys, time, json, statistics
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+os.environ['CUDA_VISIBLE_DEVICES'] = '-1'
+sys.path.insert(0, {root!r})
+import numpy as np
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+before = rss_mb()
+t0 = time.perf_counter()
+path = os.path.join({root!r}, 'models', 'universal_lstm.h5')
+if {backend!r} == 'numpy':
+    from neuro_modules.numpy_lstm import NumpyLSTMModel
+    model = NumpyLSTMModel.from_h5(path)
+else:
+    from tensorflow.keras.models import load_model
+    model = load_model(path)
+load_s = time.perf_counter() - t0
+rss = rss_mb() - before
+
+rng = np.random.default_rng(0)
+x_all = rng.uniform(0, 1, ({max_batch}, 60, 1)).astype(np.float32)
+latency = {{}}
+for n in {batches!r}:
+    x = x_all[:n]
+    model.predict(x, verbose=0)  # ısınma
+    runs = []
+    for _ in range({repeat}):
+        t = time.perf_counter()
+        model.predict(x, verbose=0)
+        runs.append(time.perf_counter() - t)
+    latency[n] = 1000 * statistics.median(runs)
+
+np.save({out!r}, model.predict(x_all[:256], verbose=0))
+print(json.dumps({{'load_s': load_s, 'rss_mb': rss, 'peak_rss_mb': rss_mb() - before, 'latency_ms': latency}}))
+"""
+
+
+def measure(backend, batches, repeat, out_path):
+    code = _CHILD.format(root=ROOT, backend=backend, batches=list(batches), max_batch=max(max(batches), 256),
+                         repeat=repeat, out=out_path)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    lines = [l for l in out.stdout.splitlines() if l.startswith('{')]
+    if not lines:
+        return {'error': (out.stderr.strip().splitlines() or ['?'])[-1]}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 16, 256, 2048])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    import tempfile
+    import numpy as np
+
+    report, outputs = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in BACKENDS:
+            out_path = os.path.join(tmp, f'{backend}.npy')
+            report[backend] = measure(backend, args.batches, args.repeat, out_path)
+            if os.path.exists(out_path):
+                outputs[backend] = np.load(out_path)
+
+    print(f"{'Motor':8} {'Yükleme (sn)':>13} {'RSS (MB)':>10}" + "".join(f"{'N=' + str(n) + ' (ms)':>14}" for n in args.batches))
+    print("-" * (33 + 14 * len(args.batches)))
+    for backend, res in report.items():
+        if 'error' in res:
+            print(f"{backend:8} ⚠️ {res['error']}")
+            continue
+        row = "".join(f"{res['latency_ms'][str(n)]:>14.2f}" for n in args.batches)
+        print(f"{backend:8} {res['load_s']:>13.3f} {res['rss_mb']:>10.1f}{row}")
+
+    if len(outputs) == 2:
+        max_diff = float(np.abs(outputs['keras'] - outputs['numpy']).max())
+        report['max_abs_diff'] = max_diff
+        print(f"{'✅' if max_diff < 1e-5 else '🚨'} Parite (256 pencere): en büyük fark {max_diff:.2e}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
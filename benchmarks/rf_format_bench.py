@@ -0,0 +1,185 @@
+"""
+Random Forest Format Karşılaştırması: joblib (.pkl) vs kompakt (mmap .npy klasörü).
+
+Ölçülenler:
+  - Dosya boyutu (MB)
+  - Yükleme süresi: Temiz süreçte, importlar hariç sadece 'yükle' adımı (medyan, sn)
+  - Parite: En büyük tahmin farkı ve yaprakların birebir aynı olup olmadığı
+  - Çok işçili bellek: N süreç AYNI ANDA modeli açıp tahmin yapar; süreç başı RSS ve
+    PSS (paylaşılan sayfalar süreçlere bölünmüş) toplamları (/proc/<pid>/smaps_rollup)
+
+Kullanım:
+    python benchmarks/rf_format_bench.py                       # sentetik orman (200 ağaç, derinlik 20)
+    python benchmarks/rf_format_bench.py --model models/universal_rf.pkl --workers 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neuro_modules.compact_forest import export_forest, CompactForest
+
+_CHILD = r"""
+import sys, time, json
+sys.path.insert(0, {root!r})
+import numpy as np, joblib
+from neuro_modules.compact_forest import load_forest
+
+def smaps():
+    out = {{}}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Private_Clean', 'Private_Dirty'):
+                    out[key] = int(rest.split()[0]) / 1024
+    except OSError:
+        pass
+    return out
+
+t0 = time.perf_counter()
+model = load_forest({path!r})
+load_s = time.perf_counter() - t0
+X = np.random.default_rng(0).normal(0, 0.02, (2000, {n_features}))
+model.predict(X)
+print(json.dumps({{'load_s': load_s, **smaps()}}), flush=True)
+if {hold}:
+    sys.stdin.read()  # Ebeveyn tüm işçiler ölçülene kadar bekletir
+"""
+
+
+def _child(path, n_features, hold):
+    code = _CHILD.format(root=ROOT, path=path, n_features=n_features, hold=hold)
+    return subprocess.Popen([sys.executable, '-c', code], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def _read(proc):
+    line = proc.stdout.readline()
+    if not line.startswith('{'):
+        raise RuntimeError(proc.stderr.read().strip().splitlines()[-1:])
+    return json.loads(line)
+
+
+def load_time(path, n_features, repeat):
+    runs = []
+    for _ in range(repeat):
+        proc = _child(path, n_features, hold=False)
+        runs.append(_read(proc)['load_s'])
+        proc.wait()
+    return statistics.median(runs)
+
+
+def shared_memory(path, n_features, workers):
+    """N işçiyi aynı anda ayakta tutup bellek sayaçlarını toplar."""
+    procs = [_child(path, n_features, hold=True) for _ in range(workers)]
+    try:
+        stats = [_read(p) for p in procs]
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+    total = {key: sum(s.get(key, 0) for s in stats) for key in ('Rss', 'Pss', 'Shared_Clean')}
+    total['per_worker_rss'] = total['Rss'] / workers
+    return total
+
+
+def dir_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def synthetic_forest(trees, depth, rows, n_features=60, n_outputs=5):
+    from sklearn.ensemble import RandomForestRegressor
+    rng = np.random.default_rng(1)
+    X = rng.normal(0, 0.02, (rows, n_features)).astype(np.float32)
+    y = X[:, -n_outputs:] * 0.3 + rng.normal(0, 0.01, (rows, n_outputs))
+    return RandomForestRegressor(n_estimators=trees, max_depth=depth, n_jobs=-1, random_state=42).fit(X, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', help="Mevcut .pkl (verilmezse sentetik orman eğitilir)")
+    parser.add_argument('--trees', type=int, default=200)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    import joblib
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.model:
+            pkl_path = args.model
+            model = joblib.load(pkl_path)
+        else:
+            print(f"🌲 Sentetik orman eğitiliyor ({args.trees} ağaç, derinlik {args.depth}, {args.rows} satır)...")
+            model = synthetic_forest(args.trees, args.depth, args.rows)
+            pkl_path = os.path.join(tmp, 'rf.pkl')
+            joblib.dump(model, pkl_path)
+
+        compact_path = os.path.join(tmp, 'rf_compact')
+        meta = export_forest(model, compact_path)
+        n_features = meta['n_features']
+
+        # Parite: Rastgele girdiler + değerleri tam eşiğe denk gelen satırlar (x == eşik sınır durumu)
+        forest = CompactForest.load(compact_path)
+        rng = np.random.default_rng(7)
+        X = rng.normal(0, 0.02, (5000, n_features))
+        tree = model.estimators_[0].tree_
+        internal = np.flatnonzero(tree.children_left >= 0)
+        for row in range(500):
+            nodes = rng.choice(internal, size=min(n_features, len(internal)), replace=False)
+            X[row, tree.feature[nodes]] = tree.threshold[nodes]
+        t0 = time.perf_counter()
+        ours = forest.predict(X)
+        t_ours = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ref = model.predict(X)
+        t_ref = time.perf_counter() - t0
+        leaves = forest.apply(X) - forest.roots
+        ref_leaves = np.stack([e.apply(X.astype(np.float32)) for e in model.estimators_], axis=1)
+
+        report = {'meta': meta, 'formats': {}}
+        report['parity'] = {'max_abs_diff': float(np.abs(ours - ref).max()),
+                            'same_leaves': bool(np.array_equal(leaves, ref_leaves)),
+                            'predict_ms': {'compact': 1000 * t_ours, 'sklearn': 1000 * t_ref}}
+
+        for name, path in (('joblib', pkl_path), ('compact', compact_path)):
+            report['formats'][name] = {
+                'size_mb': dir_size(path) / 1e6,
+                'load_s': load_time(path, n_features, args.repeat),
+                'memory_mb': shared_memory(path, n_features, args.workers),
+            }
+
+    print(f"{'Format':9} {'Boyut (MB)':>11} {'Yükleme (sn)':>13} "
+          f"{'RSS/işçi':>10} {'Σ RSS':>9} {'Σ PSS':>9}   ({args.workers} işçi, MB)")
+    print("-" * 80)
+    for name, res in report['formats'].items():
+        mem = res['memory_mb']
+        print(f"{name:9} {res['size_mb']:>11.1f} {res['load_s']:>13.3f} "
+              f"{mem['per_worker_rss']:>10.1f} {mem['Rss']:>9.1f} {mem['Pss']:>9.1f}")
+    parity = report['parity']
+    print("-" * 80)
+    print(f"{'✅' if parity['same_leaves'] else '🚨'} Yapraklar aynı: {parity['same_leaves']} | "
+          f"En büyük fark: {parity['max_abs_diff']:.2e} | Tahmin (5000 satır): "
+          f"kompakt {parity['predict_ms']['compact']:.0f} ms, sklearn {parity['predict_ms']['sklearn']:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
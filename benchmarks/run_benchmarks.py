@@ -0,0 +1,318 @@
+"""
+Sıcak Yol Mikro Ölçümleri + Gerileme (Regression) Kontrolü.
+
+Ağ gerektirmez: Tüm girdiler sentetiktir (OHLCV rastgele yürüyüş, üretilmiş başlıklar).
+Ölçülen sıcak yollar:
+  - indicators      : get_rich_market_data (sağlayıcı sentetik, önbellek geçici klasörde)
+  - predict_future  : Tek hisselik LSTM tahmini (varsayılan numpy motoru)
+  - predict_batch   : predict_future_batch, 64 hisse tek çağrıda
+  - score_news      : score_news, soğuk önbellekle (varsayılan: sözlük tabanlı sahte FinBERT;
+                      gerçek model için --finbert, NEUROQUANT_FINBERT_PATH ile yerel kopya)
+  - decision        : make_final_decision x 10.000 çağrı
+  - build_windows   : train_universal.build_windows (8 seri x 2000 gün)
+  - rf_predict      : CompactForest.predict, test_universal'daki gibi tek toplu tahmin
+
+Her vaka önce bir kez ısıtılır, sonra --repeat kez çalıştırılır; medyan, en iyi ve p90 (ms)
+raporlanır. Sonuçlar JSON taban çizgisi (baseline) olarak kaydedilir; --compare ile mevcut
+ölçüm taban çizgisiyle kıyaslanır ve medyanı eşikten (--threshold, varsayılan %20) fazla
+yavaşlayan vakalar işaretlenir (çıkış kodu 1). Taban çizgileri makineye özeldir: Aynı
+makinede, aynı motorla alınmış dosyalarla kıyaslayın.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py                                  # sadece ölç
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json  # taban çizgisi kaydet
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 0.15
+    python benchmarks/run_benchmarks.py --only predict_future rf_predict --repeat 50
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import warnings
+import contextlib
+import statistics
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neuro_modules import ai_engine, data_cache, market_data
+from neuro_modules.sentiment_cache import SentimentCache
+
+N_BARS = 2000          # Sentetik seri uzunluğu (gün)
+N_TICKERS = 64         # predict_batch için hisse sayısı
+N_HEADLINES = 200      # score_news başlık sayısı (%25'i tekrar)
+N_DECISIONS = 10_000
+N_SERIES = 8           # build_windows (train_universal.TICKERS ile aynı sayıda)
+
+
+# --- SENTETİK VERİ ---
+def synthetic_ohlcv(n=N_BARS, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.015, n))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    return pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) * 1.004,
+                         'Low': np.minimum(open_, close) * 0.996, 'Close': close,
+                         'Volume': rng.integers(1_000_000, 5_000_000, n).astype(float)},
+                        index=pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n))
+
+
+WORDS = {
+    'Positive': ['beats estimates', 'record revenue', 'upgrade', 'raises guidance', 'strong demand'],
+    'Negative': ['misses estimates', 'lawsuit', 'downgrade', 'cuts guidance', 'recall'],
+    'Neutral': ['announces conference call', 'schedules earnings date', 'names new director'],
+}
+
+
+def synthetic_news(n=N_HEADLINES, seed=0):
+    """Üretilmiş başlıklar; yaklaşık dörtte biri tekrar eder (önbellek yolu da ölçülsün)."""
+    rng = np.random.default_rng(seed)
+    labels = list(WORDS)
+    news = []
+    for i in range(n):
+        j = int(rng.integers(0, int(n * 0.75)))
+        label = labels[j % len(labels)]
+        phrase = WORDS[label][j % len(WORDS[label])]
+        news.append({'title': f"Company {j} {phrase} in Q{j % 4 + 1}", 'link': f"https://example.com/{i}"})
+    return news
+
+
+class SyntheticProvider:
+    """OHLCVCache için ağsız sağlayıcı (yfinance yerine)."""
+    name = "synthetic"
+
+    def __init__(self, df):
+        self.df = df
+
+    def fetch(self, ticker, interval="1d", start=None, end=None):
+        df = self.df
+        if start is not None:
+            df = df[df.index >= data_cache._align(start, df.index)]
+        if end is not None:
+            df = df[df.index < data_cache._align(end, df.index)]
+        return df
+
+
+class KeywordSentiment:
+    """FinBERT yerine geçen, transformers pipeline arayüzlü sözlük tabanlı sınıflandırıcı."""
+    neuroquant_model_id = "synthetic-keywords"
+
+    def _one(self, text):
+        for label in ('Negative', 'Positive'):
+            if any(word in text for word in WORDS[label]):
+                return {'label': label, 'score': 0.9}
+        return {'label': 'Neutral', 'score': 0.6}
+
+    def __call__(self, texts, batch_size=None, truncation=True):
+        if isinstance(texts, str):
+            return [self._one(texts)]
+        return [self._one(t) for t in texts]
+
+
+# --- VAKALAR ---
+# Her kurucu, ölçülecek argümansız fonksiyonu ve açıklamasını döndürür.
+def case_indicators(ctx):
+    cache = data_cache.OHLCVCache(cache_dir=ctx['tmp'], provider=SyntheticProvider(synthetic_ohlcv()),
+                                  max_age=10 ** 9)
+    return (lambda: market_data.get_rich_market_data("SYN", period="5y", cache=cache)), f"{N_BARS} bar, önbellekten"
+
+
+def case_predict_future(ctx):
+    model, scaler = ctx['lstm']()
+    df = synthetic_ohlcv(300)
+    return (lambda: ai_engine.predict_future(model, scaler, df)), f"1 hisse ({ai_engine.LSTM_BACKEND})"
+
+
+def case_predict_batch(ctx):
+    model, scaler = ctx['lstm']()
+    dfs = [synthetic_ohlcv(300, seed=i) for i in range(N_TICKERS)]
+    return (lambda: ai_engine.predict_future_batch(model, scaler, dfs)), f"{N_TICKERS} hisse ({ai_engine.LSTM_BACKEND})"
+
+
+def case_score_news(ctx):
+    pipe = ctx['sentiment']()
+    news = synthetic_news()
+    # Her çalıştırmada soğuk önbellek: Batch'leme + tekrar eden başlıklar birlikte ölçülür
+    return (lambda: ai_engine.score_news(pipe, [dict(n) for n in news], cache=SentimentCache(db_path=None))), \
+        f"{N_HEADLINES} başlık ({ai_engine.sentiment_model_id(pipe)})"
+
+
+def case_decision(ctx):
+    rng = np.random.default_rng(0)
+    preds = 100 * np.cumprod(1 + rng.normal(0, 0.01, (N_DECISIONS, 5)), axis=1)
+    sentiments = rng.uniform(-1, 1, N_DECISIONS)
+    rsis = rng.uniform(10, 90, N_DECISIONS)
+    risky = {'title': 'Company recall', 'link': ''}
+    rows = [(list(p), float(s), risky if s < -0.5 else None, float(r)) for p, s, r in zip(preds, sentiments, rsis)]
+
+    def run():
+        for p, s, news, r in rows:
+            ai_engine.make_final_decision(p, s, news, r)
+    return run, f"{N_DECISIONS} çağrı"
+
+
+def case_build_windows(ctx):
+    from training.train_universal import build_windows
+    rng = np.random.default_rng(0)
+    series = {f"S{i}": rng.normal(0, 0.02, N_BARS) for i in range(N_SERIES)}
+    return (lambda: build_windows(series)), f"{N_SERIES} seri x {N_BARS} gün"
+
+
+def case_rf_predict(ctx):
+    from sklearn.ensemble import RandomForestRegressor
+    from numpy.lib.stride_tricks import sliding_window_view
+    from neuro_modules.compact_forest import export_forest, CompactForest
+    rng = np.random.default_rng(1)
+    X = rng.normal(0, 0.02, (5000, ai_engine.LOOKBACK)).astype(np.float32)
+    y = X[:, -5:] * 0.3 + rng.normal(0, 0.01, (5000, 5))
+    rf = RandomForestRegressor(n_estimators=100, max_depth=12, n_jobs=-1, random_state=42).fit(X, y)
+    path = os.path.join(ctx['tmp'], 'rf_compact')
+    export_forest(rf, path)
+    forest = CompactForest.load(path)
+    # test_universal.evaluate_frames gibi: Hisselerin tüm pencereleri tek predict çağrısında
+    windows = np.concatenate([sliding_window_view(rng.normal(0, 0.02, 500), ai_engine.LOOKBACK)[:435]
+                              for _ in range(N_SERIES)])
+    return (lambda: forest.predict(windows)), f"{len(windows)} pencere, 100 ağaç"
+
+
+CASES = {
+    'indicators': case_indicators,
+    'predict_future': case_predict_future,
+    'predict_batch': case_predict_batch,
+    'score_news': case_score_news,
+    'decision': case_decision,
+    'build_windows': case_build_windows,
+    'rf_predict': case_rf_predict,
+}
+
+
+# --- ÖLÇÜM ---
+def measure(fn, repeat):
+    """Bir ısınma çalıştırması + 'repeat' ölçüm. Modüllerin print çıktıları bastırılır."""
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        fn()
+        runs = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            runs.append(1000 * (time.perf_counter() - t0))
+    return {
+        'median_ms': statistics.median(runs),
+        'min_ms': min(runs),
+        'p90_ms': float(np.percentile(runs, 90)),
+        'repeat': repeat,
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'node': platform.node(),
+        'lstm_backend': ai_engine.LSTM_BACKEND,
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Medyanları taban çizgisiyle kıyaslar.
+
+    Returns:
+        list: (vaka, önceki ms, şimdiki ms, oran, durum) satırları; durum 'GERİLEME',
+              'iyileşme', 'yeni' veya 'ok'
+    """
+    rows = []
+    for name, res in results.items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            rows.append((name, None, res['median_ms'], None, 'yeni'))
+            continue
+        ratio = res['median_ms'] / max(old['median_ms'], 1e-9)
+        status = 'GERİLEME' if ratio > 1 + threshold else 'iyileşme' if ratio < 1 - threshold else 'ok'
+        rows.append((name, old['median_ms'], res['median_ms'], ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(CASES), help="Sadece bu vakalar")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--lstm-backend', choices=['keras', 'numpy'], default='numpy')
+    parser.add_argument('--finbert', action='store_true', help="score_news için gerçek FinBERT (NEUROQUANT_FINBERT_PATH)")
+    parser.add_argument('--save', help="Sonuçları taban çizgisi olarak bu JSON'a yaz")
+    parser.add_argument('--compare', help="Bu taban çizgisiyle kıyasla")
+    parser.add_argument('--threshold', type=float, default=0.20, help="Gerileme eşiği (0.20 = %%20 yavaşlama)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    ai_engine.LSTM_BACKEND = args.lstm_backend
+    loaded = {}
+
+    def lstm():
+        if 'lstm' not in loaded:
+            with contextlib.redirect_stdout(io.StringIO()):
+                model, scaler, _ = ai_engine.load_models(with_sentiment=False)
+            if model is None or scaler is None:
+                sys.exit("🚨 LSTM modeli yüklenemedi.")
+            loaded['lstm'] = (model, scaler)
+        return loaded['lstm']
+
+    def sentiment():
+        if args.finbert:
+            from neuro_modules.sentiment_model import load_sentiment_pipeline
+            return load_sentiment_pipeline()
+        return KeywordSentiment()
+
+    names = args.only or list(CASES)
+    results = {}
+    print(f"{'Vaka':16} {'Medyan (ms)':>12} {'En iyi':>9} {'p90':>9}  Girdi")
+    print("-" * 78)
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = {'tmp': tmp, 'lstm': lstm, 'sentiment': sentiment}
+        for name in names:
+            fn, label = CASES[name](ctx)
+            res = measure(fn, args.repeat)
+            res['input'] = label
+            results[name] = res
+            print(f"{name:16} {res['median_ms']:>12.2f} {res['min_ms']:>9.2f} {res['p90_ms']:>9.2f}  {label}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Taban çizgisi kaydedildi: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        env = baseline.get('environment', {})
+        if env.get('lstm_backend') not in (None, ai_engine.LSTM_BACKEND):
+            print(f"⚠️ Taban çizgisi '{env['lstm_backend']}' motoruyla alınmış; kıyas yanıltıcı olabilir.")
+        print(f"\n📏 Kıyas: {args.compare} ({env.get('created_at', '?')}, eşik %{args.threshold * 100:.0f})")
+        print(f"{'Vaka':16} {'Önce (ms)':>10} {'Şimdi (ms)':>11} {'Oran':>7}  Durum")
+        print("-" * 60)
+        rows = compare(results, baseline, args.threshold)
+        for name, old, new, ratio, status in rows:
+            old_s = f"{old:.2f}" if old is not None else "-"
+            ratio_s = f"{ratio:.2f}x" if ratio is not None else "-"
+            mark = "🔴 " if status == 'GERİLEME' else "🟢 " if status == 'iyileşme' else ""
+            print(f"{name:16} {old_s:>10} {new:>11.2f} {ratio_s:>7}  {mark}{status}")
+        regressions = [r[0] for r in rows if r[4] == 'GERİLEME']
+        if regressions:
+            print(f"\n🚨 Gerileme: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ Eşiği aşan gerileme yok.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Senaryo Motoru Ölçümü: Monte Carlo bantlarının maliyeti ve kapsama oranı.
+
+Sentetik rastgele yürüyüş (günlük ~%2 oynaklık) üzerinde:
+  - Maliyet  : forecast_scenarios süresi, senaryo sayısına göre (tek predict_future ile kıyas)
+  - Kapsama  : Geriye dönük kayan başlangıç noktalarında, 5. gün gerçekleşen fiyatın
+               %5-95 ve %25-75 bantlarına düşme oranı (ideal: 0.90 / 0.50)
+
+Kullanım:
+    python benchmarks/scenario_bench.py
+    python benchmarks/scenario_bench.py --scenarios 100 2000 50000 --origins 100 --json scenarios.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+import statistics
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neuro_modules import ai_engine
+
+
+def synthetic_close(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, n))
+    return pd.DataFrame({'Close': close}, index=pd.bdate_range('2019-01-01', periods=n))
+
+
+def timed_ms(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return 1000 * statistics.median(runs)
+
+
+def coverage(model, scaler, df, origins, n_scenarios):
+    """Kayan başlangıçlarda son gün (5. gün) fiyatının bant içinde kalma oranları."""
+    close = df['Close'].to_numpy()
+    start = ai_engine.LOOKBACK + ai_engine.MC_HISTORY + ai_engine.FORECAST_DAYS
+    ends = np.linspace(start, len(df) - ai_engine.FORECAST_DAYS, origins).astype(int)
+    outer, inner = [], []
+    for end in ends:
+        res = ai_engine.forecast_scenarios(model, scaler, df.iloc[:end], n_scenarios=n_scenarios, seed=int(end))
+        real = close[end + ai_engine.FORECAST_DAYS - 1]
+        bands = res['bands']
+        outer.append(bands[5][-1] <= real <= bands[95][-1])
+        inner.append(bands[25][-1] <= real <= bands[75][-1])
+    return float(np.mean(outer)), float(np.mean(inner))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', type=int, nargs='+', default=[1, 100, 1000, 10000, 100000])
+    parser.add_argument('--bars', type=int, default=1500, help="Sentetik gün sayısı")
+    parser.add_argument('--origins', type=int, default=60, help="Kapsama için başlangıç noktası sayısı")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--lstm-backend', choices=['keras', 'numpy'], default='numpy')
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    ai_engine.LSTM_BACKEND = args.lstm_backend
+    model, scaler, _ = ai_engine.load_models(with_sentiment=False)
+    if model is None or scaler is None:
+        sys.exit("🚨 Model yüklenemedi.")
+
+    df = synthetic_close(args.bars)
+    window = df.iloc[:252]
+    single = timed_ms(lambda: ai_engine.predict_future(model, scaler, window), args.repeat)
+    report = {'backend': args.lstm_backend, 'predict_future_ms': single, 'cost': {}}
+
+    print(f"predict_future (tek yol): {single:.1f} ms\n")
+    print(f"{'Senaryo':>8} {'Süre (ms)':>10}")
+    print("-" * 20)
+    for n in args.scenarios:
+        ms = timed_ms(lambda: ai_engine.forecast_scenarios(model, scaler, window, n_scenarios=n), args.repeat)
+        report['cost'][n] = ms
+        print(f"{n:>8} {ms:>10.1f}")
+
+    outer, inner = coverage(model, scaler, df, args.origins, ai_engine.MC_SCENARIOS)
+    report['coverage'] = {'p5_p95': outer, 'p25_p75': inner, 'origins': args.origins}
+    print(f"\n🎯 Kapsama ({args.origins} başlangıç): %5-95 bandı {outer:.2f} (hedef 0.90), "
+          f"%25-75 bandı {inner:.2f} (hedef 0.50)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
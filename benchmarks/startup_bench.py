@@ -0,0 +1,126 @@
+"""
+Açılış (Cold-Start) Ölçümü: Modül başına import süresi ve RSS bellek artışı.
+
+Her ölçüm TEMİZ bir Python sürecinde yapılır (önceki importlar sonucu etkilemesin).
+'landing' satırı, açılış sayfasının (app.py üst importları) toplam maliyetidir ve
+--budget ile verilen süreyi aşarsa ya da ağır bir çerçeveyi (TensorFlow, transformers,
+torch, google.generativeai) erken yüklerse komut hata koduyla (1) çıkar.
+
+Kullanım:
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --budget 3.0 --json startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Açılış sayfasının ihtiyaç duyduğu modüller (app.py'nin üst importları)
+LANDING_MODULES = [
+    'streamlit', 'pandas', 'plotly.graph_objects',
+    'neuro_modules.ui', 'neuro_modules.market_data', 'neuro_modules.news_scraper',
+    'neuro_modules.ai_engine', 'neuro_modules.pipeline',
+]
+# Tek tek ölçülecek modüller (ağır çerçeveler dahil)
+MODULES = LANDING_MODULES + [
+    'yfinance', 'feedparser', 'joblib', 'sklearn',
+    'tensorflow', 'transformers', 'torch', 'google.generativeai',
+]
+HEAVY = ['tensorflow', 'transformers', 'torch', 'google.generativeai']
+
+_CHILD = r"""
+import sys, time, json, importlib, resource
+sys.path.insert(0, {root!r})
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # /proc yoksa (macOS): tepe RSS (bayt) ile yetin
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+mods = {mods!r}
+before_rss, before_mods = rss_mb(), len(sys.modules)
+t0 = time.perf_counter()
+error = None
+try:
+    for m in mods:
+        importlib.import_module(m)
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+seconds = time.perf_counter() - t0
+print(json.dumps({{
+    'seconds': seconds, 'rss_mb': rss_mb() - before_rss, 'modules_loaded': len(sys.modules) - before_mods,
+    'heavy_loaded': [h for h in {heavy!r} if h in sys.modules], 'error': error,
+}}))
+"""
+
+
+def measure(mods, repeat=3):
+    """Modül listesini 'repeat' kez temiz süreçte import eder; medyan değerleri döndürür."""
+    runs = []
+    for _ in range(repeat):
+        code = _CHILD.format(root=ROOT, mods=list(mods), heavy=HEAVY)
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                             env={**os.environ, 'TF_CPP_MIN_LOG_LEVEL': '3'})
+        lines = [l for l in out.stdout.splitlines() if l.startswith('{')]
+        if not lines:
+            return {'seconds': None, 'rss_mb': None, 'error': out.stderr.strip().splitlines()[-1:]}
+        runs.append(json.loads(lines[-1]))
+    result = dict(runs[-1])
+    result['seconds'] = statistics.median(r['seconds'] for r in runs)
+    result['rss_mb'] = statistics.median(r['rss_mb'] for r in runs)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget', type=float, default=3.0, help="Açılış sayfası için süre bütçesi (sn)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    args = parser.parse_args()
+
+    report = {'landing': measure(LANDING_MODULES, args.repeat), 'modules': {}}
+    print(f"{'Modül':32} {'Süre (sn)':>10} {'RSS (MB)':>10}")
+    print("-" * 56)
+    for mod in args.modules:
+        res = measure([mod], args.repeat)
+        report['modules'][mod] = res
+        if res.get('error'):
+            print(f"{mod:32} {'-':>10} {'-':>10}  ⚠️ {res['error']}")
+        else:
+            print(f"{mod:32} {res['seconds']:>10.3f} {res['rss_mb']:>10.1f}")
+
+    landing = report['landing']
+    print("-" * 56)
+    print(f"{'AÇILIŞ SAYFASI (landing)':32} {landing['seconds']:>10.3f} {landing['rss_mb']:>10.1f}")
+
+    ok = True
+    if landing.get('heavy_loaded'):
+        print(f"🚨 Açılışta ağır çerçeve yüklendi: {landing['heavy_loaded']}")
+        ok = False
+    if landing['seconds'] is None or landing['seconds'] > args.budget:
+        print(f"🚨 Açılış bütçesi aşıldı: {landing['seconds']} sn > {args.budget} sn")
+        ok = False
+    if ok:
+        print(f"✅ Açılış bütçe içinde ({args.budget} sn)")
+
+    report['budget_seconds'] = args.budget
+    report['ok'] = ok
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
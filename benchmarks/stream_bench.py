@@ -0,0 +1,78 @@
+"""
+Akış Modu Gecikme Ölçümü: Bar -> karar süresi (yüzdelikler), birkaç yüz hisse.
+
+Sentetik dakikalık barlar ReplayFeed ile gerçek zamanlı hızda (--bar-seconds) oynatılır;
+her bar kapanışında StreamEngine tüm hisseleri tahmin eder. İki mod karşılaştırılır:
+  - micro : Bar kapanışında tüm hisseler tek predict çağrısında (MAX_BATCH)
+  - tekil : Hisse başına ayrı predict çağrısı (max_batch=1, eski tek hisselik yol gibi)
+
+Bar aralığı işlem süresinden kısaysa kuyruk dolar ve besleme bekletilir (backpressure);
+bu durum 'Bekleme' sütununda görünür ve gecikme yüzdeliklerine yansır.
+
+Kullanım:
+    python benchmarks/stream_bench.py
+    python benchmarks/stream_bench.py --symbols 100 300 500 --bars 20 --bar-seconds 1.0 --json stream.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neuro_modules import ai_engine, streaming
+
+MODES = {'micro': streaming.MAX_BATCH, 'tekil': 1}
+
+
+def run_once(model, scaler, n_symbols, bars, bar_seconds, max_batch, queue_size, warmup):
+    frames = streaming.synthetic_frames(n_symbols, warmup + bars)
+    engine = streaming.StreamEngine(model, scaler, queue_size=queue_size, max_batch=max_batch)
+    engine.warm_up({t: df.iloc[:warmup] for t, df in frames.items()})
+    feed = streaming.ReplayFeed({t: df.iloc[warmup:] for t, df in frames.items()}, bar_seconds)
+    t0 = time.perf_counter()
+    stats = engine.run(feed)
+    stats['wall_s'] = time.perf_counter() - t0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[100, 300, 500])
+    parser.add_argument('--bars', type=int, default=20, help="Ölçülen bar sayısı (ısınma hariç)")
+    parser.add_argument('--bar-seconds', type=float, default=0.5, help="Bar aralığı (gerçek zamanlı hız)")
+    parser.add_argument('--queue-size', type=int, default=streaming.QUEUE_SIZE)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--lstm-backend', choices=['keras', 'numpy'], default='numpy')
+    parser.add_argument('--json', help="Sonuçları bu dosyaya yaz")
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    ai_engine.LSTM_BACKEND = args.lstm_backend
+    model, scaler, _ = ai_engine.load_models(with_sentiment=False)
+    if model is None or scaler is None:
+        sys.exit("🚨 Model yüklenemedi.")
+    warmup = ai_engine.LOOKBACK + 1
+
+    report = {'backend': args.lstm_backend, 'bar_seconds': args.bar_seconds, 'bars': args.bars, 'runs': []}
+    print(f"{'Hisse':>6} {'Mod':6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'maks':>8} "
+          f"{'Batch':>6} {'Tahmin/batch':>13} {'Kuyruk':>7} {'Bekleme':>8}")
+    print("-" * 92)
+    for n in args.symbols:
+        for mode in args.modes:
+            stats = run_once(model, scaler, n, args.bars, args.bar_seconds, MODES[mode], args.queue_size, warmup)
+            report['runs'].append({'symbols': n, 'mode': mode, **stats})
+            print(f"{n:>6} {mode:6} {stats['latency_p50_ms']:>9.1f} {stats['latency_p95_ms']:>9.1f} "
+                  f"{stats['latency_p99_ms']:>9.1f} {stats['latency_max_ms']:>8.1f} {stats['avg_batch']:>6.0f} "
+                  f"{stats['avg_predict_ms']:>10.1f} ms {stats['queue_max']:>7} {stats['producer_wait_s']:>7.2f}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
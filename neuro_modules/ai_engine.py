@@ -9,114 +9,263 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 import streamlit as st
 import numpy as np
 import pandas as pd
+import time
 import joblib
-from tensorflow.keras.models import load_model
-from transformers import pipeline
-import google.generativeai as genai
+from numpy.lib.stride_tricks import sliding_window_view
+# NOT: TensorFlow, transformers ve google.generativeai burada import EDİLMEZ.
+# Bu çerçeveler saniyeler süren açılış maliyeti getirir; sadece ihtiyaç duyan
+# fonksiyonun içinde (load_brains, ask_gemini) yüklenir. Böylece açılış sayfası hızlı kalır.
+from neuro_modules.sentiment_cache import get_sentiment_cache, headline_key
+from neuro_modules.sentiment_model import load_sentiment_pipeline, sentiment_model_id
+from neuro_modules import telemetry
 
 # --- AYARLAR ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_DIR = os.path.join(BASE_DIR, 'models')
+# LSTM çıkarım motoru: 'keras' (TensorFlow) veya 'numpy' (TensorFlow'suz, neuro_modules/numpy_lstm.py)
+LSTM_BACKEND = os.environ.get("NEUROQUANT_LSTM_BACKEND", "keras").lower()
 
 @st.cache_resource
 def load_brains():
     """
     LSTM Modelini, Scaler'ı ve FinBERT'i yükler.
     Artık 3 parça dönüyor: Model, Scaler, Pipe.
+    Streamlit önbelleği sayesinde oturum boyunca bir kez yüklenir.
+    """
+    return load_models(on_error=st.error, on_warning=st.warning)
+
+def load_models(on_error=print, on_warning=print, with_sentiment=True):
+    """
+    Streamlit'e bağımlı olmayan yükleyici (komut satırı araçları ve
+    işçi süreçler için). Hatalar on_error / on_warning ile bildirilir.
+    with_sentiment=False ise FinBERT hiç yüklenmez (haber analizi gerekmiyorsa).
+
+    Returns:
+        (model, scaler, sentiment_pipe): Yüklenemeyen parça None olur.
     """
     print("🧠 LSTM Motorları Yükleniyor...")
     
     # 1. LSTM Modeli (.h5)
     try:
-        model = load_model(os.path.join(MODEL_DIR, 'universal_lstm.h5'))
+        with telemetry.span("model_load.lstm"):
+            model = load_lstm(os.path.join(MODEL_DIR, 'universal_lstm.h5'))
     except Exception as e:
-        st.error(f"🚨 Model Dosyası Bulunamadı: {e}")
+        on_error(f"🚨 Model Dosyası Bulunamadı: {e}")
         return None, None, None
 
     # 2. Scaler (.pkl) - LSTM için şart!
     try:
         scaler = joblib.load(os.path.join(MODEL_DIR, 'universal_scaler.pkl'))
     except Exception as e:
-        st.error(f"🚨 Scaler Bulunamadı: {e}")
+        on_error(f"🚨 Scaler Bulunamadı: {e}")
         return model, None, None
 
-    # 3. FinBERT (Haber Analizi)
+    # 3. FinBERT (Haber Analizi) - NEUROQUANT_FINBERT_QUANT=int8 ile nicemlenmiş mod
+    if not with_sentiment:
+        return model, scaler, None
     try:
-        sentiment_pipe = pipeline("sentiment-analysis", model="yiyanghkust/finbert-tone")
+        with telemetry.span("model_load.finbert"):
+            sentiment_pipe = load_sentiment_pipeline()
     except Exception as e:
-        st.warning(f"⚠️ FinBERT yüklenemedi (Haber analizi çalışmayacak): {e}")
+        on_warning(f"⚠️ FinBERT yüklenemedi (Haber analizi çalışmayacak): {e}")
         return model, scaler, None
 
     return model, scaler, sentiment_pipe
 
+def load_lstm(path, backend=None):
+    """
+    LSTM modelini seçilen motorla yükler. İki motor da aynı
+    'predict(x, verbose=0)' arayüzünü sunar.
+    'numpy' motoru ağırlıkları h5py ile okur; TensorFlow hiç yüklenmez.
+    """
+    backend = (backend or LSTM_BACKEND).lower()
+    if backend == "numpy":
+        from neuro_modules.numpy_lstm import NumpyLSTMModel
+        return NumpyLSTMModel.from_h5(path)
+    if backend != "keras":
+        raise ValueError(f"Bilinmeyen LSTM motoru: {backend} (keras | numpy)")
+    from tensorflow.keras.models import load_model
+    return load_model(path)
+
 # --- TEKNİK ANALİZ MOTORU (LSTM UYUMLU) ---
+LOOKBACK = 60
+FORECAST_DAYS = 5
+MAX_DAILY_MOVE = 0.10  # LSTM bazen uçabilir, %10 üstü değişimleri tıraşlıyoruz.
+
 def predict_future(model, scaler, df):
     """
     LSTM ile Gelecek Tahmini.
     Scaler kullanarak veriyi 0-1 arasına sıkıştırır ve 3D formatına sokar.
+    Tek hisselik yol, toplu yolun (predict_future_batch) N=1 halidir.
+    """
+    return predict_future_batch(model, scaler, [df])[0]
+
+def predict_future_batch(model, scaler, dfs):
     """
+    Çok Hisseli (Batch) LSTM Tahmini.
+    Her DataFrame'in son 60 günlük ölçeklenmiş penceresini tek bir (N, 60, 1)
+    tensörde birleştirir ve TEK bir model.predict çağrısı yapar.
+    Ölçekleme, ters ölçekleme, kırpma ve fiyat inşası tamamen vektöreldir.
+
+    Returns:
+        list: Her DataFrame için 5 günlük fiyat listesi (girdi sırasıyla).
+    """
+    results = [None] * len(dfs)
+    ready_idx, windows, last_prices = [], [], []
+
     # 1. Veriyi Hazırla (% Değişim)
-    prices = df['Close'].values
-    pct_changes = df['Close'].pct_change().fillna(0).values.reshape(-1, 1)
-    
-    # Yeterli veri kontrolü (60 gün lazım)
-    if len(pct_changes) < 60:
-        return [prices[-1]] * 5
-        
-    # 2. Ölçeklendir (Scaling)
-    # Model 0-1 arası sayılarla eğitildi, aynısını verelim.
-    scaled_data = scaler.transform(pct_changes)
-    
-    # 3. Son 60 günü al ve Reshape yap (1, 60, 1)
-    # (Batch Size, Time Steps, Features)
-    current_batch = scaled_data[-60:].reshape(1, 60, 1)
-    
-    # 4. Tahmin Et
-    predicted_scaled = model.predict(current_batch, verbose=0)[0] # Çıktı: [0.5, 0.6, ...]
-    
-    # 5. Ters Ölçeklendir (Inverse Transform)
-    # Modelin ürettiği 0-1 arası sayıları tekrar % değişime çevir.
-    predicted_pcts = scaler.inverse_transform(predicted_scaled.reshape(-1, 1)).flatten()
-    
-    # 6. Fiyatı İnşa Et
-    current_price = prices[-1]
-    future_prices = []
-    
-    for pct in predicted_pcts:
-        # Volatilite Kontrolü (Opsiyonel Güvenlik)
-        # LSTM bazen uçabilir, %10 üstü değişimleri tıraşlayalım.
-        if pct > 0.10: pct = 0.10
-        if pct < -0.10: pct = -0.10
-            
-        next_price = current_price * (1 + pct)
-        future_prices.append(next_price)
-        current_price = next_price
-        
-    return future_prices
+    for i, df in enumerate(dfs):
+        prices = df['Close'].values
+        # Yeterli veri kontrolü (60 gün lazım)
+        if len(prices) < LOOKBACK:
+            results[i] = [prices[-1]] * FORECAST_DAYS
+            continue
+        pct_changes = df['Close'].pct_change().fillna(0).values
+        windows.append(pct_changes[-LOOKBACK:])
+        last_prices.append(prices[-1])
+        ready_idx.append(i)
+
+    if not ready_idx:
+        return results
+
+    future = predict_from_windows(model, scaler, np.stack(windows), last_prices)
+    for row, i in enumerate(ready_idx):
+        results[i] = list(future[row])
+    return results
+
+def predict_from_windows(model, scaler, windows, last_prices):
+    """
+    Hazır % değişim pencerelerinden (N, 60) 5 günlük fiyat yolları (N, 5).
+    predict_future_batch'in çekirdeği; akış modu (streaming) pencereleri kendi
+    tamponlarından kurup doğrudan buraya verir (DataFrame kurmadan).
+    """
+    return build_price_paths(np.asarray(last_prices), predict_pcts(model, scaler, windows))
+
+def predict_pcts(model, scaler, windows):
+    """(N, 60) % değişim pencereleri -> (N, 5) günlük % değişim tahmini (tek model.predict)."""
+    raw = np.asarray(windows, dtype=float)
+    n = len(raw)
+    # 2. Ölçeklendir (Scaling) - Tüm pencereler tek seferde
+    # Scaler tek sütun (n, 1) bekliyor; düzleştirip geri katlıyoruz.
+    scaled = scaler.transform(raw.reshape(-1, 1)).reshape(n, LOOKBACK, 1)
+
+    # 3. Tahmin Et (Tek çağrı, Çıktı: (N, 5))
+    with telemetry.span("inference"):
+        predicted_scaled = np.asarray(model.predict(scaled, verbose=0)).reshape(n, -1)
+
+    # 4. Ters Ölçeklendir
+    return scaler.inverse_transform(predicted_scaled.reshape(-1, 1)).reshape(predicted_scaled.shape)
+
+def build_price_paths(last_prices, predicted_pcts):
+    """
+    Yüzdesel tahminlerden fiyat yolunu kurar (vektörel).
+    Döngüdeki 'fiyat * (1 + pct)' çarpım sırası birebir korunur; böylece
+    sonuç eski tek hisselik Python döngüsüyle bit düzeyinde aynıdır.
+
+    Args:
+        last_prices: (N,) son kapanış fiyatları
+        predicted_pcts: (N, 5) günlük % değişim tahminleri
+    """
+    pcts = np.asarray(predicted_pcts)
+    # Volatilite Kontrolü (Opsiyonel Güvenlik)
+    # Eski döngü kırpılan değeri Python float'ı (0.10) ile değiştiriyordu;
+    # aynı sonucu almak için kırpılan hücreleri float64 olarak yazıyoruz.
+    growth = (1 + pcts).astype(float)
+    growth[pcts > MAX_DAILY_MOVE] = 1 + MAX_DAILY_MOVE
+    growth[pcts < -MAX_DAILY_MOVE] = 1 - MAX_DAILY_MOVE
+
+    # [fiyat, 1+p0, 1+p1, ...] dizisinin kümülatif çarpımı = fiyat*(1+p0)*(1+p1)...
+    last = np.asarray(last_prices, dtype=float).reshape(growth.shape[:-1] + (1,))
+    chain = np.concatenate([last, growth], axis=-1)
+    return np.multiply.accumulate(chain, axis=-1)[..., 1:]
+
+# --- SENARYO MOTORU (MONTE CARLO BANTLARI) ---
+MC_SCENARIOS = 2000                       # Hisse başına senaryo sayısı
+MC_HISTORY = 120                          # Artık (residual) havuzu: son 120 tahmin penceresi
+MC_PERCENTILES = (5, 25, 50, 75, 95)
+
+def forecast_scenarios(model, scaler, df, n_scenarios=MC_SCENARIOS, history=MC_HISTORY,
+                       percentiles=MC_PERCENTILES, seed=None):
+    """
+    Bootstrap artıklarıyla Monte Carlo fiyat bantları.
+
+    1. Son 'history' günün pencereleri + bugünün penceresi TEK predict çağrısında tahmin edilir.
+    2. Geçmiş pencereler için artık = gerçekleşen 5 günlük % değişim - tahmin (5'li vektör;
+       günler arası ilişki korunur).
+    3. Senaryo = bugünün tahmini + rastgele seçilmiş bir geçmiş artık vektörü. Tüm senaryolar
+       tek bir (n_scenarios, 5) dizi işlemiyle kurulur; fiyat yolu ve ±%10 kırpma
+       build_price_paths ile aynıdır.
+
+    Model maliyeti senaryo sayısından bağımsızdır (history + 1 pencere); binlerce senaryo
+    sadece birkaç milisaniyelik numpy işlemidir.
+
+    Returns:
+        dict: 'base' (5,) tahmin yolu, 'bands' {yüzdelik: (5,) fiyat}, 'n_scenarios',
+              'n_residuals'. Veri yetersizse None.
+    """
+    pct = df['Close'].pct_change().fillna(0).to_numpy(dtype=float)
+    last_price = float(df['Close'].iloc[-1])
+    # Geçmiş pencere j: girdi pct[j-60:j], gerçekleşen pct[j:j+5] (j + 5 <= len)
+    n_hist = min(history, len(pct) - LOOKBACK - FORECAST_DAYS + 1)
+    if n_hist < 1:
+        return None
+
+    views = sliding_window_view(pct, LOOKBACK)            # views[k] = pct[k:k+60]
+    first = len(pct) - FORECAST_DAYS - n_hist - LOOKBACK + 1
+    windows = np.concatenate([views[first:first + n_hist], pct[None, -LOOKBACK:]])
+    predicted = predict_pcts(model, scaler, windows)      # (n_hist + 1, 5), TEK çağrı
 
-# --- DUYGU ANALİZİ (AYNI KALDI) ---
-def score_news(sentiment_pipe, news_list):
+    actual = sliding_window_view(pct, FORECAST_DAYS)[first + LOOKBACK:first + LOOKBACK + n_hist]
+    residuals = actual - predicted[:-1]
+    base_pcts = predicted[-1]
+
+    rng = np.random.default_rng(seed)
+    draws = residuals[rng.integers(0, n_hist, size=n_scenarios)]   # (S, 5)
+    paths = build_price_paths(np.full(n_scenarios, last_price), base_pcts + draws)
+    bands = np.percentile(paths, percentiles, axis=0)
+    return {
+        'base': build_price_paths(np.array([last_price]), base_pcts[None])[0],
+        'bands': {p: band for p, band in zip(percentiles, bands)},
+        'n_scenarios': n_scenarios,
+        'n_residuals': n_hist,
+    }
+
+# --- DUYGU ANALİZİ (BATCH + ÖNBELLEK) ---
+SENTIMENT_BATCH_SIZE = 16
+SENTIMENT_MAX_CHARS = 512
+
+def score_news(sentiment_pipe, news_list, batch_size=SENTIMENT_BATCH_SIZE, cache=None):
+    """
+    Haber başlıklarını FinBERT ile puanlar.
+    Tüm başlıklar toplu (batch) halde modele gider; daha önce puanlanmış başlıklar
+    içerik özetli önbellekten gelir (aynı başlık bir kez puanlanır).
+    """
     if not news_list or not sentiment_pipe:
         return 0, "Nötr", None
+
+    cache = cache if cache is not None else get_sentiment_cache()
+    titles = [news['title'][:SENTIMENT_MAX_CHARS] if news.get('title') else None for news in news_list]
+    results = classify_headlines(sentiment_pipe, titles, batch_size=batch_size, cache=cache)
+    stats = cache.get_stats()
+    print(f"🧮 Duygu Analizi: {len(titles)} başlık | Önbellek isabeti: %{stats['hit_rate'] * 100:.0f} "
+          f"| Ort. batch: {stats['avg_batch_ms']:.0f} ms")
     
     total_score = 0
     analyzed_count = 0
     min_score = 1.0 
     riskiest_news = None 
     
-    for news in news_list:
-        try:
-            result = sentiment_pipe(news['title'][:512])[0]
-            score = result['score'] if result['label'] == 'Positive' else -result['score'] if result['label'] == 'Negative' else 0
-            news['ai_score'] = score
-            
-            if score < min_score:
-                min_score = score
-                if score < -0.2: riskiest_news = news 
-            
-            total_score += score
-            analyzed_count += 1
-        except: continue
+    for news, result in zip(news_list, results):
+        if result is None: continue
+        score = result['score'] if result['label'] == 'Positive' else -result['score'] if result['label'] == 'Negative' else 0
+        news['ai_score'] = score
+        
+        if score < min_score:
+            min_score = score
+            if score < -0.2: riskiest_news = news 
+        
+        total_score += score
+        analyzed_count += 1
         
     if analyzed_count == 0: return 0, "Nötr", None
     
@@ -124,6 +273,65 @@ def score_news(sentiment_pipe, news_list):
     label = "POZİTİF" if avg > 0.15 else "NEGATİF" if avg < -0.15 else "NÖTR"
     return avg, label, riskiest_news
 
+@telemetry.timed("sentiment")
+def classify_headlines(sentiment_pipe, titles, batch_size=SENTIMENT_BATCH_SIZE, cache=None):
+    """
+    Başlık listesini sınıflandırır; sonuçlar girdi sırasıyla döner
+    (başarısız / boş başlıklar için None).
+    Önbellekte olmayan TEKİL başlıklar batch_size'lık gruplar halinde modele gider.
+    """
+    cache = cache if cache is not None else get_sentiment_cache()
+    model_id = sentiment_model_id(sentiment_pipe)
+    keys = [headline_key(t, model_id) if t else None for t in titles]
+    known = cache.get_many([k for k in dict.fromkeys(keys) if k])
+
+    # Puanlanacak tekil başlıklar (aynı başlık bir kez)
+    pending = {}
+    for key, title in zip(keys, titles):
+        if key and key not in known and key not in pending:
+            pending[key] = title
+
+    fresh = {}
+    pending_items = list(pending.items())
+    for i in range(0, len(pending_items), batch_size):
+        chunk = pending_items[i:i + batch_size]
+        t0 = time.perf_counter()
+        fresh.update(_run_sentiment_batch(sentiment_pipe, chunk))
+        cache.record_batch(len(chunk), time.perf_counter() - t0)
+
+    cache.put_many(fresh)
+    known.update(fresh)
+    return [known.get(key) if key else None for key in keys]
+
+def _run_sentiment_batch(sentiment_pipe, chunk):
+    """Tek bir batch'i modele verir; batch hata verirse başlıkları tek tek dener."""
+    texts = [title for _, title in chunk]
+    try:
+        outputs = sentiment_pipe(texts, batch_size=len(texts), truncation=True)
+        return {key: {'label': out['label'], 'score': float(out['score'])}
+                for (key, _), out in zip(chunk, outputs)}
+    except Exception as e:
+        print(f"⚠️ FinBERT batch hatası, tek tek deneniyor: {e}")
+
+    results = {}
+    for key, title in chunk:
+        try:
+            out = sentiment_pipe(title, truncation=True)[0]
+            results[key] = {'label': out['label'], 'score': float(out['score'])}
+        except Exception:
+            continue
+    return results
+
+def get_sentiment_stats():
+    """Başlık önbelleğinin isabet oranı ve batch gecikmeleri."""
+    return get_sentiment_cache().get_stats()
+
+def _sentiment_cache_counts():
+    stats = get_sentiment_stats()
+    return {'hits': stats['hits'] + stats['disk_hits'], 'misses': stats['misses']}
+
+telemetry.register_cache("sentiment", _sentiment_cache_counts)
+
 # --- KARAR MEKANİZMASI ---
 def make_final_decision(preds, sentiment_score, riskiest_news, current_rsi):
     start_p = preds[0]
@@ -144,42 +352,40 @@ def make_final_decision(preds, sentiment_score, riskiest_news, current_rsi):
 
 
 
-def ask_gemini(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score):
+def gemini_inputs(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score):
     """
-    Gemini Pro'ya HEM TEKNİK HEM HABER verilerini gönderip hibrit yorum ister.
+    Prompt girdilerini normalize eder (önbellek anahtarı bunlardan üretilir).
+    Yuvarlama sayesinde fiyattaki anlamsız kuruş oynamaları aynı yanıtı kullanır.
     """
-    try:
-        # 1. API Anahtarını Al
-        import streamlit as st
-        import google.generativeai as genai
-        
-        if "GEMINI_API_KEY" in st.secrets:
-            api_key = st.secrets["GEMINI_API_KEY"]
-        else:
-            return "⚠️ Hata: Streamlit Secrets içinde 'GEMINI_API_KEY' bulunamadı."
-
-        # 2. Modeli Hazırla
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-3-flash-preview')
-
-        # 3. Haberleri Özetle (İlk 3 başlığı alalım ki model boğulmasın)
-        news_summary = "Henüz güncel haber yok."
-        if news_list:
-            titles = [f"- {n.get('title', '')}" for n in news_list[:3]]
-            news_summary = "\n".join(titles)
-
-        # 4. Soruyu Hazırla (Prompt Engineering - Hibrit Analiz)
-        prompt = f"""
-        Sen profesyonel bir finansal stratejistsin. Aşağıdaki verileri birleştirerek {ticker} için bir analiz yaz.
+    titles = [" ".join(str(n.get('title', '')).split()) for n in (news_list or [])[:3]]
+    return {
+        'ticker': str(ticker).upper().strip(),
+        'price': round(float(price), 2),
+        'rsi': round(float(rsi), 1),
+        'macd_signal': macd_signal,
+        'decision': decision,
+        'sentiment': round(float(sentiment_score), 2),
+        'titles': titles,
+    }
+
+def build_gemini_prompt(inputs):
+    # Haberleri Özetle (İlk 3 başlığı alalım ki model boğulmasın)
+    news_summary = "Henüz güncel haber yok."
+    if inputs['titles']:
+        news_summary = "\n".join(f"- {t}" for t in inputs['titles'])
+
+    # Soruyu Hazırla (Prompt Engineering - Hibrit Analiz)
+    return f"""
+        Sen profesyonel bir finansal stratejistsin. Aşağıdaki verileri birleştirerek {inputs['ticker']} için bir analiz yaz.
         
         A) TEKNİK GÖSTERGELER:
-        - Fiyat: {price}
-        - RSI: {rsi:.2f} (30 altı aşırı satım, 70 üstü aşırı alım)
-        - MACD Durumu: {macd_signal}
-        - Algoritma Kararı: {decision}
+        - Fiyat: {inputs['price']}
+        - RSI: {inputs['rsi']:.2f} (30 altı aşırı satım, 70 üstü aşırı alım)
+        - MACD Durumu: {inputs['macd_signal']}
+        - Algoritma Kararı: {inputs['decision']}
         
         B) TEMEL ANALİZ (HABERLER & DUYGU):
-        - Piyasa Duygusu Skoru: {sentiment_score:.2f} (-1 Negatif, +1 Pozitif)
+        - Piyasa Duygusu Skoru: {inputs['sentiment']:.2f} (-1 Negatif, +1 Pozitif)
         - Son Başlıklar:
         {news_summary}
         
@@ -189,9 +395,41 @@ def ask_gemini(ticker, price, rsi, macd_signal, decision, news_list, sentiment_s
         Yatırım tavsiyesi vermeden, riskleri ve fırsatları 3-4 cümleyle, akıcı bir Türkçe ile anlat.
         """
 
-        # 5. Cevabı Al
-        response = model.generate_content(prompt)
-        return response.text
+def _gemini_api_key():
+    """Anahtar: Streamlit Secrets, yoksa GEMINI_API_KEY ortam değişkeni."""
+    try:
+        if "GEMINI_API_KEY" in st.secrets:
+            return st.secrets["GEMINI_API_KEY"]
+    except Exception:
+        pass  # secrets.toml yok (komut satırı)
+    return os.environ.get("GEMINI_API_KEY")
 
+def ask_gemini_stream(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score):
+    """
+    Gemini Pro'ya HEM TEKNİK HEM HABER verilerini gönderip hibrit yorum ister.
+    Yanıtı parça parça üretir (arayüz ilk kelimeyi hemen gösterebilsin).
+    İstemci paylaşılır; aynı girdiler önbellekten, hız sınırı içinde yanıtlanır.
+    """
+    from neuro_modules.gemini_client import get_gemini_client, GEMINI_BACKEND
+
+    # 1. İstemciyi Al (Süreç başına bir kez kurulur)
+    try:
+        api_key = _gemini_api_key()
+        if GEMINI_BACKEND == "google" and not api_key:
+            yield "⚠️ Hata: Streamlit Secrets içinde 'GEMINI_API_KEY' bulunamadı."
+            return
+        client = get_gemini_client(api_key)
     except Exception as e:
-        return f"Üzgünüm, Gemini şu an yanıt veremiyor. Hata: {str(e)}"
\ No newline at end of file
+        yield f"Üzgünüm, Gemini şu an yanıt veremiyor. Hata: {str(e)}"
+        return
+
+    # 2. Soruyu Hazırla ve Cevabı Akıt
+    inputs = gemini_inputs(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score)
+    try:
+        yield from client.stream(build_gemini_prompt(inputs), inputs)
+    except Exception as e:
+        yield f"Üzgünüm, Gemini şu an yanıt veremiyor. Hata: {str(e)}"
+
+def ask_gemini(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score):
+    """ask_gemini_stream'in tam metin dönen hali."""
+    return "".join(ask_gemini_stream(ticker, price, rsi, macd_signal, decision, news_list, sentiment_score))
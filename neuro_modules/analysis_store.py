@@ -0,0 +1,302 @@
+"""
+Analiz Deposu: Her analizin kalıcı kaydı (SQLite dizin + Parquet bölümleri).
+
+Her çalıştırma bir DataFrame (OHLCV + göstergeler), 5 günlük tahmin, duygu skoru ve
+make_final_decision kararı üretir. Depo bunları diske yazar; geçmiş kararlar yeniden
+hesaplamadan sorgulanır, dışa aktarımlar (CSV / Parquet) depodan üretilir.
+
+    <STORE_DIR>/
+        index.sqlite                                   -> analyses tablosu (karar + özet, 1 satır / analiz)
+        bars/ticker=NVDA/date=2026-10-18/<id>.parquet  -> df (OHLCV + göstergeler)
+        news/ticker=NVDA/date=2026-10-18/<id>.parquet  -> haberler (başlık, kaynak, link, ai_score)
+        exports/<id>.csv                               -> İlk istekte üretilen CSV (sonrakiler dosyadan)
+
+Karar sorguları sadece SQLite'a gider ((ticker, created_at) indeksi); Parquet dosyaları
+yalnızca bir analizin ayrıntısı ya da dışa aktarımı istendiğinde okunur.
+Kayıtlar değişmez (append-only): Aynı hisse için her analiz yeni bir satırdır.
+"""
+import os
+import json
+import time
+import uuid
+import datetime
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+# --- AYARLAR ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_DIR = os.environ.get("NEUROQUANT_STORE_DIR", os.path.join(BASE_DIR, 'analysis_store'))
+EXPORT_FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id              TEXT PRIMARY KEY,
+    ticker          TEXT NOT NULL,
+    created_at      REAL NOT NULL,      -- epoch saniye (analizin yapıldığı an)
+    analysis_date   TEXT NOT NULL,      -- YYYY-MM-DD (Parquet bölümü)
+    period          TEXT,
+    last_bar        TEXT,
+    n_bars          INTEGER,
+    price           REAL,
+    rsi             REAL,
+    predictions     TEXT,               -- JSON: 5 günlük fiyat tahmini
+    change_pct      REAL,               -- Tahmin edilen 5 günlük değişim (%)
+    sentiment       REAL,
+    sentiment_label TEXT,
+    risky_title     TEXT,
+    n_news          INTEGER,
+    decision        TEXT,
+    color           TEXT,
+    explanation     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_ticker_time ON analyses (ticker, created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_time ON analyses (created_at);
+"""
+_COLUMNS = ['id', 'ticker', 'created_at', 'analysis_date', 'period', 'last_bar', 'n_bars', 'price', 'rsi',
+            'predictions', 'change_pct', 'sentiment', 'sentiment_label', 'risky_title', 'n_news',
+            'decision', 'color', 'explanation']
+NEWS_COLUMNS = ['title', 'source', 'published', 'link', 'ai_score']
+
+
+def _epoch(ts):
+    """Tarih / zaman damgası / epoch -> epoch saniye (saat dilimsizse yerel saat kabul edilir)."""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        return time.mktime(ts.timetuple()) + ts.microsecond / 1e6
+    return ts.timestamp()
+
+
+def summarize_analysis(ticker, analysis, period=None, created_at=None):
+    """app.run_analysis paketinden dizin satırını üretir (karar + özet alanlar)."""
+    df = analysis['df']
+    preds = [float(p) for p in np.ravel(analysis['future_preds'])]
+    avg_sentiment, sentiment_label, risky_news = analysis['sentiment']
+    decision, color, explanation = analysis['decision']
+    created_at = time.time() if created_at is None else created_at
+    return {
+        'id': f"{time.strftime('%Y%m%d%H%M%S', time.localtime(created_at))}-{uuid.uuid4().hex[:8]}",
+        'ticker': str(ticker).upper().strip(),
+        'created_at': float(created_at),
+        'analysis_date': time.strftime('%Y-%m-%d', time.localtime(created_at)),
+        'period': period,
+        'last_bar': str(df.index[-1]) if len(df) else None,
+        'n_bars': int(len(df)),
+        'price': float(df['Close'].iloc[-1]) if len(df) else None,
+        'rsi': float(df['RSI'].iloc[-1]) if 'RSI' in df and len(df) else None,
+        'predictions': json.dumps(preds),
+        'change_pct': (preds[-1] - preds[0]) / preds[0] * 100 if preds and preds[0] else None,
+        'sentiment': float(avg_sentiment),
+        'sentiment_label': sentiment_label,
+        'risky_title': risky_news.get('title') if risky_news else None,
+        'n_news': len(analysis.get('news_list') or []),
+        'decision': decision,
+        'color': color,
+        'explanation': explanation,
+    }
+
+
+class AnalysisStore:
+    """SQLite dizini + Parquet bölümleri. İş parçacığı güvenli (tek bağlantı + kilit)."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        # WAL: Okuyucular (başka süreçler dahil) yazarı beklemez
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.stats = {'saved': 0, 'queries': 0, 'exports': 0, 'export_hits': 0}
+
+    # --- Yollar ---
+    def _part_path(self, kind, row, ext='parquet'):
+        return os.path.join(self.root, kind, f"ticker={row['ticker']}", f"date={row['analysis_date']}",
+                            f"{row['id']}.{ext}")
+
+    def _export_path(self, analysis_id, fmt):
+        return os.path.join(self.root, 'exports', f"{analysis_id}.{fmt}")
+
+    @staticmethod
+    def _write_parquet(df, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Önce geçici dosyaya yaz, sonra taşı (yarım kalan yazım okunmasın)
+        df.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    # --- Yazma ---
+    def save(self, ticker, analysis, period=None, created_at=None):
+        """
+        Analizi kaydeder; analiz kimliğini (id) döndürür.
+        Önce Parquet dosyaları yazılır, dizin satırı en son eklenir: Dizinde görünen
+        her analizin ayrıntısı diskte vardır.
+        """
+        row = summarize_analysis(ticker, analysis, period, created_at)
+        self._write_parquet(analysis['df'], self._part_path('bars', row))
+        news = pd.DataFrame([{c: n.get(c) for c in NEWS_COLUMNS} for n in analysis.get('news_list') or []],
+                            columns=NEWS_COLUMNS)
+        news[NEWS_COLUMNS[:-1]] = news[NEWS_COLUMNS[:-1]].astype('string')
+        news['ai_score'] = pd.to_numeric(news['ai_score'], errors='coerce')
+        self._write_parquet(news, self._part_path('news', row))
+
+        with self._lock:
+            self._db.execute(f"INSERT INTO analyses ({','.join(_COLUMNS)}) VALUES ({','.join('?' * len(_COLUMNS))})",
+                             [row[c] for c in _COLUMNS])
+            self._db.commit()
+            self.stats['saved'] += 1
+        return row['id']
+
+    # --- Okuma ---
+    def get(self, analysis_id):
+        """Tek analizin dizin satırı (dict) veya None."""
+        with self._lock:
+            cur = self._db.execute(f"SELECT {','.join(_COLUMNS)} FROM analyses WHERE id = ?", (analysis_id,))
+            values = cur.fetchone()
+        if values is None:
+            return None
+        row = dict(zip(_COLUMNS, values))
+        row['predictions'] = json.loads(row['predictions']) if row['predictions'] else []
+        return row
+
+    def load_bars(self, analysis_id):
+        """Analizde kullanılan OHLCV + gösterge tablosu."""
+        row = self._require(analysis_id)
+        return pd.read_parquet(self._part_path('bars', row))
+
+    def load_news(self, analysis_id):
+        row = self._require(analysis_id)
+        return pd.read_parquet(self._part_path('news', row))
+
+    def _require(self, analysis_id):
+        row = self.get(analysis_id)
+        if row is None:
+            raise KeyError(f"Analiz bulunamadı: {analysis_id}")
+        return row
+
+    def decisions(self, ticker=None, start=None, end=None, decision=None, limit=None):
+        """
+        Geçmiş kararlar (sadece dizin, Parquet okunmaz). En yeni en üstte.
+
+        Args:
+            ticker: Hisse kodu (None = hepsi)
+            start, end: Analiz zamanı aralığı [start, end) (tarih metni, Timestamp veya epoch)
+            decision: Karar metni ('SAT', 'GÜÇLÜ AL 🚀' ...)
+            limit: En fazla satır
+
+        Returns:
+            pd.DataFrame: created_at yerel saat (datetime), predictions liste olarak
+        """
+        clauses, params = [], []
+        for column, op, value in (('ticker', '=', str(ticker).upper().strip() if ticker else None),
+                                  ('created_at', '>=', _epoch(start)), ('created_at', '<', _epoch(end)),
+                                  ('decision', '=', decision)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        sql = f"SELECT {','.join(_COLUMNS)} FROM analyses"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+            self.stats['queries'] += 1
+        table = pd.DataFrame(rows, columns=_COLUMNS)
+        table['created_at'] = pd.to_datetime([datetime.datetime.fromtimestamp(t) for t in table['created_at']]).floor('s')
+        table['predictions'] = [json.loads(p) if p else [] for p in table['predictions']]
+        return table
+
+    def decision_counts(self, start=None, end=None):
+        """Hisse x karar sayıları (aralıktaki analizler)."""
+        table = self.decisions(start=start, end=end)
+        if table.empty:
+            return pd.DataFrame()
+        return table.groupby(['ticker', 'decision']).size().unstack(fill_value=0)
+
+    # --- Dışa aktarma ---
+    def export(self, analysis_id, fmt='csv'):
+        """
+        Analizin tablosunu (df) istenen formatta bayt olarak döndürür.
+        Parquet zaten depodaki dosyadır; CSV ilk istekte üretilip exports/ altına yazılır.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Bilinmeyen format: {fmt} ({' | '.join(EXPORT_FORMATS)})")
+        row = self._require(analysis_id)
+        path = self._part_path('bars', row) if fmt == 'parquet' else self._export_path(analysis_id, fmt)
+        hit = os.path.exists(path)
+        if not hit:
+            data = pd.read_parquet(self._part_path('bars', row)).to_csv().encode('utf-8')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+        with self._lock:
+            self.stats['exports'] += 1
+            self.stats['export_hits'] += hit
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['analyses'] = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        stats['root'] = self.root
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# --- VARSAYILAN DEPO ---
+_default_store = None
+_default_lock = threading.Lock()
+
+def get_analysis_store():
+    """Uygulama genelinde paylaşılan depo (ilk çağrıda açılır)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = AnalysisStore()
+        return _default_store
+
+def set_analysis_store(store):
+    global _default_store
+    with _default_lock:
+        _default_store = store
+
+
+if __name__ == "__main__":
+    # --- KOMUT SATIRI: Geçmiş kararlar ve dışa aktarma ---
+    import argparse
+    parser = argparse.ArgumentParser(description="Analiz deposu sorguları")
+    parser.add_argument("--root", default=STORE_DIR)
+    parser.add_argument("--ticker")
+    parser.add_argument("--since", help="Başlangıç (örn: 2026-01-01)")
+    parser.add_argument("--until", help="Bitiş (hariç)")
+    parser.add_argument("--decision")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--export", metavar="ID", help="Bu analizin tablosunu dışa aktar")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("-o", "--output", help="Dışa aktarım dosyası (verilmezse <id>.<format>)")
+    args = parser.parse_args()
+
+    store = AnalysisStore(args.root)
+    if args.export:
+        out = args.output or f"{args.export}.{args.format}"
+        with open(out, 'wb') as f:
+            f.write(store.export(args.export, args.format))
+        print(f"📂 Kayıt: {out}")
+    else:
+        t0 = time.perf_counter()
+        table = store.decisions(args.ticker, args.since, args.until, args.decision, args.limit)
+        print(f"🗂️ {len(table)} analiz ({(time.perf_counter() - t0) * 1000:.1f} ms) | Depo: {store.get_stats()['analyses']} kayıt")
+        if not table.empty:
+            cols = ['id', 'ticker', 'created_at', 'price', 'rsi', 'change_pct', 'sentiment', 'decision']
+            print(table[cols].round(dict.fromkeys(cols[3:-1], 3)).to_string(index=False))
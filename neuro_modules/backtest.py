@@ -0,0 +1,207 @@
+"""
+Vektörel Backtest Motoru - "Diamond Hands" (Elmas Eller) Stratejisi.
+
+03_Strateji_ve_Backtest.ipynb içindeki gün-gün Python döngüsünün (cash / shares)
+dizi işlemleriyle yazılmış hali:
+    sinyaller -> ileri doldurma (ffill) ile pozisyon -> kümülatif çarpım ile sermaye eğrisi
+
+Parametre ızgarası (threshold, sma_window, panic_margin) ve çok hisseli taramalar
+joblib ile çekirdeklere dağıtılır; her koşu için standart metrikler üretilir
+(CAGR, maksimum düşüş, Sharpe, devir hızı).
+"""
+import itertools
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- AYARLAR (Notebook'taki varsayılanlar) ---
+INITIAL_CAPITAL = 10000
+DEFAULT_PARAMS = {
+    'threshold': 0.50,     # Alım / satım eşiği ($)
+    'sma_window': 50,      # Trend filtresi (SMA)
+    'panic_margin': 15.0,  # Trend yukarıyken satış için gereken beklenen düşüş ($)
+}
+TRADING_DAYS = 252
+
+
+def calibrate_predictions(raw_predictions, real_prices, lookback=10):
+    """
+    Dinamik bias düzeltmesi (Notebook Blok 3): Her güne, modelin ÖNCEKİ 'lookback'
+    gündeki ortalama hatası eklenir. İlk 'lookback' gün için ilk pencerenin ortalaması kullanılır.
+    """
+    raw = np.asarray(raw_predictions, dtype=float)
+    error = np.asarray(real_prices, dtype=float) - raw
+    bias = np.empty_like(raw)
+    bias[:lookback] = error[:lookback].mean()
+    if len(raw) > lookback:
+        # bias[i] = mean(error[i-lookback:i])
+        bias[lookback:] = sliding_window_view(error[:-1], lookback).mean(axis=1)
+    return raw + bias
+
+
+def diamond_hands_positions(prices, predictions, threshold=DEFAULT_PARAMS['threshold'],
+                            sma_window=DEFAULT_PARAMS['sma_window'],
+                            panic_margin=DEFAULT_PARAMS['panic_margin'], trend=None):
+    """
+    Gün sonu pozisyonlarını (1 = hissede, 0 = nakitte) hesaplar.
+
+    Kurallar (i. gün, fiyat p_i, ertesi gün tahmini t_{i+1}):
+      - AL   : t_{i+1} > p_i + threshold
+      - SAT  : t_{i+1} < p_i - threshold, AMA fiyat SMA'nın üzerindeyken beklenen düşüş
+               panic_margin'den küçükse satılmaz (Boğa Kalkanı)
+      - Sinyal yoksa önceki pozisyon korunur (ileri doldurma)
+
+    Returns:
+        np.ndarray: len(prices) - 1 uzunluğunda pozisyon dizisi
+    """
+    prices = np.asarray(prices, dtype=float)
+    predictions = np.asarray(predictions, dtype=float)
+    if trend is None:
+        trend = sma_trend(prices, sma_window)
+
+    price, next_pred, trend = prices[:-1], predictions[1:], trend[:-1]
+    buy = next_pred > price + threshold
+    shield = (price > trend) & ((price - next_pred) < panic_margin)
+    sell = ~buy & (next_pred < price - threshold) & ~shield
+
+    signal = np.full(len(price), np.nan)
+    signal[sell] = 0.0
+    signal[buy] = 1.0
+    return pd.Series(signal).ffill().fillna(0.0).to_numpy()
+
+
+def sma_trend(prices, sma_window):
+    """Trend çizgisi (SMA). Notebook ile aynı: ilk günlerdeki boşluklar 0 sayılır."""
+    return pd.Series(np.asarray(prices, dtype=float)).rolling(window=sma_window).mean().fillna(0).to_numpy()
+
+
+def equity_curve(prices, position, initial_capital=INITIAL_CAPITAL):
+    """
+    Pozisyondan sermaye eğrisi: Bir önceki gün hissedeysek günlük getiri kazanılır.
+    equity[i] = sermaye * Π (1 + pozisyon[k-1] * getiri[k])
+    """
+    price = np.asarray(prices, dtype=float)[:len(position)]
+    growth = np.ones(len(position))
+    growth[1:] = np.where(position[:-1] > 0, price[1:] / price[:-1], 1.0)
+    return initial_capital * np.cumprod(growth)
+
+
+def compute_metrics(equity, position, periods_per_year=TRADING_DAYS):
+    """Standart performans metrikleri (risksiz faiz 0 kabul edilir)."""
+    equity = np.asarray(equity, dtype=float)
+    returns = equity[1:] / equity[:-1] - 1 if len(equity) > 1 else np.zeros(0)
+    years = len(returns) / periods_per_year
+    total_return = equity[-1] / equity[0] - 1
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    changes = np.abs(np.diff(np.concatenate([[0.0], position])))
+
+    return {
+        'final_value': float(equity[-1]),
+        'total_return': float(total_return),
+        'cagr': float((1 + total_return) ** (1 / years) - 1) if years > 0 and total_return > -1 else float('nan'),
+        'max_drawdown': float((equity / np.maximum.accumulate(equity) - 1).min()),
+        'sharpe': float(returns.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0,
+        'volatility': float(std * np.sqrt(periods_per_year)),
+        'exposure': float(position.mean()) if len(position) else 0.0,
+        'trades': int(changes.sum()),
+        # Yıllık devir: Yıl başına pozisyon değişimi (1 alım + 1 satım = 2)
+        'turnover': float(changes.sum() / years) if years > 0 else 0.0,
+    }
+
+
+def run_diamond_hands(prices, predictions, initial_capital=INITIAL_CAPITAL, **params):
+    """
+    Tek bir koşu: pozisyonlar, işlemler, sermaye eğrisi ve metrikler.
+
+    Args:
+        prices: Gerçek kapanış fiyatları (y_real)
+        predictions: Aynı günlere hizalı (kalibre edilmiş) fiyat tahminleri
+        params: threshold, sma_window, panic_margin (verilmeyen DEFAULT_PARAMS'tan)
+
+    Returns:
+        dict: equity, position, buy_signals, sell_signals, buy_hold, metrics
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    position = diamond_hands_positions(prices, predictions, **params)
+    equity = equity_curve(prices, position, initial_capital)
+    change = np.diff(np.concatenate([[0.0], position]))
+
+    price = np.asarray(prices, dtype=float)[:len(position)]
+    metrics = compute_metrics(equity, position)
+    metrics['buy_hold_return'] = float(price[-1] / price[0] - 1) if len(price) else 0.0
+    return {
+        'equity': equity,
+        'position': position,
+        'buy_signals': np.flatnonzero(change > 0),
+        'sell_signals': np.flatnonzero(change < 0),
+        'buy_hold': initial_capital * price / price[0],
+        'metrics': metrics,
+    }
+
+
+def _param_combos(grid):
+    grid = {**{k: [v] for k, v in DEFAULT_PARAMS.items()}, **(grid or {})}
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _sweep_ticker(ticker, prices, predictions, combos, initial_capital):
+    """Bir hissenin tüm parametre kombinasyonları (SMA her pencere için bir kez hesaplanır)."""
+    prices = np.asarray(prices, dtype=float)
+    predictions = np.asarray(predictions, dtype=float)
+    trends = {}
+    rows = []
+    for params in combos:
+        window = params['sma_window']
+        if window not in trends:
+            trends[window] = sma_trend(prices, window)
+        position = diamond_hands_positions(prices, predictions, trend=trends[window], **params)
+        equity = equity_curve(prices, position, initial_capital)
+        rows.append({'ticker': ticker, **params, **compute_metrics(equity, position)})
+    return rows
+
+
+def grid_sweep(data, grid=None, n_jobs=-1, initial_capital=INITIAL_CAPITAL):
+    """
+    Parametre ızgarası x hisse taraması (çekirdeklere dağıtılır).
+
+    Args:
+        data: {ticker: (prices, predictions)}
+        grid: {'threshold': [...], 'sma_window': [...], 'panic_margin': [...]}
+              Verilmeyen parametre varsayılan değerinde sabit kalır.
+        n_jobs: joblib işçi sayısı (-1 = tüm çekirdekler)
+
+    Returns:
+        pd.DataFrame: Koşu başına bir satır (parametreler + metrikler)
+    """
+    from joblib import Parallel, delayed
+
+    combos = _param_combos(grid)
+    # Görev birimi = hisse: veri işçiye bir kez gider, kombinasyonlar orada döner
+    tasks = (delayed(_sweep_ticker)(ticker, prices, predictions, combos, initial_capital)
+             for ticker, (prices, predictions) in data.items())
+    chunks = Parallel(n_jobs=n_jobs)(tasks)
+    return pd.DataFrame([row for rows in chunks for row in rows])
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU (Sentetik veri) ---
+    import time
+    rng = np.random.default_rng(42)
+    data = {}
+    for ticker in ['AAA', 'BBB', 'CCC', 'DDD']:
+        prices = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, 750))
+        # "Tahmin": Ertesi günün gerçek fiyatı + gürültü
+        predictions = np.concatenate([[prices[0]], prices[1:] + rng.normal(0, 2, 749)])
+        data[ticker] = (prices, predictions)
+
+    result = run_diamond_hands(*data['AAA'])
+    m = result['metrics']
+    print(f"💎 AAA -> Getiri: %{m['total_return'] * 100:.2f} | CAGR: %{m['cagr'] * 100:.2f} | "
+          f"MaxDD: %{m['max_drawdown'] * 100:.2f} | Sharpe: {m['sharpe']:.2f} | İşlem: {m['trades']}")
+
+    grid = {'threshold': [0.25, 0.5, 1.0, 2.0], 'sma_window': [20, 50, 100], 'panic_margin': [5.0, 15.0, 30.0]}
+    t0 = time.perf_counter()
+    table = grid_sweep(data, grid)
+    print(f"🔁 {len(table)} koşu {time.perf_counter() - t0:.2f} sn")
+    print(table.sort_values('sharpe', ascending=False).head(5).to_string(index=False))
@@ -0,0 +1,206 @@
+"""
+Kompakt Random Forest Formatı (Bellek Eşlemeli).
+
+universal_rf.pkl (200 ağaç, max_depth=20) joblib ile tek parça yazılır; her süreç
+tamamını belleğe açar. Bu modül ormanı düz düğüm dizilerine çevirir:
+
+    <klasör>/
+        meta.json       -> ağaç / özellik / çıktı sayısı, maksimum derinlik
+        nodes.npy       -> düğüm kaydı (16 bayt): feature int32 (yaprakta -1),
+                           threshold float32, left / right int32 (küresel düğüm indeksi)
+        value.npy       -> float32 (n_düğüm, n_çıktı)
+        roots.npy       -> int32   (her ağacın kök düğümü)
+
+Düğüm alanları tek kayıtta durur: Ağaçta bir seviye inmek tek bir bellek erişimidir.
+
+Diziler np.load(mmap_mode='r') ile açılır: Yükleme anlıktır ve aynı dosyayı açan
+işçi süreçler sayfaları işletim sistemi önbelleğinden PAYLAŞIR.
+
+Eşik hassasiyeti: sklearn girdiyi float32'ye çevirip 'x <= eşik (float64)' karşılaştırır.
+Eşik, float32'ye AŞAĞI yuvarlanarak saklanır (en büyük float32 <= eşik); float32 x için
+'x <= eşik32' ile 'x <= eşik64' aynı sonucu verir, yani dallanma birebir aynıdır.
+Yaprak değerleri float32 saklandığı için tahminler sklearn'den ~1e-7 göreli farklıdır.
+"""
+import os
+import json
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ('nodes', 'value', 'roots')
+NODE_DTYPE = np.dtype([('feature', '<i4'), ('threshold', '<f4'), ('left', '<i4'), ('right', '<i4')])
+
+
+def _round_down_float32(threshold):
+    """float64 eşikleri, değeri aşmayan en büyük float32'ye çevirir."""
+    t32 = threshold.astype(np.float32)
+    over = t32.astype(np.float64) > threshold
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def export_forest(model, out_dir):
+    """
+    Eğitilmiş RandomForestRegressor'ı (veya tek bir DecisionTreeRegressor'ı)
+    kompakt klasör formatına yazar.
+    """
+    estimators = getattr(model, 'estimators_', [model])
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset, max_depth = 0, 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        features.append(np.where(is_leaf, -1, tree.feature).astype(np.int32))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        # Yapraklar kendilerini gösterir: Traversal'da fazladan kontrol gerekmez
+        own = np.arange(tree.node_count) + offset
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+        values.append(tree.value.reshape(tree.node_count, -1))
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    if offset >= np.iinfo(np.int32).max:
+        raise ValueError("Orman int32 indeks sınırını aşıyor.")
+
+    nodes = np.empty(offset, dtype=NODE_DTYPE)
+    nodes['feature'] = np.concatenate(features)
+    nodes['threshold'] = _round_down_float32(np.concatenate(thresholds))
+    nodes['left'] = np.concatenate(lefts)
+    nodes['right'] = np.concatenate(rights)
+    arrays = {
+        'nodes': nodes,
+        'value': np.concatenate(values).astype(np.float32),
+        'roots': np.asarray(roots, dtype=np.int32),
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f'{name}.npy'), np.ascontiguousarray(array))
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'n_trees': len(estimators),
+        'n_features': int(estimators[0].n_features_in_),
+        'n_outputs': int(arrays['value'].shape[1]),
+        'n_nodes': int(offset),
+        'max_depth': int(max_depth),
+    }
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class CompactForest:
+    """Kompakt formatı okuyan, sklearn 'predict' arayüzlü vektörel tahminci."""
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        self.nodes, self.value, self.roots = arrays['nodes'], arrays['value'], arrays['roots']
+        self.n_features_in_ = meta['n_features']
+
+    @property
+    def feature(self):
+        return self.nodes['feature']
+
+    @property
+    def threshold(self):
+        return self.nodes['threshold']
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """mmap=True: Diziler diskten eşlenir (kopya yok, sayfalar süreçler arası paylaşılır)."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen format sürümü: {meta.get('format_version')}")
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode) for name in ARRAYS}
+        return cls(arrays, meta)
+
+    def apply(self, X):
+        """Her (örnek, ağaç) için ulaşılan yaprağın küresel indeksi: (n, n_trees)."""
+        X = np.asarray(X, dtype=np.float32)  # sklearn ile aynı: float32 karşılaştırma
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        # Seviye seviye: Tüm örnekler x ağaçlar aynı anda bir adım iner
+        for _ in range(self.meta['max_depth']):
+            record = self.nodes[node]
+            go_left = X[rows, np.maximum(record['feature'], 0)] <= record['threshold']
+            node = np.where(go_left, record['left'], record['right'])
+        return node
+
+    def predict(self, X, chunk_size=2048):
+        """
+        Ağaç ortalaması (sklearn RandomForestRegressor.predict ile aynı).
+        Büyük girdiler chunk_size'lık parçalarla işlenir (ara matris sınırlı kalsın).
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty((len(X), self.meta['n_outputs']), dtype=np.float64)
+        for i in range(0, len(X), chunk_size):
+            leaves = self.apply(X[i:i + chunk_size])
+            out[i:i + chunk_size] = self.value[leaves].sum(axis=1, dtype=np.float64) / self.meta['n_trees']
+        return out[:, 0] if self.meta['n_outputs'] == 1 else out
+
+
+def is_stale(compact_path, pkl_path):
+    """
+    Kompakt kopya, .pkl'den ESKİ mi? (Yeniden eğitip dışa aktarmayı unutma durumu)
+    export_forest her zaman .pkl kaydından sonra çalışır; meta.json daha eskiyse kopya bayattır.
+    """
+    meta_path = os.path.join(compact_path, 'meta.json')
+    if not (os.path.exists(meta_path) and os.path.exists(pkl_path)):
+        return False
+    return os.path.getmtime(pkl_path) > os.path.getmtime(meta_path)
+
+
+def preferred_model_path(compact_path, pkl_path, on_warning=print):
+    """
+    Kompakt kopya varsa ve güncelse onu, yoksa / bayatsa .pkl'i döndürür.
+    Bayat kopya için uyarı verilir (yeniden dışa aktarma komutuyla).
+    """
+    if not os.path.isdir(compact_path):
+        return pkl_path
+    if is_stale(compact_path, pkl_path):
+        on_warning(f"⚠️ {compact_path} {pkl_path}'den eski; .pkl kullanılıyor. Yenilemek için: "
+                   f"python -m neuro_modules.compact_forest {pkl_path} {compact_path}")
+        return pkl_path
+    return compact_path
+
+
+def load_forest(path):
+    """
+    Modeli formatına göre yükler: Klasörse kompakt (mmap), değilse joblib (.pkl).
+    """
+    if os.path.isdir(path):
+        return CompactForest.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU: .pkl -> kompakt dönüştürme ve parite ---
+    import sys
+    import time
+    import joblib
+    if len(sys.argv) < 3:
+        sys.exit("Kullanım: python -m neuro_modules.compact_forest models/universal_rf.pkl models/universal_rf_compact")
+    src, dst = sys.argv[1], sys.argv[2]
+    model = joblib.load(src)
+    meta = export_forest(model, dst)
+    size = sum(os.path.getsize(os.path.join(dst, f)) for f in os.listdir(dst))
+    print(f"✅ {meta['n_trees']} ağaç, {meta['n_nodes']} düğüm -> {dst} ({size / 1e6:.1f} MB, "
+          f".pkl: {os.path.getsize(src) / 1e6:.1f} MB)")
+
+    forest = CompactForest.load(dst)
+    X = np.random.default_rng(0).normal(0, 0.02, (1000, meta['n_features']))
+    t0 = time.perf_counter()
+    ours = forest.predict(X)
+    t1 = time.perf_counter()
+    ref = model.predict(X)
+    t2 = time.perf_counter()
+    print(f"🎯 En büyük fark: {np.abs(ours - ref).max():.2e} | "
+          f"Aynı yapraklar: {np.array_equal(forest.apply(X) - forest.roots, np.stack([e.apply(X.astype(np.float32)) for e in model.estimators_], 1))} | "
+          f"Süre: {1000 * (t1 - t0):.0f} ms (sklearn {1000 * (t2 - t1):.0f} ms)")
@@ -0,0 +1,351 @@
+import os
+import re
+import json
+import time
+import threading
+import pandas as pd
+
+# --- AYARLAR ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("NEUROQUANT_CACHE_DIR", os.path.join(BASE_DIR, 'data_cache'))
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Aynı hisse için bu süreden kısa aralıklarla ağa çıkmayız (saniye).
+DEFAULT_MAX_AGE = 300
+# Kuyruk çekiminde yeniden gelen (tamamlanmış) bar, önbellektekinden bu göreli farktan fazla
+# saparsa geçmiş düzeltilmiş demektir (bölünme / temettü); kapsanan aralık baştan indirilir.
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def _normalize(df):
+    """Sağlayıcı çıktısını sıralı, tekil indeksli OHLCV tablosuna indirger."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    df = df[[c for c in OHLCV_COLUMNS if c in df.columns]].copy()
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    df.index.name = 'Date'
+    return df
+
+
+def period_start(period, now=None):
+    """
+    yfinance 'period' değerini (örn: '1y', '6mo', 'ytd') başlangıç zamanına çevirir.
+    'max' veya None için None döner (tüm geçmiş).
+    """
+    now = pd.Timestamp(now if now is not None else pd.Timestamp.now())
+    if period in (None, 'max'):
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1)
+
+    match = re.fullmatch(r'(\d+)(mo|wk|d|y|h|m)', period)
+    if not match:
+        raise ValueError(f"Geçersiz period: {period}")
+    n, unit = int(match.group(1)), match.group(2)
+    offsets = {
+        'y': pd.DateOffset(years=n), 'mo': pd.DateOffset(months=n), 'wk': pd.DateOffset(weeks=n),
+        'd': pd.DateOffset(days=n), 'h': pd.DateOffset(hours=n), 'm': pd.DateOffset(minutes=n),
+    }
+    return (now - offsets[unit]).normalize() if unit in ('y', 'mo', 'wk', 'd') else now - offsets[unit]
+
+
+def _naive(ts):
+    """Karşılaştırma ve meta kaydı için zaman damgasını saat dilimsiz hale getirir."""
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert(None) if ts.tzinfo is not None else ts
+
+
+def _align(ts, index):
+    """Zaman damgasını indeksin saat dilimine uydurur (tz-aware / naive karışmasın)."""
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, 'tz', None)
+    if tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(tz)
+    if tz is None and ts.tzinfo is not None:
+        return ts.tz_convert(None)
+    return ts
+
+
+def _parse_index(index):
+    """CSV'den okunan tarih sütununu DatetimeIndex'e çevirir.
+    Yaz/kış saati yüzünden farklı UTC ofsetleri içeren dosyalar UTC'ye indirgenir."""
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(index))
+    except (ValueError, TypeError):
+        return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+
+
+# --- VERİ SAĞLAYICILARI (PROVIDER) ---
+# Her sağlayıcı aynı arayüzü uygular:
+#     fetch(ticker, interval="1d", start=None, end=None) -> OHLCV DataFrame
+# 'start' dahil, 'end' hariçtir (yfinance ile aynı). İkisi de None ise tüm geçmiş.
+
+class YFinanceProvider:
+    """Varsayılan kaynak: yfinance."""
+    name = "yfinance"
+
+    def fetch(self, ticker, interval="1d", start=None, end=None):
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        if start is None and end is None:
+            df = stock.history(period="max", interval=interval)
+        else:
+            df = stock.history(start=start, end=end, interval=interval)
+        return _normalize(df)
+
+
+class LocalFileProvider:
+    """
+    Diskteki dosyalardan OHLCV okur; testlerde yfinance yerine geçer.
+    Aranan dosyalar: '<root>/<TICKER>_<interval>.csv', '<root>/<TICKER>.csv' (veya .parquet).
+    """
+    name = "local"
+
+    def __init__(self, root):
+        self.root = root
+        self.calls = 0
+
+    def _path(self, ticker, interval):
+        for stem in (f"{ticker}_{interval}", ticker):
+            for ext in ('.parquet', '.csv'):
+                path = os.path.join(self.root, stem + ext)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def fetch(self, ticker, interval="1d", start=None, end=None):
+        self.calls += 1
+        path = self._path(ticker, interval)
+        if path is None:
+            return _normalize(None)
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, index_col=0)
+            df.index = _parse_index(df.index)
+        df = _normalize(df)
+        if start is not None:
+            df = df[df.index >= _align(start, df.index)]
+        if end is not None:
+            df = df[df.index < _align(end, df.index)]
+        return df
+
+
+# --- DİSK ÖNBELLEĞİ ---
+class OHLCVCache:
+    """
+    Hisse + aralık (interval) bazında sütunsal (Parquet) OHLCV önbelleği.
+
+    Her kayıt için kapsanan zaman aralığı [covered_from, covered_until) bir yan
+    dosyada (.json) tutulur. İstek bu aralığın dışına taşarsa SADECE eksik parça
+    (baş veya kuyruk) sağlayıcıdan çekilip mevcut veriye eklenir.
+
+    yfinance geçmişi bölünme / temettüye göre düzeltilmiş verir: Kurumsal bir işlemden sonra
+    eski barlar ile yeni barlar farklı ölçekte olur (sahte -%50 getiri). Bu yüzden kuyruk
+    çekimi son TAMAMLANMIŞ önbellek barıyla çakışacak şekilde başlar; o bar değişmişse
+    kayıt tamamen yeniden indirilir.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, provider=None, max_age=DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.provider = provider or YFinanceProvider()
+        self.max_age = max_age
+        # hits: ağa hiç çıkılmadı | partial_hits: önbellek + baş/kuyruk çekimi | misses: tam çekim
+        self.stats = {'hits': 0, 'partial_hits': 0, 'misses': 0, 'incremental_fetches': 0,
+                      'refetches': 0, 'bytes_read': 0, 'bytes_written': 0}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    # --- Dosya yardımcıları ---
+    def _paths(self, ticker, interval):
+        safe = re.sub(r'[^A-Za-z0-9._=-]', '_', ticker.upper())
+        folder = os.path.join(self.cache_dir, interval)
+        return os.path.join(folder, f"{safe}.parquet"), os.path.join(folder, f"{safe}.json")
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _read(self, ticker, interval):
+        data_path, meta_path = self._paths(ticker, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        df = pd.read_parquet(data_path)
+        self._count('bytes_read', os.path.getsize(data_path))
+        return df, meta
+
+    def _write(self, ticker, interval, df, meta):
+        data_path, meta_path = self._paths(ticker, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        # Önce geçici dosyaya yaz, sonra taşı (yarım kalan yazım önbelleği bozmasın).
+        # Geçici ad süreç + iş parçacığına özgü: Eşzamanlı yazıcılar birbirinin dosyasını ezmez.
+        _atomic_write(data_path, df.to_parquet)
+        _atomic_write(meta_path, lambda tmp: _dump_json(meta, tmp))
+        self._count('bytes_written', os.path.getsize(data_path))
+
+    # --- Ana API ---
+    def get(self, ticker, interval="1d", start=None, end=None, max_age=None):
+        """
+        [start, end) aralığındaki barları döndürür; eksik kısımları tamamlar.
+        end=None 'şu ana kadar' demektir ve max_age saniyede bir tazelenir.
+        max_age verilirse bu çağrı için self.max_age yerine geçer (0: kuyruğu mutlaka çek).
+        """
+        with self._key_lock((ticker.upper(), interval)):
+            return self._get(ticker, interval, start, end,
+                             self.max_age if max_age is None else max_age)
+
+    def _get(self, ticker, interval, start, end, max_age):
+        now = time.time()
+        cached, meta = self._read(ticker, interval)
+
+        if cached is None:
+            # MISS: Tüm aralığı bir kez çek
+            self._count('misses')
+            df = self.provider.fetch(ticker, interval=interval, start=start, end=end)
+            meta = {
+                'covered_from': None if start is None else str(_naive(start)),
+                'covered_until': None if end is None else str(_naive(end)),
+                'fetched_at': now,
+            }
+            if not df.empty:
+                self._write(ticker, interval, df, meta)
+            return _slice(df, start, end)
+
+        df, changed = cached, False
+
+        # 1. Baş eksik mi? (İstenen başlangıç, önbellekteki kapsamdan eski)
+        covered_from = _naive(meta.get('covered_from'))
+        if covered_from is not None and (start is None or _naive(start) < covered_from):
+            head = self.provider.fetch(ticker, interval=interval, start=start, end=covered_from)
+            df = _merge(head, df)
+            meta['covered_from'] = None if start is None else str(_naive(start))
+            changed = True
+            self._count('incremental_fetches')
+
+        # 2. Kuyruk eksik mi? Son bardan itibaren çek (son bar kısmi olabilir, üzerine yazılır)
+        covered_until = _naive(meta.get('covered_until'))
+        stale = now - meta.get('fetched_at', 0) >= max_age
+        if end is None:
+            need_tail = covered_until is not None or stale
+        elif covered_until is None:
+            # Kapsam 'son çekim anına kadar' açık; istenen bitiş ondan sonraysa tazele
+            need_tail = stale and _naive(end) > pd.Timestamp(meta.get('fetched_at', 0), unit='s')
+        else:
+            need_tail = _naive(end) > covered_until
+        if need_tail:
+            # Son bar kısmi olabilir; sondan bir önceki (tamamlanmış) bar düzeltme kontrolü içindir
+            anchor = df.index[-2] if len(df) > 1 else None
+            tail_start = anchor if anchor is not None else (df.index[-1] if len(df) else start)
+            tail = self.provider.fetch(ticker, interval=interval, start=tail_start, end=end)
+            if _adjusted(df, tail, anchor):
+                # Geçmiş yeniden ölçeklendi: Eski barlar yeni barlarla karıştırılamaz
+                self._count('refetches')
+                full_start = _naive(meta.get('covered_from'))
+                refreshed = self.provider.fetch(ticker, interval=interval, start=full_start,
+                                                end=end if covered_until is not None else None)
+                df = refreshed if not refreshed.empty else _merge(df, tail)
+            else:
+                df = _merge(df, tail)
+            if end is None:
+                meta['covered_until'] = None
+            elif covered_until is not None:
+                meta['covered_until'] = str(max(_naive(end), covered_until))
+            meta['fetched_at'] = now
+            changed = True
+            self._count('incremental_fetches')
+
+        self._count('partial_hits' if changed else 'hits')
+        if changed:
+            self._write(ticker, interval, df, meta)
+        return _slice(df, start, end)
+
+    def get_stats(self):
+        """Önbellek istatistiklerinin bir kopyası (hit/miss, okunan/yazılan bayt)."""
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats['hits'] + stats['partial_hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / total if total else 0.0
+        return stats
+
+
+def _atomic_write(path, write):
+    """write(tmp_path) ile geçici dosyaya yazar, sonra os.replace ile yerine taşır."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _dump_json(obj, path):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
+
+
+def _adjusted(cached, fresh, anchor):
+    """Çakışan bar ('anchor') yeniden çekimde önbellektekinden farklı mı (düzeltilmiş geçmiş)?"""
+    if anchor is None or fresh is None or fresh.empty or anchor not in fresh.index:
+        return False
+    old = cached.loc[anchor, ['Open', 'High', 'Low', 'Close']].astype(float)
+    new = fresh.loc[anchor, ['Open', 'High', 'Low', 'Close']].astype(float)
+    return bool(((new - old).abs() > ADJUSTMENT_TOLERANCE * old.abs()).any())
+
+
+def _merge(old, new):
+    """İki bar tablosunu birleştirir; çakışan zaman damgalarında yeni veri kazanır."""
+    if new is None or new.empty:
+        return old
+    if old is None or old.empty:
+        return new
+    merged = pd.concat([old, new])
+    return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+
+def _slice(df, start, end):
+    if df.empty:
+        return df
+    if start is not None:
+        df = df[df.index >= _align(start, df.index)]
+    if end is not None:
+        df = df[df.index < _align(end, df.index)]
+    return df.copy()
+
+
+def local_file_cache(data_dir):
+    """
+    LocalFileProvider için AYRI bir önbellek ('<data_dir>/.cache').
+    Kayıtlar sadece hisse + aralık ile anahtarlandığından, yerel / test barları
+    paylaşılan CACHE_DIR'e yazılırsa uygulama onları gerçek piyasa verisi diye sunar.
+    """
+    return OHLCVCache(cache_dir=os.path.join(data_dir, '.cache'), provider=LocalFileProvider(data_dir))
+
+
+# --- VARSAYILAN ÖNBELLEK ---
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_cache():
+    """Uygulama genelinde paylaşılan önbellek (ilk çağrıda oluşturulur)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = OHLCVCache()
+        return _default_cache
+
+def set_default_cache(cache):
+    """Varsayılan önbelleği değiştirir (örn: LocalFileProvider ile test kurulumu)."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
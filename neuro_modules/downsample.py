@@ -0,0 +1,88 @@
+"""
+Grafik Seyreltme: LTTB (Largest-Triangle-Three-Buckets).
+
+5 yıllık ya da gün içi (intraday) seriler binlerce nokta içerir; tarayıcıya hepsini
+göndermek hem JSON yükünü hem çizim süresini büyütür. LTTB, seriyi 'n_out' noktaya
+indirirken ŞEKLİ korur: Her kovadan, bir önceki seçilen nokta ile sonraki kovanın
+ortalamasıyla EN BÜYÜK üçgeni oluşturan nokta seçilir. Tepeler / dipler (ani
+sıçramalar) düz ortalamadaki gibi kaybolmaz.
+
+İlk ve son nokta her zaman korunur. NaN değerler (göstergelerin ısınma dönemi)
+seçime katılmaz; döndürülen indeksler orijinal diziye aittir.
+"""
+import numpy as np
+
+
+def _as_float(x):
+    """Tarih ekseni dahil her x'i float'a çevirir (datetime64 -> ns)."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Seçilen noktaların (artan sıralı) indekslerini döndürür.
+
+    Args:
+        x: Artan sıralı eksen (sayı veya datetime64)
+        y: Değerler (NaN olabilir)
+        n_out: Hedef nokta sayısı (>= 3)
+
+    Returns:
+        np.ndarray: int64 indeksler; seri zaten küçükse tüm geçerli noktalar
+    """
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(y))
+    if n_out >= len(valid):
+        return valid
+    if n_out < 3:
+        return valid[[0, -1][:max(n_out, 0)]]
+
+    xs, ys = _as_float(x)[valid], y[valid]
+    # Ölçek farkı (ns vs $) üçgen alanlarını taşmaya / hassasiyet kaybına itmesin
+    xs = (xs - xs[0]) / max(xs[-1] - xs[0], 1.0)
+    n = len(xs)
+    # İlk ve son nokta sabit; aradaki n-2 nokta n_out-2 kovaya bölünür
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Her kovanın "sonraki kova ortalaması" önceden hesaplanır (kümülatif toplamla)
+    csx, csy = np.concatenate([[0.0], np.cumsum(xs)]), np.concatenate([[0.0], np.cumsum(ys)])
+    next_lo = np.append(edges[1:-1], n - 1)
+    next_hi = np.append(edges[2:], n)
+    count = next_hi - next_lo
+    avg_x = (csx[next_hi] - csx[next_lo]) / count
+    avg_y = (csy[next_hi] - csy[next_lo]) / count
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = xs[a], ys[a]
+        # Üçgen alanının 2 katı: |(ax-cx)(by-ay) - (ax-bx)(cy-ay)|, b = kovadaki adaylar
+        area = np.abs((ax - avg_x[b]) * (ys[lo:hi] - ay) - (ax - xs[lo:hi]) * (avg_y[b] - ay))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return valid[out]
+
+
+def downsample(x, y, n_out):
+    """(x, y) çiftini LTTB ile seyreltir. Pandas / numpy girdileri kabul eder."""
+    idx = lttb_indices(x, y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU: 5 yıllık dakikalık benzeri seri ---
+    import time
+    rng = np.random.default_rng(0)
+    n = 500_000
+    x = np.datetime64('2021-01-01T00:00') + np.arange(n).astype('timedelta64[m]')
+    y = 100 * np.cumprod(1 + rng.normal(0, 0.001, n))
+    y[123_456] *= 1.3  # Tek noktalık sıçrama: LTTB bunu korumalı
+    t0 = time.perf_counter()
+    idx = lttb_indices(x, y, 2000)
+    print(f"✂️ {n} -> {len(idx)} nokta, {1000 * (time.perf_counter() - t0):.1f} ms | "
+          f"Sıçrama korundu: {123_456 in idx} | Min/Maks korundu: "
+          f"{y[idx].min() == y.min()} / {y[idx].max() == y.max()}")
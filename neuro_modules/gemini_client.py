@@ -0,0 +1,263 @@
+"""
+Gemini İstemcisi: Tek Bağlantı + Yanıt Önbelleği + Akış (Streaming) + Hız Sınırı.
+
+- İstemci süreç başına BİR KEZ kurulur (genai.configure / GenerativeModel her tıklamada değil).
+- Aynı (normalize edilmiş) girdiler TTL süresince tekrar API'ye gitmez.
+- Yanıt parça parça (token akışı) gelir; arayüz ilk kelimeyi beklemeden gösterir.
+- Eşzamanlı istek ve dakika başı istek sınırı, Streamlit oturumları arasında PAYLAŞILIR
+  (aynı süreçteki tüm oturumlar bu modülün tek örneğini kullanır).
+
+Arka uç seçimi (ortam değişkeni):
+    NEUROQUANT_GEMINI_BACKEND = 'google' (varsayılan) | 'stub' (çevrimdışı, gecikme testi için)
+"""
+import os
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+try:
+    from neuro_modules import telemetry
+except ImportError:  # 'python neuro_modules/gemini_client.py' ile doğrudan çalıştırma
+    import telemetry
+
+# --- AYARLAR ---
+GEMINI_MODEL = "gemini-3-flash-preview"
+GEMINI_BACKEND = os.environ.get("NEUROQUANT_GEMINI_BACKEND", "google").lower()
+CACHE_TTL = float(os.environ.get("NEUROQUANT_GEMINI_TTL", 900))   # saniye
+CACHE_MAX_ITEMS = 256
+MAX_CONCURRENT = 2         # Aynı anda en fazla bu kadar Gemini isteği
+MAX_PER_MINUTE = 15        # Dakika başı istek sınırı (ücretsiz kota ile uyumlu)
+
+
+class GoogleBackend:
+    """google.generativeai üzerinden akışlı üretim (model bir kez kurulur)."""
+    name = "google"
+
+    def __init__(self, api_key, model_name=GEMINI_MODEL):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def stream(self, prompt):
+        for chunk in self.model.generate_content(prompt, stream=True):
+            text = getattr(chunk, 'text', '')
+            if text:
+                yield text
+
+
+class StubBackend:
+    """
+    Çevrimdışı sahte arka uç: Sabit bir metni, verilen gecikmelerle kelime kelime üretir.
+    Ağ ve API anahtarı olmadan ilk-token / toplam gecikme ölçümü için kullanılır.
+    """
+    name = "stub"
+
+    def __init__(self, first_token_delay=0.4, token_delay=0.02, text=None):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.text = text or ("Teknik göstergeler ile haber akışı birlikte değerlendirildiğinde "
+                             "kısa vadeli görünüm dengeli; riskler ve fırsatlar yakından izlenmeli.")
+        self.calls = 0
+
+    def stream(self, prompt):
+        self.calls += 1
+        time.sleep(self.first_token_delay)
+        for i, word in enumerate(self.text.split(' ')):
+            if i: time.sleep(self.token_delay)
+            yield word if i == 0 else ' ' + word
+
+
+class RateLimiter:
+    """Eşzamanlılık (semafor) + kayan pencereli dakika başı sınır. İş parçacığı güvenli."""
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT, max_per_minute=MAX_PER_MINUTE, window=60.0):
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._starts = deque()
+        self.max_per_minute = max_per_minute
+        self.window = window
+        self.waited = 0.0
+
+    @contextmanager
+    def acquire(self):
+        t0 = time.perf_counter()
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    while self._starts and now - self._starts[0] >= self.window:
+                        self._starts.popleft()
+                    if len(self._starts) < self.max_per_minute:
+                        self._starts.append(now)
+                        self.waited += time.perf_counter() - t0
+                        break
+                    sleep_for = self.window - (now - self._starts[0])
+                time.sleep(min(max(sleep_for, 0.01), 1.0))
+            yield
+        finally:
+            self._slots.release()
+
+
+class ResponseCache:
+    """Normalize girdi özeti -> yanıt metni. TTL ve boyut sınırlı (LRU)."""
+
+    def __init__(self, ttl=CACHE_TTL, max_items=CACHE_MAX_ITEMS):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored_at, text = item
+            if time.time() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._items[key] = (time.time(), text)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def cache_key(inputs):
+    """Girdilerin kararlı özeti (sözlük anahtar sırası ve boşluk farkları önemsiz)."""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GeminiClient:
+    """Tek arka uç + önbellek + hız sınırı. 'stream' parçaları, 'ask' tam metni döndürür."""
+
+    def __init__(self, backend, cache=None, limiter=None):
+        self.backend = backend
+        self.cache = cache or ResponseCache()
+        self.limiter = limiter or RateLimiter()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'api_calls': 0, 'errors': 0}
+        self.first_token_latencies = deque(maxlen=200)
+        self.total_latencies = deque(maxlen=200)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def stream(self, prompt, inputs=None):
+        """
+        Yanıtı parça parça üretir. 'inputs' (normalize edilmiş girdiler) verilirse
+        önbellek anahtarı odur; verilmezse prompt metninin kendisi kullanılır.
+        Hata durumunda istisna yukarı iletilir; yarım yanıt önbelleğe yazılmaz.
+        """
+        self._count('requests')
+        key = cache_key(inputs if inputs is not None else {'prompt': prompt})
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count('cache_hits')
+            yield cached
+            return
+
+        parts = []
+        t0 = time.perf_counter()
+        with self.limiter.acquire():
+            self._count('api_calls')
+            try:
+                for chunk in self.backend.stream(prompt):
+                    if not parts:
+                        self.first_token_latencies.append(time.perf_counter() - t0)
+                        telemetry.observe("gemini.first_token", time.perf_counter() - t0)
+                    parts.append(chunk)
+                    yield chunk
+            except Exception:
+                self._count('errors')
+                telemetry.observe("gemini", time.perf_counter() - t0, error=True)
+                raise
+        self.total_latencies.append(time.perf_counter() - t0)
+        telemetry.observe("gemini", time.perf_counter() - t0)
+        self.cache.put(key, "".join(parts))
+
+    def ask(self, prompt, inputs=None):
+        return "".join(self.stream(prompt, inputs))
+
+    def get_stats(self):
+        """İstek / önbellek isabeti sayıları ve gecikmeler (ms)."""
+        with self._lock:
+            stats = dict(self.stats)
+        first, total = list(self.first_token_latencies), list(self.total_latencies)
+        stats['hit_rate'] = stats['cache_hits'] / stats['requests'] if stats['requests'] else 0.0
+        stats['avg_first_token_ms'] = 1000 * sum(first) / len(first) if first else 0.0
+        stats['avg_total_ms'] = 1000 * sum(total) / len(total) if total else 0.0
+        stats['rate_limit_wait_s'] = self.limiter.waited
+        stats['backend'] = self.backend.name
+        return stats
+
+
+# --- VARSAYILAN İSTEMCİ (süreç başına bir tane) ---
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_gemini_client(api_key=None, backend=None):
+    """
+    Paylaşılan istemci. İlk çağrıda kurulur; sonraki çağrılar aynı örneği döndürür.
+    'google' arka ucu için api_key ilk çağrıda gereklidir.
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            backend = (backend or GEMINI_BACKEND).lower()
+            if backend == "stub":
+                _default_client = GeminiClient(StubBackend())
+            elif backend == "google":
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY bulunamadı.")
+                _default_client = GeminiClient(GoogleBackend(api_key))
+            else:
+                raise ValueError(f"Bilinmeyen Gemini arka ucu: {backend} (google | stub)")
+        return _default_client
+
+
+def set_gemini_client(client):
+    """Varsayılan istemciyi değiştirir (örn: testlerde StubBackend ile)."""
+    global _default_client
+    with _default_lock:
+        _default_client = client
+
+
+def _response_cache_counts():
+    """Telemetri için: Varsayılan istemci henüz kurulmadıysa None."""
+    client = _default_client
+    if client is None:
+        return None
+    stats = client.get_stats()
+    return {'hits': stats['cache_hits'], 'misses': stats['requests'] - stats['cache_hits']}
+
+
+telemetry.register_cache("gemini", _response_cache_counts)
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU: Stub arka uçla gecikme ve önbellek ---
+    client = GeminiClient(StubBackend(first_token_delay=0.5, token_delay=0.03))
+    inputs = {'ticker': 'NVDA', 'rsi': 55.0}
+    for attempt in (1, 2):
+        t0 = time.perf_counter()
+        first = None
+        for chunk in client.stream("test", inputs):
+            if first is None: first = time.perf_counter() - t0
+        print(f"#{attempt} İlk parça: {first * 1000:.0f} ms | Toplam: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    print(client.get_stats())
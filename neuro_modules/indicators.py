@@ -0,0 +1,325 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+# --- İNDİKATÖR AYARLARI ---
+RSI_WINDOW = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_WINDOW = 20
+BB_STD = 2
+
+INDICATOR_COLUMNS = ['RSI', 'MACD', 'MACD_Signal', 'SMA_20', 'BB_Upper', 'BB_Lower']
+
+# IndicatorEngine ile compute_indicators arasındaki izin verilen en büyük fark.
+# RSI mutlak (0-100 ölçeği); diğerleri fiyat ölçeğine göre (|fark| / |kapanış|).
+# MACD aynı EMA özyinelemesini izlediğinden pratikte birebirdir; Bollinger'daki
+# kalıntı, pandas'ın çevrimiçi varyans hesabındaki kayan nokta hatasıdır.
+PARITY_TOLERANCE = {'RSI': 1e-9, 'MACD': 1e-12, 'MACD_Signal': 1e-12,
+                    'SMA_20': 1e-12, 'BB_Upper': 1e-9, 'BB_Lower': 1e-9}
+
+
+def compute_indicators(df):
+    """
+    Tüm geçmiş için teknik indikatörleri TEK geçişte (vektörel) hesaplar.
+    SMA_20 ve 20 günlük standart sapma sadece bir kez hesaplanır.
+
+    Args:
+        df (pd.DataFrame): En az 'Close' sütunu olan OHLCV tablosu
+    Returns:
+        pd.DataFrame: Aynı tablo + RSI, MACD, MACD_Signal, SMA_20, BB_Upper, BB_Lower
+    """
+    df = df.copy()
+    close = df['Close']
+
+    # --- RSI (14) ---
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=RSI_WINDOW).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=RSI_WINDOW).mean()
+    rs = gain / loss
+    df['RSI'] = 100 - (100 / (1 + rs))
+
+    # --- MACD (12, 26, 9) ---
+    # EMA (Exponential Moving Average) hesaplamaları
+    ema12 = close.ewm(span=MACD_FAST, adjust=False).mean()
+    ema26 = close.ewm(span=MACD_SLOW, adjust=False).mean()
+    df['MACD'] = ema12 - ema26
+    df['MACD_Signal'] = df['MACD'].ewm(span=MACD_SIGNAL, adjust=False).mean()
+
+    # --- SMA (20) + BOLLINGER BANTLARI ---
+    rolling = close.rolling(window=BB_WINDOW)
+    df['SMA_20'] = rolling.mean()
+    std_20 = rolling.std()
+    df['BB_Upper'] = df['SMA_20'] + BB_STD * std_20
+    df['BB_Lower'] = df['SMA_20'] - BB_STD * std_20
+    return df
+
+
+def _ema_step(weighted, cur, alpha):
+    """
+    pandas 'ewm(adjust=False)' ile birebir aynı tek adım EMA güncellemesi.
+    (Ağırlıklar 1-alpha ve alpha; sabit seride sayısal hata olmasın diye eşitse atlanır.)
+    """
+    if weighted is None or weighted != weighted:
+        return cur
+    if cur != cur:
+        return weighted
+    if weighted != cur:
+        old_wt = 1. - alpha
+        weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+    return weighted
+
+
+class IndicatorEngine:
+    """
+    Artımlı (O(1) / bar) indikatör motoru.
+
+    Geçmişi tekrar taramak yerine çalışan durumu saklar: son kapanış, RSI için
+    14'lük kazanç/kayıp halka tamponları, EMA12/EMA26/Sinyal değerleri ve Bollinger
+    için 20'lik kapanış halka tamponu. Pencere toplamları her barda sabit boyutlu
+    tampondan tam hassasiyetle (math.fsum) yeniden alınır; böylece uzun akışlarda
+    kayan nokta birikimi (drift) oluşmaz.
+
+    Sonuçlar, aynı barlar üzerinde compute_indicators (pandas) çıktısıyla PARITY_TOLERANCE
+    içinde eşleşir (bit düzeyinde eşitlik garanti edilmez: pandas kendi kayan pencere
+    çekirdeğini kullanır). Kontrol: engine_parity / 'python -m neuro_modules.indicators'.
+    """
+
+    def __init__(self):
+        self.prev_close = None
+        self.gains = deque(maxlen=RSI_WINDOW)
+        self.losses = deque(maxlen=RSI_WINDOW)
+        self.closes = deque(maxlen=BB_WINDOW)
+        self.ema_fast = None
+        self.ema_slow = None
+        self.signal = None
+        self.count = 0
+        self.last = dict.fromkeys(INDICATOR_COLUMNS, float('nan'))
+
+    def update(self, close):
+        """Yeni bir kapanış fiyatı ekler ve güncel indikatör değerlerini döndürür."""
+        close = float(close)
+
+        # --- RSI ---
+        # İlk barda fark yok (NaN); pandas'taki where() bunu 0 kazanç/0 kayıp sayar.
+        delta = close - self.prev_close if self.prev_close is not None else float('nan')
+        self.gains.append(delta if delta > 0 else 0.0)
+        self.losses.append(-delta if delta < 0 else 0.0)
+        rsi = float('nan')
+        if len(self.gains) == RSI_WINDOW:
+            gain = math.fsum(self.gains) / RSI_WINDOW
+            loss = math.fsum(self.losses) / RSI_WINDOW
+            if loss != 0:
+                rsi = 100 - (100 / (1 + gain / loss))
+            elif gain != 0:
+                rsi = 100.0  # Hiç kayıp yok: rs = sonsuz
+
+        # --- MACD ---
+        self.ema_fast = _ema_step(self.ema_fast, close, 2. / (MACD_FAST + 1))
+        self.ema_slow = _ema_step(self.ema_slow, close, 2. / (MACD_SLOW + 1))
+        macd = self.ema_fast - self.ema_slow
+        self.signal = _ema_step(self.signal, macd, 2. / (MACD_SIGNAL + 1))
+
+        # --- SMA 20 + BOLLINGER ---
+        self.closes.append(close)
+        sma = upper = lower = float('nan')
+        if len(self.closes) == BB_WINDOW:
+            sma = math.fsum(self.closes) / BB_WINDOW
+            var = math.fsum((c - sma) ** 2 for c in self.closes) / (BB_WINDOW - 1)
+            std = math.sqrt(var)
+            upper = sma + BB_STD * std
+            lower = sma - BB_STD * std
+
+        self.prev_close = close
+        self.count += 1
+        self.last = {'RSI': rsi, 'MACD': macd, 'MACD_Signal': self.signal,
+                     'SMA_20': sma, 'BB_Upper': upper, 'BB_Lower': lower}
+        return dict(self.last)
+
+    def update_many(self, closes):
+        """Birden çok kapanışı sırayla işler; (n, 6) indikatör matrisi döndürür."""
+        return np.array([[row[c] for c in INDICATOR_COLUMNS]
+                         for row in (self.update(x) for x in closes)], dtype=float)
+
+    @property
+    def is_warm(self):
+        """Tüm indikatörler geçerli değer üretiyor mu? (Isınma tamamlandı mı)"""
+        return self.count >= max(RSI_WINDOW, BB_WINDOW)
+
+    @classmethod
+    def from_history(cls, closes):
+        """Motoru geçmiş kapanışlarla ısıtır (tek seferlik O(n))."""
+        engine = cls()
+        for x in closes:
+            engine.update(x)
+        return engine
+
+    # --- Durum Kaydetme / Yükleme ---
+    def to_dict(self):
+        """JSON'a yazılabilir çalışma durumu."""
+        return {
+            'prev_close': self.prev_close, 'gains': list(self.gains), 'losses': list(self.losses),
+            'closes': list(self.closes), 'ema_fast': self.ema_fast, 'ema_slow': self.ema_slow,
+            'signal': self.signal, 'count': self.count, 'last': self.last,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls()
+        engine.prev_close = state['prev_close']
+        engine.gains.extend(state['gains'])
+        engine.losses.extend(state['losses'])
+        engine.closes.extend(state['closes'])
+        engine.ema_fast = state['ema_fast']
+        engine.ema_slow = state['ema_slow']
+        engine.signal = state['signal']
+        engine.count = state['count']
+        engine.last = dict(state['last'])
+        return engine
+
+
+def engine_parity(closes):
+    """
+    Artımlı motor ile pandas hesabının sütun başına en büyük farkı (PARITY_TOLERANCE ölçeğinde).
+    Isınma dönemi (NaN) iki tarafta da aynı barlarda olmalıdır; değilse fark sonsuz sayılır.
+    """
+    closes = np.asarray(closes, dtype=float)
+    ref = compute_indicators(pd.DataFrame({'Close': closes}))[INDICATOR_COLUMNS].to_numpy()
+    got = IndicatorEngine().update_many(closes)
+    scale = np.abs(closes)
+    worst = {}
+    for j, col in enumerate(INDICATOR_COLUMNS):
+        valid = np.isfinite(ref[:, j])
+        if not np.array_equal(valid, np.isfinite(got[:, j])):
+            worst[col] = float('inf')
+            continue
+        diff = np.abs(got[valid, j] - ref[valid, j])
+        if col != 'RSI':
+            diff = diff / scale[valid]
+        worst[col] = float(diff.max()) if diff.size else 0.0
+    return worst
+
+
+# --- PANEL (ÇOK HİSSELİ) HESAPLAMA ---
+def compute_panel_indicators(closes):
+    """
+    Zaman x Hisse kapanış matrisinden tüm hisselerin indikatörlerini aynı anda,
+    vektörel NumPy geçişleriyle hesaplar (500 hisse = 500 pandas hattı değil).
+
+    Her sütun kendi geçerli verisine göre ısınır: Sütunun boş (NaN) satırları
+    (henüz listelenmemiş hisse, hafta sonu boşlukları vb.) hesaplamadan önce
+    ayıklanır, sonuçlar orijinal satırlara geri yazılır. Böylece her sütun,
+    o hisse tek başına compute_indicators'a verilmiş gibi sonuç üretir.
+
+    Args:
+        closes: (T, N) np.ndarray veya index=tarih, columns=ticker DataFrame
+    Returns:
+        dict: İndikatör adı -> (T, N) dizi (girdi DataFrame ise DataFrame)
+    """
+    values = np.asarray(closes, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    valid = ~np.isnan(values)
+
+    # 1. Paketle: Her sütunun geçerli değerlerini (sırası bozulmadan) en üste taşı
+    order = np.argsort(~valid, axis=0, kind='stable')
+    packed = np.take_along_axis(values, order, axis=0)
+
+    # 2. Hesapla
+    result = _panel_core(packed)
+
+    # 3. Geri yerleştir: Geçersiz satırlar NaN kalır
+    for name, arr in result.items():
+        unpacked = np.empty_like(arr)
+        np.put_along_axis(unpacked, order, arr, axis=0)
+        unpacked[~valid] = np.nan
+        result[name] = unpacked
+
+    if isinstance(closes, pd.DataFrame):
+        return {name: pd.DataFrame(arr, index=closes.index, columns=closes.columns)
+                for name, arr in result.items()}
+    return result
+
+
+def _panel_core(x):
+    """Paketlenmiş (geçerli değerler üstte) matris üzerinde indikatörler."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # --- RSI (14) --- İlk fark NaN -> 0 kazanç / 0 kayıp (pandas ile aynı)
+        delta = np.full_like(x, np.nan)
+        delta[1:] = x[1:] - x[:-1]
+        gain = _rolling_mean(np.where(delta > 0, delta, 0.0), RSI_WINDOW)
+        loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), RSI_WINDOW)
+        rsi = 100 - (100 / (1 + gain / loss))
+
+        # --- MACD (12, 26, 9) ---
+        macd = _panel_ema(x, MACD_FAST) - _panel_ema(x, MACD_SLOW)
+        signal = _panel_ema(macd, MACD_SIGNAL)
+
+        # --- SMA 20 + BOLLINGER ---
+        sma, std = _rolling_mean_std(x, BB_WINDOW)
+
+    return {'RSI': rsi, 'MACD': macd, 'MACD_Signal': signal, 'SMA_20': sma,
+            'BB_Upper': sma + BB_STD * std, 'BB_Lower': sma - BB_STD * std}
+
+
+def _rolling_sum(a, window):
+    """Zaman ekseninde (axis=0) kayan toplam; ilk window-1 satır NaN."""
+    out = np.full_like(a, np.nan)
+    if len(a) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(a, window, axis=0).sum(axis=-1)
+    return out
+
+
+def _rolling_mean(a, window):
+    return _rolling_sum(a, window) / window
+
+
+def _rolling_mean_std(a, window):
+    """
+    Kayan ortalama ve örneklem standart sapması (ddof=1).
+    Büyük fiyatlarda sayısal iptali önlemek için her sütun önce ilk değerine göre kaydırılır.
+    """
+    shifted = a - a[:1]
+    s1 = _rolling_sum(shifted, window)
+    s2 = _rolling_sum(shifted * shifted, window)
+    mean = s1 / window
+    var = np.maximum(s2 - s1 * mean, 0.0) / (window - 1)
+    return mean + a[:1], np.sqrt(var)
+
+
+def _panel_ema(x, span):
+    """
+    pandas 'ewm(span, adjust=False)' ile birebir aynı EMA, tüm sütunlar için.
+    Zaman boyunca özyinelemeli olduğu için satır satır ilerler; her adım N sütunu
+    tek bir vektör işlemiyle günceller.
+    """
+    alpha = 2. / (span + 1)
+    old_wt = 1. - alpha
+    out = np.empty_like(x)
+    weighted = x[0].copy()
+    out[0] = weighted
+    for t in range(1, len(x)):
+        cur = x[t]
+        # Sabit seride güncelleme atlanır (pandas ile aynı)
+        update = (weighted == weighted) & (cur == cur) & (weighted != cur)
+        np.copyto(weighted, (old_wt * weighted + alpha * cur) / (old_wt + alpha), where=update)
+        # Henüz başlamamış sütun: ilk geçerli değerle başlar
+        np.copyto(weighted, cur, where=(weighted != weighted) & (cur == cur))
+        out[t] = weighted
+    return out
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU: Artımlı motor vs pandas (farklı fiyat ölçekleri, uzun seriler) ---
+    worst = dict.fromkeys(INDICATOR_COLUMNS, 0.0)
+    for seed, scale in enumerate((0.01, 1.0, 100.0, 5000.0, 60000.0)):
+        rng = np.random.default_rng(seed)
+        closes = scale * np.cumprod(1 + rng.normal(0, 0.02, 5000))
+        flat = np.arange(1, len(closes), 97)
+        closes[flat] = closes[flat - 1]  # Yatay barlar (sıfır fark) da olsun
+        for col, value in engine_parity(closes).items():
+            worst[col] = max(worst[col], value)
+    for col in INDICATOR_COLUMNS:
+        status = "✅" if worst[col] <= PARITY_TOLERANCE[col] else "🚨"
+        print(f"{status} {col:12} en büyük fark: {worst[col]:.2e} (tolerans {PARITY_TOLERANCE[col]:.0e})")
+    assert all(worst[c] <= PARITY_TOLERANCE[c] for c in INDICATOR_COLUMNS), "Parite toleransı aşıldı"
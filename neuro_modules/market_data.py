@@ -1,8 +1,53 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 
-def get_rich_market_data(ticker="NVDA", period="2y", interval="1d"):
+try:
+    from neuro_modules import data_cache, indicators, telemetry
+except ImportError:  # 'python neuro_modules/market_data.py' ile doğrudan çalıştırma
+    import data_cache, indicators, telemetry
+
+@telemetry.timed("data_fetch")
+def fetch_ohlcv(ticker="NVDA", period="2y", interval="1d", cache=None, max_age=None):
+    """
+    Ham OHLCV verisini yerel önbellekten verir; sadece son kayıttan sonraki
+    barlar sağlayıcıdan (varsayılan: yfinance) çekilip eklenir.
+    max_age=0 önbellek taze olsa bile kuyruğu yeniden çeker (elle yenileme).
+    """
+    cache = cache or data_cache.get_default_cache()
+    start = data_cache.period_start(period)
+    try:
+        return cache.get(ticker, interval=interval, start=start, max_age=max_age)
+    except Exception as e:
+        # Önbellek bozulsa bile uygulama çalışmaya devam etsin
+        print(f"⚠️ Önbellek kullanılamadı ({e}), doğrudan çekiliyor...")
+        return cache.provider.fetch(ticker, interval=interval, start=start)
+
+def get_cache_stats():
+    """Varsayılan OHLCV önbelleğinin hit/miss ve okunan bayt sayıları."""
+    return data_cache.get_default_cache().get_stats()
+
+def _cache_counts():
+    """Telemetri için: Baş / kuyruk çekimi yapılan okumalar tam isabet sayılmaz."""
+    stats = get_cache_stats()
+    return {'hits': stats['hits'], 'misses': stats['partial_hits'] + stats['misses'],
+            'hit_rate': stats['hit_rate']}
+
+telemetry.register_cache("ohlcv", _cache_counts)
+
+def read_tickers(path):
+    """
+    Hisse listesi dosyasını okur: Satır başına (veya virgül/boşlukla ayrılmış) hisse kodu,
+    '#' sonrası yorumdur. Tekrarlar atılır, sıra korunur.
+    """
+    tickers = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0]
+            tickers += [t.strip().upper() for t in line.replace(',', ' ').split() if t.strip()]
+    return list(dict.fromkeys(tickers))
+
+def get_rich_market_data(ticker="NVDA", period="2y", interval="1d", cache=None, return_engine=False,
+                         max_age=None):
     """
     Belirtilen hisse için OHLCV verisini çeker ve Teknik İndikatörleri (RSI, MACD) ekler.
     
@@ -10,15 +55,18 @@ def get_rich_market_data(ticker="NVDA", period="2y", interval="1d"):
         ticker (str): Hisse kodu (örn: NVDA)
         period (str): Ne kadarlık veri çekileceği (örn: '2y', '5y')
         interval (str): Veri aralığı (örn: '1d')
+        cache (OHLCVCache): Opsiyonel önbellek (Varsayılan: paylaşılan disk önbelleği)
+        return_engine (bool): True ise (df, IndicatorEngine) döner; yeni barlar
+            extend_rich_market_data ile artımlı eklenebilir.
+        max_age (int): Önbellek tazelik sınırı (sn); 0 ise son barlar mutlaka yeniden çekilir.
         
     Returns:
         pd.DataFrame: İçinde Close, RSI, MACD sütunları olan temiz veri seti.
     """
     print(f"📡 Veri çekiliyor: {ticker} ({period})...")
     
-    # 1. Ham Veriyi Çek
-    stock = yf.Ticker(ticker)
-    df = stock.history(period=period, interval=interval)
+    # 1. Ham Veriyi Çek (Önbellek + Artımlı Güncelleme)
+    df = fetch_ohlcv(ticker, period=period, interval=interval, cache=cache, max_age=max_age)
     
     if df.empty:
         raise ValueError("Veri çekilemedi! İnternet bağlantısını veya Ticker'ı kontrol et.")
@@ -27,35 +75,79 @@ def get_rich_market_data(ticker="NVDA", period="2y", interval="1d"):
     df = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
 
     # 2. TEKNİK İNDİKATÖRLERİ HESAPLA (Feature Engineering)
-    
-    # --- RSI (14) ---
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    
-    # --- MACD (12, 26, 9) ---
-    # EMA (Exponential Moving Average) hesaplamaları
-    ema12 = df['Close'].ewm(span=12, adjust=False).mean()
-    ema26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = ema12 - ema26
-    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    
-    # --- SMA (20 & 50) Trend Takibi ---
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-
-    # --- BOLLINGER BANTLARI EKLENİYOR ---
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-    df['BB_Upper'] = df['SMA_20'] + 2 * df['Close'].rolling(window=20).std()
-    df['BB_Lower'] = df['SMA_20'] - 2 * df['Close'].rolling(window=20).std()
+    # RSI (14), MACD (12, 26, 9), SMA 20 ve Bollinger Bantları
+    raw = df
+    with telemetry.span("indicators"):
+        df = indicators.compute_indicators(raw)
     
     # 3. Temizlik (İlk satırlarda NaN oluşur hesaplamadan dolayı, onları atalım)
     df.dropna(inplace=True)
     
     print(f"✅ Veri Hazır! Son Fiyat: {df['Close'].iloc[-1]:.2f}$ | RSI: {df['RSI'].iloc[-1]:.2f}")
+    if return_engine:
+        # Aynı ham barlarla ısıtılmış artımlı motor (sonraki barlar için)
+        return df, indicators.IndicatorEngine.from_history(raw['Close'].values)
     return df
 
+def extend_rich_market_data(df, new_bars, engine):
+    """
+    Yeni gelen barları, geçmişi TEKRAR TARAMADAN indikatörleriyle birlikte ekler.
+    'engine', get_rich_market_data(..., return_engine=True) ile alınan motordur
+    ve yerinde güncellenir. Zaten işlenmiş zaman damgaları atlanır.
+
+    Returns:
+        pd.DataFrame: df + yeni satırlar
+    """
+    if new_bars is None or new_bars.empty:
+        return df
+    if len(df):
+        new_bars = new_bars[new_bars.index > df.index[-1]]
+
+    rows = []
+    for ts, bar in new_bars.iterrows():
+        values = engine.update(bar['Close'])
+        row = {c: bar[c] for c in ['Open', 'High', 'Low', 'Close', 'Volume'] if c in bar}
+        row.update(values)
+        rows.append(pd.Series(row, name=ts))
+
+    if not rows:
+        return df
+    added = pd.DataFrame(rows)[df.columns].dropna().astype(df.dtypes.to_dict())
+    return pd.concat([df, added]) if len(df) else added
+
+def get_panel_market_data(tickers, period="1y", interval="1d", cache=None):
+    """
+    Panel Modu: Çok sayıda hisse için kapanışları tek bir Zaman x Hisse tablosunda
+    toplar ve indikatörleri tüm sütunlar için tek seferde (vektörel) hesaplar.
+
+    Returns:
+        (closes, panel): closes -> pd.DataFrame (index=tarih, columns=ticker)
+                         panel  -> {'RSI': DataFrame, 'MACD': DataFrame, ...}
+    """
+    print(f"📡 Panel verisi çekiliyor: {len(tickers)} hisse ({period})...")
+    series = {}
+    for ticker in tickers:
+        try:
+            df = fetch_ohlcv(ticker, period=period, interval=interval, cache=cache, max_age=max_age)
+        except Exception as e:
+            print(f"   ⚠️ {ticker}: {e}")
+            continue
+        if df.empty: continue
+        close = df['Close']
+        # Günlük ve üstü aralıklarda borsalar farklı saat dilimlerinde olabilir;
+        # aynı takvim gününü aynı satıra oturtmak için tarihe indiriyoruz.
+        if interval.endswith(('d', 'wk', 'mo')) and getattr(close.index, 'tz', None) is not None:
+            close.index = close.index.tz_localize(None).normalize()
+        series[ticker] = close[~close.index.duplicated(keep='last')]
+
+    if not series:
+        raise ValueError("Veri çekilemedi! İnternet bağlantısını veya Ticker'ları kontrol et.")
+
+    closes = pd.concat(series, axis=1).sort_index()
+    panel = indicators.compute_panel_indicators(closes)
+    print(f"✅ Panel Hazır! {closes.shape[1]} hisse x {closes.shape[0]} bar")
+    return closes, panel
+
 # --- TEST BLOĞU (Sadece bu dosya çalıştırılırsa devreye girer) ---
 if __name__ == "__main__":
     # Dosyayı test etmek için terminale 'python neuro_modules/market_data.py' yaz
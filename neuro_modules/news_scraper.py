@@ -1,44 +1,85 @@
+import os
+import copy
+import threading
 import feedparser
 import urllib.parse
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pandas as pd
 
-def get_google_news(ticker_symbol="NVDA", max_results=10):
-    """
-    Google News RSS servisini kullanarak, belirtilen hisse hakkındaki
-    son haberleri çeker ve YENİDEN ESKİYE sıralar.
-    """
-    
-    # 1. URL OLUŞTURMA
+try:
+    from neuro_modules import telemetry
+except ImportError:  # 'python neuro_modules/news_scraper.py' ile doğrudan çalıştırma
+    import telemetry
+
+# --- AYARLAR ---
+# Testlerde yerel bir RSS sunucusuna yönlendirmek için ortam değişkeniyle değiştirilebilir.
+RSS_URL_TEMPLATE = os.environ.get(
+    "NEUROQUANT_NEWS_URL",
+    "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en",
+)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+}
+TIMEOUT = 10
+MAX_PER_HOST = 4   # Aynı sunucuya aynı anda en fazla bu kadar istek
+MAX_WORKERS = 8
+FEED_CACHE_MAX_ITEMS = 512   # Koşullu GET önbelleğindeki en fazla akış (LRU)
+
+# --- BAĞLANTI HAVUZU VE KOŞULLU GET ÖNBELLEĞİ ---
+_session = None
+_lock = threading.Lock()
+_host_slots = {}
+_feed_cache = OrderedDict()   # url -> {'etag', 'last_modified', 'news'} (LRU, FEED_CACHE_MAX_ITEMS)
+_stats = {'requests': 0, 'not_modified': 0, 'downloaded': 0, 'errors': 0}
+
+
+def _get_session():
+    """Tüm isteklerin paylaştığı, bağlantı havuzlu requests oturumu."""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def _host_slot(url):
+    """Sunucu başına eşzamanlılığı sınırlayan semafor."""
+    host = urllib.parse.urlsplit(url).netloc
+    with _lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return _host_slots[host]
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def build_news_url(ticker_symbol):
     query = urllib.parse.quote(f"{ticker_symbol} stock news")
     # 'when:7d' parametresi ile son 7 güne odaklanabiliriz ama şimdilik genel kalsın
-    rss_url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-    
-    print(f"📡 Haberler çekiliyor: {ticker_symbol}...")
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-    }
-    
-    try:
-        response = requests.get(rss_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
-    except Exception as e:
-        print(f"⚠️ Bağlantı Hatası: {e}")
-        return []
-    
-    if not feed.entries:
-        return []
-    
+    return RSS_URL_TEMPLATE.format(query=query)
+
+
+def _parse_feed(content):
+    """RSS içeriğini haber listesine çevirir ve YENİDEN ESKİYE sıralar."""
+    feed = feedparser.parse(content)
     news_list = []
-    
+
     for entry in feed.entries:
         # Tarih formatlama ve Sıralama için Ham Tarihi Alma
         dt_obj = datetime.now() # Varsayılan (Eğer tarih yoksa)
         date_str = "Tarih Yok"
-        
+
         if hasattr(entry, 'published_parsed'):
             # feedparser tarihi (Yıl, Ay, Gün, Saat...) tuple olarak verir
             dt_obj = datetime(*entry.published_parsed[:6])
@@ -52,17 +93,110 @@ def get_google_news(ticker_symbol="NVDA", max_results=10):
             'dt_obj': dt_obj # Sıralama için geçici olarak ekliyoruz (Gizli Kahraman)
         }
         news_list.append(news_item)
-        
+
     # --- KRİTİK DOKUNUŞ: SIRALAMA ---
     # Listeyi 'dt_obj' anahtarına göre TERS (Yeniden Eskiye) sırala
     news_list.sort(key=lambda x: x['dt_obj'], reverse=True)
-    
-    # Şimdi sadece ilk 'max_results' kadarını al (En yeniler)
-    final_list = news_list[:max_results]
-    
-    print(f"✅ Toplam {len(final_list)} haber çekildi ve sıralandı.")
+    return news_list
+
+
+def fetch_feed(url, timeout=TIMEOUT):
+    """
+    RSS akışını koşullu GET ile çeker (ETag / Last-Modified).
+    Sunucu '304 Not Modified' derse indirme ve ayrıştırma atlanır,
+    önceki ayrıştırılmış liste kullanılır.
+    """
+    with _lock:
+        cached = _feed_cache.get(url)
+        if cached:
+            _feed_cache.move_to_end(url)
+
+    headers = {}
+    if cached:
+        if cached.get('etag'): headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'): headers['If-Modified-Since'] = cached['last_modified']
+
+    _count('requests')
+    with _host_slot(url):
+        response = _get_session().get(url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and cached:
+        _count('not_modified')
+        return cached['news']
+
+    response.raise_for_status()
+    _count('downloaded')
+    news_list = _parse_feed(response.content)
+    with _lock:
+        _feed_cache[url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'news': news_list,
+        }
+        _feed_cache.move_to_end(url)
+        while len(_feed_cache) > FEED_CACHE_MAX_ITEMS:
+            _feed_cache.popitem(last=False)
+    return news_list
+
+
+def get_google_news(ticker_symbol="NVDA", max_results=10):
+    """
+    Google News RSS servisini kullanarak, belirtilen hisse hakkındaki
+    son haberleri çeker ve YENİDEN ESKİYE sıralar.
+    """
+    print(f"📡 Haberler çekiliyor: {ticker_symbol}...")
+    final_list = _get_news(ticker_symbol, max_results)
+    if final_list:
+        print(f"✅ Toplam {len(final_list)} haber çekildi ve sıralandı.")
     return final_list
 
+
+def _get_news(ticker_symbol, max_results):
+    try:
+        with telemetry.span("news_fetch"):
+            news_list = fetch_feed(build_news_url(ticker_symbol))
+    except Exception as e:
+        _count('errors')
+        print(f"⚠️ Bağlantı Hatası ({ticker_symbol}): {e}")
+        return []
+
+    # Şimdi sadece ilk 'max_results' kadarını al (En yeniler)
+    # Kopya veriyoruz: score_news listeye 'ai_score' yazıyor, önbellek kirlenmesin.
+    return copy.deepcopy(news_list[:max_results])
+
+
+def get_google_news_many(tickers, max_results=10, max_workers=MAX_WORKERS):
+    """
+    Birden çok hisse için haberleri EŞZAMANLI çeker (iş parçacığı havuzu).
+    Bağlantılar tek oturumda havuzlanır, sunucu başına eşzamanlılık sınırlıdır.
+
+    Returns:
+        dict: ticker -> haber listesi (hata olursa boş liste)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    print(f"📡 Haberler çekiliyor: {len(tickers)} hisse (eşzamanlı)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        lists = pool.map(lambda t: _get_news(t, max_results), tickers)
+        results = dict(zip(tickers, lists))
+    print(f"✅ {sum(1 for v in results.values() if v)}/{len(tickers)} hisse için haber hazır.")
+    return results
+
+
+def get_news_stats():
+    """İstek, 304 (değişmedi), indirme ve hata sayıları."""
+    with _lock:
+        return dict(_stats)
+
+
+def _feed_cache_counts():
+    """Koşullu GET: 304 yanıtı isabet, tam indirme ıska sayılır."""
+    stats = get_news_stats()
+    return {'hits': stats['not_modified'], 'misses': stats['downloaded']}
+
+
+telemetry.register_cache("news_feed", _feed_cache_counts)
+
+
 if __name__ == "__main__":
     try:
         results = get_google_news("NVDA", max_results=10)
@@ -73,4 +207,4 @@ if __name__ == "__main__":
         else:
             print("Liste boş.")
     except Exception as e:
-        print(f"Hata: {e}")
\ No newline at end of file
+        print(f"Hata: {e}")
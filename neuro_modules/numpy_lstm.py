@@ -0,0 +1,183 @@
+"""
+Saf NumPy LSTM Çıkarım Motoru (TensorFlow'suz).
+
+universal_lstm.h5 dosyasındaki LSTM / Dense ağırlıklarını doğrudan h5py ile okur
+ve ileri geçişi (forward pass) NumPy ile, çok sayıda pencere üzerinde toplu halde
+yapar. Keras 'model.predict(x, verbose=0)' arayüzünü taklit ettiği için
+ai_engine.predict_future / predict_future_batch değişmeden kullanılabilir.
+
+Parite kontrolü (Keras kuruluysa):
+    python -m neuro_modules.numpy_lstm --check
+"""
+import os
+import json
+import numpy as np
+
+try:
+    from scipy.special import expit as _sigmoid
+except ImportError:  # scipy yoksa (scikit-learn ile zaten gelir)
+    def _sigmoid(x):
+        return 1 / (1 + np.exp(-x))
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL_PATH = os.path.join(BASE_DIR, 'models', 'universal_lstm.h5')
+
+
+def _hard_sigmoid(x):
+    # Keras 2 varsayılanı (eski modeller için)
+    return np.clip(0.2 * x + 0.5, 0, 1)
+
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'relu': lambda x: np.maximum(x, 0),
+    'linear': lambda x: x,
+    None: lambda x: x,
+}
+
+
+class NumpyLSTMModel:
+    """
+    Sequential LSTM/Dense modelinin NumPy karşılığı (sadece çıkarım).
+    Dropout katmanları çıkarımda etkisiz olduğu için atlanır.
+    """
+
+    def __init__(self, layers, input_shape=None):
+        self.layers = layers
+        self.input_shape = input_shape
+
+    # --- Yükleme ---
+    @classmethod
+    def from_h5(cls, path=DEFAULT_MODEL_PATH):
+        """Keras .h5 dosyasından mimariyi (model_config) ve ağırlıkları okur."""
+        import h5py
+
+        with h5py.File(path, 'r') as f:
+            config = f.attrs['model_config']
+            config = json.loads(config.decode('utf-8') if isinstance(config, bytes) else config)
+            layer_configs = config['config']['layers'] if isinstance(config['config'], dict) else config['config']
+
+            layers, input_shape = [], None
+            for layer in layer_configs:
+                kind, cfg = layer['class_name'], layer['config']
+                if kind == 'InputLayer':
+                    input_shape = tuple(cfg.get('batch_shape') or cfg.get('batch_input_shape'))
+                elif kind == 'LSTM':
+                    w = _layer_weights(f, cfg['name'])
+                    layers.append({
+                        'type': 'lstm', 'units': cfg['units'],
+                        'kernel': w['kernel'], 'recurrent_kernel': w['recurrent_kernel'],
+                        'bias': w.get('bias', np.zeros(4 * cfg['units'], dtype=np.float32)),
+                        'activation': ACTIVATIONS[cfg.get('activation', 'tanh')],
+                        'recurrent_activation': ACTIVATIONS[cfg.get('recurrent_activation', 'sigmoid')],
+                        'return_sequences': cfg.get('return_sequences', False),
+                    })
+                elif kind == 'Dense':
+                    w = _layer_weights(f, cfg['name'])
+                    layers.append({
+                        'type': 'dense', 'kernel': w['kernel'],
+                        'bias': w.get('bias', np.zeros(cfg['units'], dtype=np.float32)),
+                        'activation': ACTIVATIONS[cfg.get('activation', 'linear')],
+                    })
+                elif kind in ('Dropout', 'InputLayer'):
+                    continue
+                else:
+                    raise ValueError(f"Desteklenmeyen katman: {kind}")
+        return cls(layers, input_shape)
+
+    # --- Çıkarım ---
+    def predict(self, x, verbose=0, batch_size=4096):
+        """
+        (N, T, F) girdiden (N, çıktı) tahmin üretir (float32).
+        Büyük N değerleri bellek sınırlı kalsın diye batch_size'lık parçalarla işlenir.
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if len(x) <= batch_size:
+            return self._forward(x)
+        return np.concatenate([self._forward(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+    def __call__(self, x, training=False):
+        return self.predict(x)
+
+    def _forward(self, h):
+        for layer in self.layers:
+            if layer['type'] == 'lstm':
+                h = _lstm_forward(h, layer)
+            else:
+                h = layer['activation'](h @ layer['kernel'] + layer['bias'])
+        return h.astype(np.float32, copy=False)
+
+
+def _lstm_forward(x, layer):
+    """
+    Keras LSTM ileri geçişi. Kapı sırası: giriş (i), unutma (f), aday (c), çıkış (o).
+    Girdi projeksiyonu (x @ W) tüm zaman adımları için tek matris çarpımıyla yapılır;
+    döngüde sadece h @ U kalır.
+    """
+    n, steps, _ = x.shape
+    units = layer['units']
+    act, rec_act = layer['activation'], layer['recurrent_activation']
+    U = layer['recurrent_kernel']
+
+    projected = x @ layer['kernel'] + layer['bias']  # (N, T, 4H)
+    h = np.zeros((n, units), dtype=np.float32)
+    c = np.zeros((n, units), dtype=np.float32)
+    outputs = np.empty((n, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+
+    for t in range(steps):
+        z = projected[:, t] + h @ U
+        i = rec_act(z[:, :units])
+        f = rec_act(z[:, units:2 * units])
+        g = act(z[:, 2 * units:3 * units])
+        o = rec_act(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * act(c)
+        if outputs is not None:
+            outputs[:, t] = h
+    return outputs if outputs is not None else h
+
+
+def _layer_weights(f, layer_name):
+    """
+    Katmanın ağırlık veri kümelerini bulur. Keras 2 ('lstm/lstm_cell/kernel:0')
+    ve Keras 3 ('lstm/sequential/lstm/lstm_cell/kernel') düzenlerinin ikisini de okur.
+    """
+    group = f['model_weights'][layer_name] if 'model_weights' in f else f[layer_name]
+    weights = {}
+
+    def visit(name, obj):
+        if hasattr(obj, 'shape'):
+            key = name.split('/')[-1].split(':')[0]
+            weights[key] = np.asarray(obj[()], dtype=np.float32)
+
+    group.visititems(visit)
+    return weights
+
+
+def check_parity(path=DEFAULT_MODEL_PATH, n=256, seed=0):
+    """NumPy ve Keras çıktılarını rastgele pencerelerde karşılaştırır (en büyük mutlak fark)."""
+    from tensorflow.keras.models import load_model
+
+    ours = NumpyLSTMModel.from_h5(path)
+    keras_model = load_model(path)
+    steps, features = ours.input_shape[1], ours.input_shape[2]
+    x = np.random.default_rng(seed).uniform(0, 1, (n, steps, features)).astype(np.float32)
+    diff = np.abs(ours.predict(x) - keras_model.predict(x, verbose=0))
+    return float(diff.max())
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Saf NumPy LSTM motoru")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--check", action="store_true", help="Keras ile parite kontrolü")
+    args = parser.parse_args()
+
+    model = NumpyLSTMModel.from_h5(args.model)
+    print(f"✅ Model okundu: {len(model.layers)} katman, girdi {model.input_shape}")
+    if args.check:
+        max_diff = check_parity(args.model)
+        status = "✅" if max_diff < 1e-5 else "🚨"
+        print(f"{status} Keras ile en büyük fark: {max_diff:.2e}")
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Stage:
+    """
+    Analiz hattının tek bir aşaması.
+
+    Args:
+        name (str): Aşama adı (sonuç ve süre tablolarında anahtar)
+        fn (callable): Bağımlılıkların sonuçlarını, 'deps' sırasıyla argüman olarak alır
+        deps (tuple): Önce bitmesi gereken aşamaların adları
+    """
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+def run_stages(stages, max_workers=4, initializer=None):
+    """
+    Aşama grafiğini çalıştırır: Bağımlılıkları hazır olan her aşama hemen bir
+    iş parçacığında başlar. Böylece G/Ç ağırlıklı aşamalar (veri, haber, model
+    yükleme) üst üste biner ve toplam süre en yavaş zincire yaklaşır.
+
+    Bir aşama hata verirse bekleyen aşamalar başlatılmaz ve hata yukarı iletilir.
+
+    Returns:
+        (results, timings): results -> {ad: sonuç}
+                            timings -> {ad: {'start', 'end', 'seconds'}}, ayrıca
+                                       '_total' anahtarında uçtan uca süre (saniye)
+    """
+    stages = {stage.name: stage for stage in stages}
+    for stage in stages.values():
+        missing = [d for d in stage.deps if d not in stages]
+        if missing:
+            raise ValueError(f"'{stage.name}' bilinmeyen aşamaya bağlı: {missing}")
+
+    results, timings = {}, {}
+    t0 = time.perf_counter()
+
+    def timed(stage, args):
+        start = time.perf_counter()
+        try:
+            return stage.fn(*args)
+        finally:
+            end = time.perf_counter()
+            timings[stage.name] = {'start': start - t0, 'end': end - t0, 'seconds': end - start}
+
+    pending = dict(stages)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as pool:
+        while pending or running:
+            # Bağımlılıkları tamamlanan aşamaları başlat
+            for name in [n for n, s in pending.items() if all(d in results for d in s.deps)]:
+                stage = pending.pop(name)
+                args = [results[d] for d in stage.deps]
+                running[pool.submit(timed, stage, args)] = name
+
+            if not running:
+                raise ValueError(f"Döngüsel bağımlılık: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                results[name] = future.result()
+
+    timings['_total'] = time.perf_counter() - t0
+    return results, timings
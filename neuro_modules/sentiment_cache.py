@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+# --- AYARLAR ---
+# Disk deposu opsiyoneldir: Ortam değişkeni verilmezse sadece RAM (LRU) kullanılır.
+SENTIMENT_DB = os.environ.get("NEUROQUANT_SENTIMENT_DB")
+MAX_ITEMS = 10000
+
+
+def headline_key(text, model_id=""):
+    """Başlığın içerik özeti (sha256). Boşluk farkları aynı başlık sayılır."""
+    normalized = " ".join(str(text).split())
+    return hashlib.sha256(f"{model_id}\x00{normalized}".encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    Haber başlığı -> FinBERT sonucu ({'label', 'score'}) önbelleği.
+
+    1. Katman: Bellekte LRU (OrderedDict, en fazla max_items kayıt)
+    2. Katman: Opsiyonel SQLite dosyası (yeniden başlatmalarda da korunur)
+    Anahtar, başlığın ve modelin içerik özetidir; aynı başlık bir kez puanlanır.
+    """
+
+    def __init__(self, max_items=MAX_ITEMS, db_path=SENTIMENT_DB):
+        self.max_items = max_items
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'batches': 0, 'scored': 0}
+        self.batch_latencies = deque(maxlen=200)  # saniye
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS sentiment "
+                             "(key TEXT PRIMARY KEY, label TEXT, score REAL)")
+
+    def get_many(self, keys):
+        """Bulunan anahtarlar için {key: sonuç} döndürür."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.stats['hits'] += 1
+                else:
+                    missing.append(key)
+
+            # SQLite tek sorguda sınırlı parametre kabul eder; 500'lük parçalar
+            for i in range(0, len(missing) if self._db is not None else 0, 500):
+                part = missing[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, label, score FROM sentiment WHERE key IN ({','.join('?' * len(part))})", part
+                ).fetchall()
+                for key, label, score in rows:
+                    found[key] = {'label': label, 'score': score}
+                    self._remember(key, found[key])
+                    self.stats['disk_hits'] += 1
+
+            self.stats['misses'] += sum(1 for key in missing if key not in found)
+        return found
+
+    def put_many(self, items):
+        """items: {key: {'label', 'score'}}"""
+        with self._lock:
+            for key, result in items.items():
+                self._remember(key, result)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment (key, label, score) VALUES (?, ?, ?)",
+                    [(k, r['label'], float(r['score'])) for k, r in items.items()])
+                self._db.commit()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def record_batch(self, size, seconds):
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['scored'] += size
+            self.batch_latencies.append(seconds)
+
+    def get_stats(self):
+        """Hit/miss sayıları, isabet oranı ve batch gecikmesi (ms)."""
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = list(self.batch_latencies)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['size'] = len(self._memory)
+        stats['avg_batch_ms'] = 1000 * sum(latencies) / len(latencies) if latencies else 0.0
+        stats['last_batch_ms'] = 1000 * latencies[-1] if latencies else 0.0
+        return stats
+
+
+# --- VARSAYILAN ÖNBELLEK ---
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_sentiment_cache():
+    """Uygulama genelinde paylaşılan başlık önbelleği."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SentimentCache()
+        return _default_cache
+
@@ -0,0 +1,136 @@
+"""
+FinBERT Yükleyici (Tam Hassasiyet / int8 Nicemlenmiş).
+
+Uygulama yalnızca CPU'da çalıştığı için FinBERT'in Linear katmanları isteğe bağlı
+olarak dinamik int8 nicemlemeyle (torch.ao.quantization.quantize_dynamic) küçültülür.
+Bu, bellekte kalan en büyük modeli ve en yavaş başlık-başı aşamayı hafifletir.
+
+Ayarlar (ortam değişkenleri):
+    NEUROQUANT_FINBERT_PATH   : Hub adı ya da YEREL model klasörü (çevrimdışı çalışma için)
+    NEUROQUANT_FINBERT_QUANT  : 'none' (varsayılan) | 'int8'
+
+Yerel kopya oluşturma ve etiket uyumu kontrolü:
+    python -m neuro_modules.sentiment_model --download models/finbert-tone
+    python -m neuro_modules.sentiment_model --model models/finbert-tone \\
+        --headlines benchmarks/headlines_holdout.txt
+"""
+import os
+import io
+import time
+
+DEFAULT_FINBERT = "yiyanghkust/finbert-tone"
+FINBERT_PATH = os.environ.get("NEUROQUANT_FINBERT_PATH", DEFAULT_FINBERT)
+FINBERT_QUANT = os.environ.get("NEUROQUANT_FINBERT_QUANT", "none").lower()
+QUANT_MODES = ('none', 'int8')
+
+
+def load_sentiment_pipeline(model_path=None, quantize=None):
+    """
+    FinBERT 'sentiment-analysis' hattını kurar.
+    model_path bir klasörse sadece yerel dosyalar kullanılır (ağ erişimi yok).
+    quantize='int8' ise Linear katmanları dinamik int8'e çevrilir.
+    """
+    # Ağır çerçeveler sadece burada yüklenir (açılış sayfası hızlı kalsın)
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+
+    model_path = model_path or FINBERT_PATH
+    quantize = (quantize or FINBERT_QUANT).lower()
+    if quantize not in QUANT_MODES:
+        raise ValueError(f"Bilinmeyen nicemleme modu: {quantize} ({' | '.join(QUANT_MODES)})")
+
+    local_only = os.path.isdir(model_path)
+    tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=local_only)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=local_only)
+    model.eval()
+
+    if quantize == 'int8':
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    pipe = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=-1)
+    # Önbellek anahtarı için kimlik: int8 ve tam hassasiyet sonuçları karışmasın
+    pipe.neuroquant_model_id = f"{model_path}#{quantize}" if quantize != 'none' else model_path
+    return pipe
+
+
+def sentiment_model_id(sentiment_pipe):
+    """Başlık önbelleğinde kullanılan model kimliği (model adı + nicemleme modu)."""
+    model_id = getattr(sentiment_pipe, 'neuroquant_model_id', None)
+    if model_id:
+        return model_id
+    return getattr(getattr(sentiment_pipe, 'model', None), 'name_or_path', '')
+
+
+def model_size_mb(sentiment_pipe):
+    """Modelin serileştirilmiş ağırlık boyutu (MB)."""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(sentiment_pipe.model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def load_headlines(path):
+    """Satır başına bir başlık; boş satırlar ve '#' ile başlayanlar atlanır."""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def agreement_report(headlines, model_path=None, quantize='int8', batch_size=16):
+    """
+    Nicemlenmiş modeli tam hassasiyetli modelle aynı başlık setinde kıyaslar.
+
+    Returns:
+        dict: agreement (etiket uyum oranı), mismatches (uyuşmayan başlıklar),
+              confusion ({(tam, nicem): adet}), her iki model için süre (sn) ve boyut (MB)
+    """
+    report = {'n': len(headlines), 'quantize': quantize}
+    labels = {}
+    for mode in ('none', quantize):
+        pipe = load_sentiment_pipeline(model_path, quantize=mode)
+        pipe(headlines[:batch_size], batch_size=batch_size, truncation=True)  # ısınma
+        t0 = time.perf_counter()
+        outputs = pipe(headlines, batch_size=batch_size, truncation=True)
+        report[f'{mode}_seconds'] = time.perf_counter() - t0
+        report[f'{mode}_size_mb'] = model_size_mb(pipe)
+        labels[mode] = [out['label'] for out in outputs]
+
+    full, quant = labels['none'], labels[quantize]
+    matches = sum(a == b for a, b in zip(full, quant))
+    report['agreement'] = matches / len(headlines) if headlines else 1.0
+    report['mismatches'] = [(h, a, b) for h, a, b in zip(headlines, full, quant) if a != b]
+    confusion = {}
+    for a, b in zip(full, quant):
+        confusion[(a, b)] = confusion.get((a, b), 0) + 1
+    report['confusion'] = confusion
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    parser = argparse.ArgumentParser(description="FinBERT nicemleme aracı")
+    parser.add_argument("--model", default=FINBERT_PATH, help="Hub adı veya yerel klasör")
+    parser.add_argument("--quantize", default="int8", choices=QUANT_MODES[1:])
+    parser.add_argument("--headlines", help="Ayrılmış başlık seti (satır başına bir başlık)")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--download", metavar="KLASÖR", help="Modeli çevrimdışı kullanım için bu klasöre kaydet")
+    args = parser.parse_args()
+
+    if args.download:
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        AutoTokenizer.from_pretrained(args.model).save_pretrained(args.download)
+        AutoModelForSequenceClassification.from_pretrained(args.model).save_pretrained(args.download)
+        print(f"✅ Model kaydedildi: {args.download}")
+
+    if args.headlines:
+        report = agreement_report(load_headlines(args.headlines), args.model, args.quantize)
+        print(f"📰 Başlık sayısı: {report['n']}")
+        print(f"⏱️ Süre  -> tam: {report['none_seconds']:.2f} sn | {args.quantize}: {report[args.quantize + '_seconds']:.2f} sn")
+        print(f"💾 Boyut -> tam: {report['none_size_mb']:.1f} MB | {args.quantize}: {report[args.quantize + '_size_mb']:.1f} MB")
+        for (a, b), count in sorted(report['confusion'].items()):
+            print(f"   {a:>10} -> {b:<10} {count}")
+        for headline, a, b in report['mismatches']:
+            print(f"   ⚠️ [{a} -> {b}] {headline}")
+        ok = report['agreement'] >= args.min_agreement
+        print(f"{'✅' if ok else '🚨'} Etiket uyumu: %{report['agreement'] * 100:.1f} (eşik %{args.min_agreement * 100:.0f})")
+        sys.exit(0 if ok else 1)
@@ -0,0 +1,432 @@
+"""
+Akış (Streaming) Modu: Bar olayları -> artımlı göstergeler -> mikro-batch LSTM -> karar.
+
+Uygulama günlük veriyi tek seferde çeker. Bu modül gün içi (1m, 5m, 1h ...) barları
+bir olay akışı olarak işler:
+
+    Besleme (feed) ──put──> [sınırlı kuyruk] ──get──> StreamEngine
+      ReplayFeed             maxsize, dolunca         - hisse başına IndicatorEngine (O(1) / bar)
+      PollingFeed            üretici BEKLER           - hisse başına son 61 kapanış tamponu
+      (kendi beslemeniz)     (backpressure)           - bar kapanışında mikro-batch:
+                                                        tüm hisseler TEK predict çağrısında
+                                                      - make_final_decision -> on_decision
+
+Bar kapanışı: Aynı zaman damgalı barlar bir batch'te toplanır. Batch şu durumlarda işlenir:
+abone olunan tüm hisseler o barı gönderdiğinde, daha yeni bir zaman damgası geldiğinde,
+ilk bardan bu yana max_wait saniye geçtiğinde ya da batch max_batch'e ulaştığında.
+
+Gecikme ölçümü: Her bar beslemeden çıktığı an (t_feed) damgalanır; karar üretildiğinde
+'bar -> karar' süresi kaydedilir (kuyruk bekleme + batch bekleme + tahmin dahil).
+
+Kullanım:
+    python -m neuro_modules.streaming --data-dir ./ohlcv --interval 1m --warmup 120
+    python -m neuro_modules.streaming --synthetic 300 --bars 30 --bar-seconds 0.2 --lstm-backend numpy
+"""
+import re
+import abc
+import time
+import queue
+import threading
+from collections import deque, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from neuro_modules import ai_engine
+from neuro_modules.indicators import IndicatorEngine
+
+# --- AYARLAR ---
+QUEUE_SIZE = 10000      # Besleme -> motor kuyruğu (dolunca besleme bekler)
+MAX_BATCH = 1024        # Tek predict çağrısındaki en fazla hisse
+MAX_WAIT = 0.05         # Eksik hisseler için bar kapanışında en fazla bekleme (sn)
+LATENCY_WINDOW = 100000
+
+BarEvent = namedtuple('BarEvent', ['ticker', 'ts', 'open', 'high', 'low', 'close', 'volume', 't_feed'])
+_END = object()  # Besleme bitti işareti
+
+
+# --- BESLEMELER (FEED) ---
+# Her besleme aynı arayüzü uygular:
+#     subscribe(tickers) ; bars() -> BarEvent üreteci ; close()
+# bars() her olayı üretirken t_feed = time.perf_counter() damgalar.
+
+class BarFeed(abc.ABC):
+    """Besleme arayüzü: Alt sınıflar bars() üretecini uygular."""
+    name = "base"
+
+    def __init__(self):
+        self.tickers = []
+        self._closed = threading.Event()
+
+    def subscribe(self, tickers):
+        self.tickers = [str(t).upper() for t in tickers]
+
+    @abc.abstractmethod
+    def bars(self):
+        """Abone olunan hisselerin barlarını BarEvent olarak (zaman sırasıyla) üretir."""
+
+    def close(self):
+        self._closed.set()
+
+
+def _frame_events(ticker, df):
+    """DataFrame satırlarını (ts, ticker, o, h, l, c, v) demetlerine çevirir."""
+    cols = [df[c].to_numpy(dtype=float) if c in df else np.full(len(df), np.nan)
+            for c in ('Open', 'High', 'Low', 'Close', 'Volume')]
+    return [(ts, ticker, *values) for ts, *values in zip(df.index, *cols)]
+
+
+class ReplayFeed(BarFeed):
+    """
+    Yerel barları zaman sırasıyla yeniden oynatır (testler ve ölçümler için).
+
+    Args:
+        frames: {ticker: OHLCV DataFrame}
+        bar_seconds: İki zaman damgası arası bekleme (0 = beklemeden, olabildiğince hızlı)
+    """
+    name = "replay"
+
+    def __init__(self, frames, bar_seconds=0.0):
+        super().__init__()
+        self.frames = {str(t).upper(): df for t, df in frames.items()}
+        self.bar_seconds = bar_seconds
+        self.tickers = list(self.frames)
+
+    @classmethod
+    def from_dir(cls, data_dir, tickers, interval="1d", start=None, bar_seconds=0.0):
+        """data_cache.LocalFileProvider dosya düzeninden ('<TICKER>_<interval>.csv/.parquet') okur."""
+        from neuro_modules.data_cache import LocalFileProvider
+        provider = LocalFileProvider(data_dir)
+        frames = {t: provider.fetch(t, interval=interval, start=start) for t in tickers}
+        return cls({t: df for t, df in frames.items() if not df.empty}, bar_seconds)
+
+    def bars(self):
+        wanted = set(self.tickers)
+        rows = [row for t, df in self.frames.items() if t in wanted for row in _frame_events(t, df)]
+        rows.sort(key=lambda r: r[0])
+        last_ts, next_at = None, time.perf_counter()
+        for ts, ticker, o, h, l, c, v in rows:
+            if self._closed.is_set():
+                return
+            if ts != last_ts:
+                # Yeni bar: Gerçek zamanlı akışı taklit etmek için bar aralığı kadar bekle
+                if self.bar_seconds and last_ts is not None:
+                    next_at += self.bar_seconds
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                last_ts = ts
+            yield BarEvent(ticker, ts, o, h, l, c, v, time.perf_counter())
+
+
+# yfinance aralık birimleri -> pd.DateOffset argümanı ('1wk', '1mo' Timedelta ile ayrıştırılamaz)
+_INTERVAL_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'wk': 'weeks', 'mo': 'months'}
+
+def bar_length(interval):
+    """'5m', '1h', '1d', '1wk', '3mo' gibi bir aralığın bar süresi (pd.DateOffset)."""
+    match = re.fullmatch(r'(\d+)(m|h|d|wk|mo)', str(interval))
+    if not match:
+        raise ValueError(f"Desteklenmeyen bar aralığı: {interval!r} "
+                         f"(örn: 1m, 5m, 1h, 1d, 1wk, 1mo)")
+    count, unit = match.groups()
+    return pd.DateOffset(**{_INTERVAL_UNITS[unit]: int(count)})
+
+
+class PollingFeed(BarFeed):
+    """
+    Sağlayıcıyı (varsayılan yfinance) periyodik sorgulayıp YENİ ve KAPANMIŞ barları üretir.
+    Son satır henüz kapanmamış (oluşmakta olan) bar olabileceği için bar süresi dolana kadar atlanır.
+    """
+    name = "polling"
+
+    def __init__(self, interval="1m", poll_seconds=60.0, provider=None, lookback="1d"):
+        super().__init__()
+        from neuro_modules import data_cache
+        self.interval = interval
+        self.poll_seconds = poll_seconds
+        self.provider = provider or data_cache.YFinanceProvider()
+        self.bar_length = bar_length(interval)
+        self.start = data_cache.period_start(lookback)
+        self.last_ts = {}
+
+    def bars(self):
+        while not self._closed.is_set():
+            started = time.monotonic()
+            for ticker in self.tickers:
+                try:
+                    df = self.provider.fetch(ticker, interval=self.interval,
+                                             start=self.last_ts.get(ticker, self.start))
+                except Exception as e:
+                    print(f"⚠️ Besleme hatası ({ticker}): {e}")
+                    continue
+                if df.empty:
+                    continue
+                now = pd.Timestamp.now(tz=df.index.tz) if df.index.tz is not None else pd.Timestamp.now()
+                last = self.last_ts.get(ticker)
+                fresh = df[(df.index + self.bar_length <= now) & ((df.index > last) if last is not None else True)]
+                for event in _frame_events(ticker, fresh):
+                    ts, ticker_, o, h, l, c, v = event
+                    yield BarEvent(ticker_, ts, o, h, l, c, v, time.perf_counter())
+                if len(fresh):
+                    self.last_ts[ticker] = fresh.index[-1]
+            self._closed.wait(max(self.poll_seconds - (time.monotonic() - started), 0))
+
+
+# --- MOTOR ---
+class TickerState:
+    """Hisse başına akış durumu: artımlı göstergeler + LSTM penceresi için son kapanışlar."""
+
+    def __init__(self, engine=None, closes=()):
+        self.engine = engine or IndicatorEngine()
+        # 60 günlük % değişim penceresi için 61 kapanış gerekir
+        self.closes = deque(closes, maxlen=ai_engine.LOOKBACK + 1)
+        self.last_ts = None
+        self.sentiment = 0.0
+        self.risky_news = None
+
+    def update(self, bar):
+        self.closes.append(bar.close)
+        self.last_ts = bar.ts
+        return self.engine.update(bar.close)
+
+    @property
+    def ready(self):
+        return len(self.closes) == self.closes.maxlen
+
+
+class StreamEngine:
+    """
+    Besleme -> sınırlı kuyruk -> mikro-batch tahmin -> karar.
+
+    Args:
+        model, scaler: ai_engine.load_models çıktısı (LSTM + scaler)
+        on_decision: Her karar için çağrılır (dict). Verilmezse kararlar sadece sayılır.
+        queue_size: Kuyruk sınırı; dolduğunda besleme iş parçacığı bekler (backpressure)
+        max_batch, max_wait: Bar kapanışı / batch kuralları (modül açıklamasına bakın)
+    """
+
+    def __init__(self, model, scaler, on_decision=None, queue_size=QUEUE_SIZE,
+                 max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.model, self.scaler = model, scaler
+        self.on_decision = on_decision
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.states = {}
+        self.tickers = set()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # bar -> karar (sn)
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self.predict_times = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {'bars': 0, 'decisions': 0, 'batches': 0, 'late_bars': 0, 'warming': 0,
+                      'queue_max': 0, 'producer_wait_s': 0.0}
+        self._producer = None
+        self._error = None
+
+    # --- Hazırlık ---
+    def warm_up(self, histories):
+        """
+        Geçmiş barlarla göstergeleri ve pencereleri ısıtır: {ticker: OHLCV DataFrame}.
+        Isınmayan hisse de abone olabilir; 61 kapanış birikene kadar karar üretilmez.
+        """
+        for ticker, df in histories.items():
+            closes = df['Close'].to_numpy(dtype=float)
+            state = TickerState(IndicatorEngine.from_history(closes), closes[-(ai_engine.LOOKBACK + 1):])
+            state.last_ts = df.index[-1] if len(df) else None
+            self.states[str(ticker).upper()] = state
+
+    def set_sentiment(self, ticker, score, risky_news=None):
+        """Haber duygusu dışarıdan (örn. periyodik score_news) güncellenir; kararlara katılır."""
+        state = self.states.setdefault(str(ticker).upper(), TickerState())
+        state.sentiment, state.risky_news = score, risky_news
+
+    # --- Üretici (besleme iş parçacığı) ---
+    def _produce(self, feed):
+        try:
+            for bar in feed.bars():
+                t0 = time.perf_counter()
+                self.queue.put(bar)  # Kuyruk doluysa burada bekler (backpressure)
+                waited = time.perf_counter() - t0
+                if waited > 1e-4:
+                    self.stats['producer_wait_s'] += waited
+        except Exception as e:
+            self._error = e
+        finally:
+            self.queue.put(_END)
+
+    # --- Tüketici ---
+    def run(self, feed, max_bars=None):
+        """
+        Beslemeyi ayrı bir iş parçacığında başlatır ve olayları bu iş parçacığında işler.
+        Besleme bittiğinde (ya da max_bars bar işlendiğinde) döner.
+        """
+        self.tickers = set(feed.tickers)
+        for ticker in self.tickers:
+            self.states.setdefault(ticker, TickerState())
+        self._producer = threading.Thread(target=self._produce, args=(feed,), daemon=True, name="bar-feed")
+        self._producer.start()
+
+        batch, seen, batch_ts, deadline = {}, set(), None, None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+                try:
+                    bar = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    bar = None                       # Eksik hisseler beklenmez
+                # Bar kapandı: max_wait doldu, besleme bitti ya da daha yeni bir zaman damgası geldi
+                if batch_ts is not None and (bar is None or bar is _END or bar.ts > batch_ts):
+                    self._flush(batch)
+                    batch, seen, batch_ts, deadline = {}, set(), None, None
+                if bar is _END:
+                    break
+                if bar is None:
+                    continue
+
+                self.stats['queue_max'] = max(self.stats['queue_max'], self.queue.qsize() + 1)
+                self._on_bar(bar, batch)
+                seen.add(bar.ticker)
+                if batch_ts is None:
+                    batch_ts, deadline = bar.ts, time.perf_counter() + self.max_wait
+                if len(seen) >= len(self.tickers) or len(batch) >= self.max_batch:
+                    self._flush(batch)               # Tüm aboneler geldi (ya da batch doldu)
+                    batch, seen, batch_ts, deadline = {}, set(), None, None
+                if max_bars is not None and self.stats['bars'] >= max_bars:
+                    break
+            self._flush(batch)
+        finally:
+            feed.close()
+            # Üretici kuyrukta bekliyorsa serbest kalsın
+            while self._producer.is_alive():
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    self._producer.join(0.01)
+        if self._error is not None:
+            raise self._error
+        return self.get_stats()
+
+    def _on_bar(self, bar, batch):
+        """Göstergeleri günceller ve hisseyi bu barın batch'ine ekler."""
+        state = self.states.get(bar.ticker)
+        if state is None:
+            return
+        self.stats['bars'] += 1
+        if state.last_ts is not None and bar.ts <= state.last_ts:
+            self.stats['late_bars'] += 1   # Tekrar / geç gelen bar: durumu bozmasın
+            return
+        state.update(bar)
+        if not state.ready:
+            self.stats['warming'] += 1
+            return
+        batch[bar.ticker] = bar
+
+    def _flush(self, batch):
+        """Batch'teki tüm hisseler için TEK predict çağrısı + kararlar."""
+        if not batch:
+            return
+        tickers = list(batch)
+        for i in range(0, len(tickers), self.max_batch):
+            part = tickers[i:i + self.max_batch]
+            closes = np.array([self.states[t].closes for t in part], dtype=float)
+            # pandas pct_change ile aynı işlem: c[i] / c[i-1] - 1
+            windows = closes[:, 1:] / closes[:, :-1] - 1
+            t0 = time.perf_counter()
+            paths = ai_engine.predict_from_windows(self.model, self.scaler, windows, closes[:, -1])
+            self.predict_times.append(time.perf_counter() - t0)
+            self.batch_sizes.append(len(part))
+            self.stats['batches'] += 1
+
+            for ticker, preds in zip(part, paths):
+                state, bar = self.states[ticker], batch[ticker]
+                rsi = state.engine.last['RSI']
+                decision, color, explanation = ai_engine.make_final_decision(
+                    list(preds), state.sentiment, state.risky_news, rsi)
+                done = time.perf_counter()
+                self.latencies.append(done - bar.t_feed)
+                self.stats['decisions'] += 1
+                if self.on_decision is not None:
+                    self.on_decision({
+                        'ticker': ticker, 'ts': bar.ts, 'price': bar.close, 'rsi': rsi,
+                        'preds': list(preds), 'decision': decision, 'color': color,
+                        'explanation': explanation, 'latency_ms': 1000 * (done - bar.t_feed),
+                        'batch_size': len(part),
+                    })
+
+    def get_stats(self):
+        """Sayaçlar + bar->karar gecikme yüzdelikleri (ms) ve batch istatistikleri."""
+        stats = dict(self.stats)
+        lat = np.asarray(self.latencies) * 1000
+        for p in (50, 95, 99):
+            stats[f'latency_p{p}_ms'] = float(np.percentile(lat, p)) if len(lat) else 0.0
+        stats['latency_max_ms'] = float(lat.max()) if len(lat) else 0.0
+        stats['avg_batch'] = float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0
+        stats['avg_predict_ms'] = 1000 * float(np.mean(self.predict_times)) if self.predict_times else 0.0
+        return stats
+
+
+def synthetic_frames(n_tickers, n_bars, freq="1min", seed=0):
+    """Ölçümler için rastgele yürüyüş OHLCV (hisse başına aynı zaman damgaları)."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2026-01-05 09:30', periods=n_bars, freq=freq)
+    frames = {}
+    for k in range(n_tickers):
+        close = 50 * np.cumprod(1 + rng.normal(0, 0.002, n_bars)) * (1 + k % 7)
+        frames[f"T{k:04d}"] = pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999,
+                                            'Close': close, 'Volume': 1000.0}, index=index)
+    return frames
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Akış modu: bar olayları -> mikro-batch LSTM -> karar")
+    parser.add_argument("--tickers", nargs="+", help="Hisse kodları (--data-dir ile)")
+    parser.add_argument("--data-dir", help="Yerel OHLCV dosyaları (yeniden oynatma)")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="N sentetik hisse ile oynat")
+    parser.add_argument("--warmup", type=int, default=ai_engine.LOOKBACK + 40, help="Isınma için kullanılacak bar sayısı")
+    parser.add_argument("--bars", type=int, default=30, help="Sentetik modda oynatılacak bar sayısı")
+    parser.add_argument("--bar-seconds", type=float, default=0.0, help="Bar aralığı (0 = beklemeden)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--lstm-backend", choices=["keras", "numpy"])
+    parser.add_argument("--live", action="store_true", help="yfinance'i periyodik sorgula (PollingFeed)")
+    parser.add_argument("--poll-seconds", type=float, default=60.0)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Her kararı yazdır")
+    args = parser.parse_args()
+
+    if args.lstm_backend:
+        ai_engine.LSTM_BACKEND = args.lstm_backend
+    model, scaler, _ = ai_engine.load_models(with_sentiment=False)
+    if model is None or scaler is None:
+        raise SystemExit("🚨 Model yüklenemedi.")
+
+    if args.synthetic:
+        frames = synthetic_frames(args.synthetic, args.warmup + args.bars)
+    elif args.data_dir:
+        frames = ReplayFeed.from_dir(args.data_dir, args.tickers or [], args.interval).frames
+    else:
+        frames = {}
+
+    on_decision = (lambda d: print(f"{d['ts']} {d['ticker']:6} {d['price']:>10.2f} {d['decision']:16} "
+                                   f"{d['latency_ms']:.1f} ms")) if args.verbose else None
+    engine = StreamEngine(model, scaler, on_decision, queue_size=args.queue_size, max_batch=args.max_batch)
+    if args.live:
+        engine.warm_up(frames)
+        feed = PollingFeed(args.interval, args.poll_seconds)
+        feed.subscribe(args.tickers or list(frames))
+    else:
+        engine.warm_up({t: df.iloc[:args.warmup] for t, df in frames.items()})
+        feed = ReplayFeed({t: df.iloc[args.warmup:] for t, df in frames.items()}, args.bar_seconds)
+    print(f"📡 Akış başladı: {len(feed.tickers)} hisse ({feed.name})")
+
+    t0 = time.perf_counter()
+    try:
+        stats = engine.run(feed)
+    except KeyboardInterrupt:
+        stats = engine.get_stats()
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {stats['bars']} bar, {stats['decisions']} karar, {stats['batches']} batch "
+          f"(ort. {stats['avg_batch']:.0f} hisse, tahmin {stats['avg_predict_ms']:.1f} ms) | {elapsed:.2f} sn")
+    print(f"⏱️ Bar -> Karar: p50 {stats['latency_p50_ms']:.1f} ms | p95 {stats['latency_p95_ms']:.1f} ms | "
+          f"p99 {stats['latency_p99_ms']:.1f} ms | maks {stats['latency_max_ms']:.1f} ms")
+    print(f"📦 Kuyruk tepe: {stats['queue_max']} | Besleme bekleme (backpressure): {stats['producer_wait_s']:.2f} sn")
@@ -0,0 +1,325 @@
+"""
+Telemetri: Sıcak yolların süre, çağrı sayısı, önbellek isabeti ve bellek ölçümü.
+
+Kayıtlar süreç içi, kilitli ve hafiftir (çağrı başına birkaç mikrosaniye):
+  - Aralık (span): Her ad için son SPAN_WINDOW sürenin kayan penceresi -> p50 / p95 / p99,
+    toplam çağrı / hata sayısı, son çağrının durumu ve zamanı
+  - Bellek: Süreç RSS'i ve tepe RSS (ru_maxrss). Sadece süreç geneli raporlanır: Aşamalar
+    eşzamanlı çalıştığından (run_stages) tepe artışı tek bir aralığa güvenilir biçimde atanamaz
+  - Önbellekler: Modüller kendi get_stats fonksiyonlarını register_cache ile kaydeder;
+    isabet oranları anlık görüntü (snapshot) alınırken okunur
+
+Kullanım:
+    from neuro_modules import telemetry
+    with telemetry.span("inference"):
+        ...
+    @telemetry.timed("news_fetch")
+    def fetch(...): ...
+
+Dışa aktarım: snapshot() (dict), to_json(), to_prometheus() (metin formatı).
+NEUROQUANT_METRICS_PORT verilirse /metrics (Prometheus) ve /metrics.json arka planda
+bir HTTP sunucusundan yayınlanır.
+"""
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import contextlib
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- AYARLAR ---
+SPAN_WINDOW = int(os.environ.get("NEUROQUANT_TELEMETRY_WINDOW", 1000))   # Yüzdelik için son N ölçüm
+METRICS_PORT = int(os.environ.get("NEUROQUANT_METRICS_PORT", 0))          # 0: HTTP yayını kapalı
+METRICS_HOST = os.environ.get("NEUROQUANT_METRICS_HOST", "127.0.0.1")     # Dışarı açmak için: 0.0.0.0
+PERCENTILES = (50, 95, 99)
+PROMETHEUS_PREFIX = "neuroquant"
+
+
+def peak_rss_bytes():
+    """Sürecin şimdiye kadarki tepe RSS'i (bayt). Linux'ta KB, macOS'ta bayt döner."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def rss_bytes():
+    """Anlık RSS (bayt); /proc yoksa tepe değere düşer."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return peak_rss_bytes()
+
+
+def _percentile(sorted_values, q):
+    """Doğrusal aralıklı yüzdelik (numpy.percentile ile aynı), sıralı liste üzerinde."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class _SpanStats:
+    __slots__ = ('durations', 'calls', 'errors', 'total_s', 'max_s', 'last_at', 'last_ok')
+
+    def __init__(self, window):
+        self.durations = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_at = None
+        self.last_ok = True
+
+
+class Telemetry:
+    """Aralık süreleri, sayaçlar ve kayıtlı önbellek istatistikleri (iş parçacığı güvenli)."""
+
+    def __init__(self, window=SPAN_WINDOW):
+        self.window = window
+        self.started_at = time.time()
+        self._spans = {}
+        self._counters = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    # --- Kayıt ---
+    def observe(self, name, seconds, error=False):
+        """Tek bir ölçümü ekler (span kullanılamayan yerler için, örn: üreteçler)."""
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats(self.window)
+            stats.durations.append(seconds)
+            stats.calls += 1
+            stats.errors += bool(error)
+            stats.total_s += seconds
+            stats.max_s = max(stats.max_s, seconds)
+            stats.last_at = time.time()
+            stats.last_ok = not error
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Bloğun süresini 'name' altında kaydeder; istisna hata olarak sayılır ve yukarı iletilir."""
+        t0 = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - t0, error)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_cache(self, name, stats_fn):
+        """
+        Önbellek kaynağı ekler. stats_fn, 'hits' ve 'misses' (veya 'hit_rate') içeren bir
+        dict döndürmelidir; her anlık görüntüde çağrılır.
+        """
+        with self._lock:
+            self._caches[name] = stats_fn
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    # --- Okuma ---
+    def _cache_snapshot(self):
+        with self._lock:
+            sources = dict(self._caches)
+        caches = {}
+        for name, stats_fn in sources.items():
+            try:
+                stats = stats_fn()
+            except Exception:
+                continue  # Kaynak henüz kurulmamış (örn: Gemini istemcisi yok)
+            if not stats:
+                continue
+            hits, misses = stats.get('hits', 0), stats.get('misses', 0)
+            lookups = hits + misses
+            rate = stats.get('hit_rate', hits / lookups if lookups else 0.0)
+            caches[name] = {'hits': int(hits), 'misses': int(misses), 'hit_rate': float(rate)}
+        return caches
+
+    def snapshot(self):
+        """Tüm ölçümlerin JSON'a dönüştürülebilir kopyası (süreler ms)."""
+        with self._lock:
+            spans = {name: (sorted(s.durations), s.calls, s.errors, s.total_s, s.max_s,
+                            s.last_at, s.last_ok)
+                     for name, s in self._spans.items()}
+            counters = dict(self._counters)
+        span_rows = {}
+        for name, (durations, calls, errors, total_s, max_s, last_at, last_ok) in spans.items():
+            row = {'calls': calls, 'errors': errors, 'total_s': total_s, 'max_ms': 1000 * max_s,
+                   'last_at': last_at, 'last_ok': last_ok}
+            for q in PERCENTILES:
+                row[f'p{q}_ms'] = 1000 * _percentile(durations, q)
+            span_rows[name] = row
+        return {
+            'uptime_s': time.time() - self.started_at,
+            'memory': {'rss_mb': rss_bytes() / 2 ** 20, 'peak_rss_mb': peak_rss_bytes() / 2 ** 20},
+            'spans': span_rows,
+            'counters': counters,
+            'caches': self._cache_snapshot(),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """Prometheus metin formatı (aralıklar 'summary' olarak, saniye cinsinden)."""
+        snap = self.snapshot()
+        lines = [f"# HELP {prefix}_span_seconds Sıcak yol süreleri (son {self.window} ölçüm üzerinden yüzdelikler)",
+                 f"# TYPE {prefix}_span_seconds summary"]
+        for name, row in snap['spans'].items():
+            for q in PERCENTILES:
+                lines.append(f'{prefix}_span_seconds{{span="{name}",quantile="{q / 100:g}"}} {row[f"p{q}_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {row["total_s"]:.6f}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {row["calls"]}')
+        lines += [f"# TYPE {prefix}_span_errors_total counter"]
+        lines += [f'{prefix}_span_errors_total{{span="{name}"}} {row["errors"]}' for name, row in snap['spans'].items()]
+        if snap['counters']:
+            lines += [f"# TYPE {prefix}_events_total counter"]
+            lines += [f'{prefix}_events_total{{event="{name}"}} {value}' for name, value in snap['counters'].items()]
+        lines += [f"# TYPE {prefix}_cache_hit_ratio gauge"]
+        for name, row in snap['caches'].items():
+            lines.append(f'{prefix}_cache_hit_ratio{{cache="{name}"}} {row["hit_rate"]:.4f}')
+        lines += [f"# TYPE {prefix}_cache_lookups_total counter"]
+        for name, row in snap['caches'].items():
+            lines.append(f'{prefix}_cache_lookups_total{{cache="{name}",result="hit"}} {row["hits"]}')
+            lines.append(f'{prefix}_cache_lookups_total{{cache="{name}",result="miss"}} {row["misses"]}')
+        lines += [f"# TYPE {prefix}_process_rss_bytes gauge",
+                  f"{prefix}_process_rss_bytes {int(snap['memory']['rss_mb'] * 2 ** 20)}",
+                  f"# TYPE {prefix}_process_peak_rss_bytes gauge",
+                  f"{prefix}_process_peak_rss_bytes {int(snap['memory']['peak_rss_mb'] * 2 ** 20)}",
+                  f"# TYPE {prefix}_uptime_seconds gauge",
+                  f"{prefix}_uptime_seconds {snap['uptime_s']:.1f}"]
+        return "\n".join(lines) + "\n"
+
+
+# --- VARSAYILAN TOPLAYICI (süreç başına bir tane) ---
+_default = None
+_default_lock = threading.Lock()
+_server = None
+
+
+def get_telemetry():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Telemetry()
+        return _default
+
+
+def set_telemetry(telemetry):
+    """Varsayılan toplayıcıyı değiştirir (örn: ölçüm betiklerinde temiz bir örnekle)."""
+    global _default
+    with _default_lock:
+        _default = telemetry
+
+
+def span(name):
+    return get_telemetry().span(name)
+
+
+def timed(name):
+    """Dekoratör; toplayıcı çağrı anında çözülür (set_telemetry sonrası da geçerli)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_telemetry().span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe(name, seconds, error=False):
+    get_telemetry().observe(name, seconds, error)
+
+
+def count(name, value=1):
+    get_telemetry().count(name, value)
+
+
+def register_cache(name, stats_fn):
+    get_telemetry().register_cache(name, stats_fn)
+
+
+def start_metrics_server(port=None, host=None):
+    """
+    /metrics (Prometheus) ve /metrics.json uçlarını arka plan iş parçacığında yayınlar.
+    Süreç başına bir kez kurulur; port verilmez ve NEUROQUANT_METRICS_PORT yoksa bir şey yapmaz.
+    Varsayılan olarak sadece yerel arayüze bağlanır (NEUROQUANT_METRICS_HOST).
+    """
+    global _server
+    port = port or METRICS_PORT
+    host = host or METRICS_HOST
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/metrics.json'):
+                body, ctype = get_telemetry().to_json(), 'application/json'
+            elif self.path.startswith('/metrics'):
+                body, ctype = get_telemetry().to_prometheus(), 'text/plain; version=0.0.4'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', f'{ctype}; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # Her kazıma (scrape) isteği konsolu kirletmesin
+
+    with _default_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_server.serve_forever, daemon=True, name="neuroquant-metrics").start()
+            print(f"📈 Telemetri yayında: http://{host}:{port}/metrics")
+        return _server
+
+
+if __name__ == "__main__":
+    # --- TEST BLOĞU: Sahte iş yükü, yüzdelikler ve Prometheus çıktısı ---
+    import random
+    tel = Telemetry()
+    for i in range(200):
+        with tel.span("inference"):
+            time.sleep(random.uniform(0.0005, 0.003))
+    try:
+        with tel.span("news_fetch"):
+            raise TimeoutError("örnek hata")
+    except TimeoutError:
+        pass
+    tel.register_cache("demo", lambda: {'hits': 30, 'misses': 10})
+    row = tel.snapshot()['spans']['inference']
+    print(f"⏱️ inference: {row['calls']} çağrı | p50 {row['p50_ms']:.2f} ms | p95 {row['p95_ms']:.2f} ms | "
+          f"p99 {row['p99_ms']:.2f} ms")
+    memory = tel.snapshot()['memory']
+    print(f"🧠 RSS: {memory['rss_mb']:.0f} MB (tepe {memory['peak_rss_mb']:.0f} MB)")
+    print(tel.to_prometheus())
@@ -1,6 +1,178 @@
+import os
 import streamlit as st
 import plotly.graph_objects as go
+import time
 import textwrap
+import numpy as np
+import pandas as pd
+from neuro_modules.downsample import lttb_indices
+from neuro_modules import telemetry
+
+# --- GRAFİK AYARLARI ---
+# auto: Bütçeyi aşan (uzun geçmişli) figürlerde WebGL (Scattergl), kısalarda SVG
+# webgl / svg: Her zaman o mod. Not: Tarayıcılar sayfa başına sınırlı WebGL bağlamı açar,
+# kısa grafikleri SVG'de bırakmak bu yüzden de mantıklı.
+CHART_MODE = os.environ.get("NEUROQUANT_CHART_MODE", "auto").lower()
+CHART_MAX_POINTS = int(os.environ.get("NEUROQUANT_CHART_POINTS", 3000))  # Figür başına toplam nokta
+# Görünür aralık seçenekleri (takvim günü, None = tüm veri)
+CHART_WINDOWS = {"1A": 30, "3A": 91, "6A": 182, "1Y": 365, "Tümü": None}
+# Sistem Durumu paneli kendini bu aralıkla (sn) yeniler; 0: sadece sayfa yeniden çizilince
+STATUS_REFRESH = float(os.environ.get("NEUROQUANT_STATUS_REFRESH", 15))
+
+def _is_per_point(value, n):
+    """Nokta başına değer taşıyan dizi mi (renk listesi, metin vb.)?"""
+    return value is not None and not isinstance(value, (str, dict)) and np.ndim(value) == 1 and len(value) == n
+
+
+def _epoch_ms(x):
+    """
+    Tarih eksenini epoch milisaniyeye (float64) çevirir; tarih değilse None.
+    Sayı dizisi JSON'a base64 ikili olarak gider (ISO metnin ~yarısı). plotly.js ISO
+    metindeki saat dilimini yok saydığı için duvar saati korunur.
+    """
+    x = np.asarray(x)
+    if x.dtype == object and len(x) and isinstance(x[0], pd.Timestamp):
+        x = pd.DatetimeIndex(x).tz_localize(None).to_numpy()
+    if not np.issubdtype(x.dtype, np.datetime64):
+        return None
+    return x.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+
+
+def _take(props, idx, n):
+    """İzin nokta başına alanlarını (x, y, metin, renk) verilen indekslere indirger."""
+    for key in ('x', 'y', 'text', 'hovertext', 'customdata'):
+        if _is_per_point(props.get(key), n):
+            props[key] = np.asarray(props[key])[idx]
+    marker = props.get('marker')
+    if marker and _is_per_point(marker.get('color'), n):
+        props['marker'] = {**marker, 'color': np.asarray(marker['color'])[idx]}
+
+
+def _linked_groups(traces, lengths):
+    """
+    'tonexty' / 'tonextx' ile bir öncekine bağlı (aynı x'li) izleri gruplar.
+    Dolgu poligonu iki izin noktalarından kurulur; ayrı ayrı seyreltilirlerse kenarlar kayar.
+    """
+    groups = []
+    for i, props in enumerate(traces):
+        prev = groups[-1][-1] if groups else None
+        if (prev is not None and props.get('fill') in ('tonexty', 'tonextx') and lengths[i] == lengths[prev]
+                and lengths[i] and np.array_equal(np.asarray(props['x']), np.asarray(traces[prev]['x']))):
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
+def budget_figure(fig, max_points=CHART_MAX_POINTS, mode=CHART_MODE):
+    """
+    Figürü nokta bütçesine indirir ve çizim modunu (SVG / WebGL) seçer.
+
+    - Bütçe izler arasında paylaştırılır: Kısa izlerin kullanmadığı pay uzunlara kalır.
+    - Bütçeyi aşan her iz LTTB ile seyreltilir (tepe / dip korunur). Dolguyla bağlı izler
+      (örn: Bollinger üst / alt bant) TEK indeks kümesiyle seyreltilir: Üyelerin LTTB
+      seçimlerinin birleşimi hepsine uygulanır.
+    - Scatter izleri gerekirse Scattergl'e çevrilir (Bar'ın WebGL karşılığı yok, SVG kalır).
+    - Tarih ekseni epoch ms olarak gönderilir (eksen tipi 'date' sabitlenir).
+    """
+    traces = [t.to_plotly_json() for t in fig.data]
+    lengths = [len(t['x']) if t.get('x') is not None else 0 for t in traces]
+    total = sum(lengths)
+    use_gl = mode == "webgl" or (mode == "auto" and total > max_points)
+    if total <= max_points and not use_gl:
+        return fig
+
+    # Kısadan uzuna: Her iz kalan bütçenin eşit payını alır, artanı sonrakilere devreder
+    shares, left = {}, max_points
+    order = sorted(range(len(traces)), key=lambda i: lengths[i])
+    for k, i in enumerate(order):
+        shares[i] = min(lengths[i], left // (len(order) - k))
+        left -= shares[i]
+
+    dates = False
+    for i, props in enumerate(traces):
+        epoch = _epoch_ms(props['x']) if lengths[i] else None
+        if epoch is not None:
+            props['x'], dates = epoch, True
+
+    for group in _linked_groups(traces, lengths):
+        n, share = lengths[group[0]], sum(shares[i] for i in group)
+        members = [i for i in group if traces[i].get('y') is not None]
+        if n > share and members:
+            # Birleşim kümesi gruptaki HER ize uygulanır: İz başına pay share / len(group)
+            per_member = max(share // (len(group) * len(members)), 3)
+            idx = np.unique(np.concatenate([lttb_indices(traces[i]['x'], traces[i]['y'], per_member)
+                                            for i in members]))
+            for i in group:
+                _take(traces[i], idx, n)
+
+    for props in traces:
+        if use_gl and props.get('type') == 'scatter':
+            props['type'] = 'scattergl'
+    # İzler zaten doğrulanmış figürden geliyor: Yeniden doğrulama (binlerce renk) atlanır
+    budgeted = go.Figure(data=traces, layout=fig.layout, _validate=False)
+    if dates:
+        budgeted.update_xaxes(type='date')
+    return budgeted
+
+
+def visible_range(df, window):
+    """Görünür aralık: Son 'window' takvim günü (CHART_WINDOWS anahtarı ya da gün sayısı)."""
+    days = CHART_WINDOWS.get(window, window) if isinstance(window, str) else window
+    if not days or df.empty:
+        return df
+    return df[df.index >= df.index[-1] - pd.Timedelta(days=days)]
+
+
+def render_range_selector(key="chart_range", default="1Y"):
+    """Grafiklerin görünür aralığını seçtirir; seyreltme bütçesi bu aralığa uygulanır."""
+    options = list(CHART_WINDOWS)
+    return st.radio("Görünür Aralık", options, index=options.index(default), horizontal=True, key=key)
+
+
+def _status_badge(label, row, ok_text):
+    """Bir aralığın son çağrısına göre durum rozeti (hiç çağrılmadıysa bilgi)."""
+    if row is None:
+        st.info(f"⏳ {label}: Henüz çalışmadı")
+    elif row['last_ok']:
+        ago = time.time() - row['last_at']
+        st.success(f"✅ {label}: {ok_text} ({ago:.0f} sn önce)")
+    else:
+        st.error(f"🚨 {label}: Son çağrı başarısız ({row['errors']}/{row['calls']} hata)")
+
+
+def _system_status():
+    """Telemetri anlık görüntüsü: Durum rozetleri, aşama yüzdelikleri, önbellekler, bellek."""
+    tel = telemetry.get_telemetry()
+    snap = tel.snapshot()
+    spans = snap['spans']
+    _status_badge("AI Motoru", spans.get('model_load.lstm'), "Aktif")
+    feed = [spans[name] for name in ('data_fetch', 'news_fetch') if name in spans]
+    _status_badge("Veri Akışı", max(feed, key=lambda r: r['last_at']) if feed else None, "Online")
+
+    if spans:
+        rows = [{"Aşama": name, "Çağrı": row['calls'], "p50 (ms)": round(row['p50_ms'], 1),
+                 "p95 (ms)": round(row['p95_ms'], 1), "p99 (ms)": round(row['p99_ms'], 1),
+                 "Hata": row['errors']}
+                for name, row in sorted(spans.items(), key=lambda kv: -kv[1]['total_s'])]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    caches = [f"{name} %{row['hit_rate'] * 100:.0f}" for name, row in snap['caches'].items()
+              if row['hits'] + row['misses']]
+    if caches:
+        st.caption("Önbellek isabeti: " + " · ".join(caches))
+    memory = snap['memory']
+    st.caption(f"Bellek: {memory['rss_mb']:.0f} MB (tepe {memory['peak_rss_mb']:.0f} MB) · v2.1 Stable")
+
+    col1, col2 = st.columns(2)
+    col1.download_button("JSON", data=tel.to_json, file_name="neuroquant_metrics.json",
+                         mime="application/json", key="metrics_json", use_container_width=True)
+    col2.download_button("Prometheus", data=tel.to_prometheus, file_name="neuroquant_metrics.prom",
+                         mime="text/plain", key="metrics_prom", use_container_width=True)
+
+
+# Panel açıkken kendi kendine yenilensin (sayfanın geri kalanı yeniden çalışmaz)
+render_system_status = st.fragment(run_every=STATUS_REFRESH)(_system_status) if STATUS_REFRESH else _system_status
+
 
 def render_sidebar():
     """Yan menüyü çizer (GÜNCELLENDİ: Watchlist Eklendi)."""
@@ -45,9 +217,7 @@ def render_sidebar():
         
         st.markdown("---")
         with st.expander("ℹ️ Sistem Durumu"):
-            st.success("✅ AI Motoru: Aktif")
-            st.success("✅ Veri Akışı: Online")
-            st.info("v2.1 Stable")
+            render_system_status()
             
         return ticker, analyze_btn
 
@@ -86,8 +256,18 @@ def render_veto_warning(risky_news):
         st.markdown(f"👉 **[{risky_news['title']}]({risky_news['link']})**")
         st.markdown("---")
 
-def render_chart(history_df, future_prices):
-    """Geçmiş ve Gelecek grafiğini çizer (ZOOM YAPILMIŞ HALİ)."""
+def _add_band(fig, x, last_price, upper, lower, name, color):
+    """İki yüzdelik arasını doldurur (üst çizgi görünmez, alt çizgi 'tonexty')."""
+    fig.add_trace(go.Scatter(x=x, y=[last_price] + list(upper), mode='lines', line=dict(width=0),
+                             hoverinfo='skip', showlegend=False))
+    fig.add_trace(go.Scatter(x=x, y=[last_price] + list(lower), mode='lines', line=dict(width=0),
+                             fill='tonexty', fillcolor=color, name=name, hoverinfo='skip'))
+
+def render_chart(history_df, future_prices, scenarios=None):
+    """
+    Geçmiş ve Gelecek grafiğini çizer (ZOOM YAPILMIŞ HALİ).
+    'scenarios' (ai_engine.forecast_scenarios çıktısı) verilirse Monte Carlo bantları da çizilir.
+    """
     st.subheader("📈 Fiyat Projeksiyonu (LSTM)")
     
     fig = go.Figure()
@@ -111,6 +291,14 @@ def render_chart(history_df, future_prices):
     chart_y = [history_df['Close'].iloc[-1]] + list(future_prices)
     chart_x = [last_date] + list(future_dates)
     
+    # Belirsizlik Bantları (Dış: %5-95, İç: %25-75) - tahmin çizgisinin altında kalsın
+    if scenarios:
+        bands = scenarios['bands']
+        for lo, hi, alpha in ((5, 95, 0.15), (25, 75, 0.30)):
+            if lo in bands and hi in bands:
+                _add_band(fig, chart_x, chart_y[0], bands[hi], bands[lo],
+                          f"Senaryo %{lo}-{hi}", f"rgba(230, 126, 34, {alpha})")
+    
     fig.add_trace(go.Scatter(
         x=chart_x,
         y=chart_y,
@@ -130,38 +318,33 @@ def render_chart(history_df, future_prices):
         yaxis=dict(fixedrange=True, title="Fiyat ($)")
     )
     
+    fig = budget_figure(fig)
     st.plotly_chart(fig, use_container_width=True, config={'staticPlot': False, 'scrollZoom': False})
+    if scenarios:
+        st.caption(f"Bantlar: {scenarios['n_scenarios']} senaryo, son {scenarios['n_residuals']} tahminin "
+                   f"hatalarından (bootstrap). Geçmiş hata dağılımını yansıtır, garanti değildir.")
     
-# Imports inside chart function to avoid circular dependency if needed, 
-# but putting them at top is fine for now.
-import pandas as pd
-
 # --- MEVCUT KODLARIN ALTINA EKLE ---
 
-def render_technical_charts(df):
-    """Teknik Analiz Sekmesi: RSI ve Hacim Grafikleri."""
-    
-    # 1. Hacim (Volume) Grafiği
-    st.subheader("📊 İşlem Hacmi (Volume)")
-    
-    # Renkleri belirle: Kapanış > Açılış ise Yeşil, değilse Kırmızı
-    colors = ['#2ecc71' if c >= o else '#e74c3c' for c, o in zip(df['Close'], df['Open'])]
-    
-    fig_vol = go.Figure(data=[go.Bar(
-        x=df.index[-30:], # Son 30 gün
-        y=df['Volume'].tail(30),
-        marker_color=colors
-    )])
-    
-    fig_vol.update_layout(height=250, margin=dict(t=10, b=10, l=10, r=10), xaxis=dict(fixedrange=True), yaxis=dict(fixedrange=True))
-    st.plotly_chart(fig_vol, use_container_width=True, config={'staticPlot': False, 'scrollZoom': False})
-    
-    # 2. RSI Grafiği
-    st.subheader("📉 RSI Momentum (70=Pahalı, 30=Ucuz)")
-    
+def build_volume_figure(df):
+    """
+    Hacim çubukları: Kapanış >= Açılış yeşil, değilse kırmızı (bütçe uygulanmış).
+    Renk başına bir iz: Nokta başına renk listesi hem yükü hem doğrulamayı büyütüyordu.
+    """
+    up = (df['Close'] >= df['Open']).to_numpy()
+    fig_vol = go.Figure()
+    for mask, color in ((up, '#2ecc71'), (~up, '#e74c3c')):
+        fig_vol.add_trace(go.Bar(x=df.index[mask], y=df['Volume'].to_numpy()[mask],
+                                 marker_color=color, showlegend=False))
+    fig_vol.update_layout(height=250, barmode='overlay', margin=dict(t=10, b=10, l=10, r=10),
+                          xaxis=dict(fixedrange=True), yaxis=dict(fixedrange=True))
+    return budget_figure(fig_vol)
+
+def build_rsi_figure(df):
+    """RSI + 30 / 70 referans çizgileri (bütçe uygulanmış)."""
     fig_rsi = go.Figure(data=[go.Scatter(
-        x=df.index[-30:],
-        y=df['RSI'].tail(30),
+        x=df.index,
+        y=df['RSI'],
         mode='lines',
         line=dict(color='#9b59b6', width=2),
         name='RSI'
@@ -173,7 +356,50 @@ def render_technical_charts(df):
     
     fig_rsi.update_layout(height=250, margin=dict(t=10, b=10, l=10, r=10), 
                           yaxis=dict(range=[0, 100], fixedrange=True), xaxis=dict(fixedrange=True))
-    st.plotly_chart(fig_rsi, use_container_width=True, config={'staticPlot': False, 'scrollZoom': False})
+    return budget_figure(fig_rsi)
+
+def render_technical_charts(df, lookback=None):
+    """
+    Teknik Analiz Sekmesi: RSI ve Hacim Grafikleri.
+    Varsayılan: Gelen aralığın tamamı (app, Görünür Aralık seçimine göre keser); 'lookback' son N bar.
+    """
+    if lookback:
+        df = df.tail(lookback)
+    
+    # 1. Hacim (Volume) Grafiği
+    st.subheader("📊 İşlem Hacmi (Volume)")
+    st.plotly_chart(build_volume_figure(df), use_container_width=True, config={'staticPlot': False, 'scrollZoom': False})
+    
+    # 2. RSI Grafiği
+    st.subheader("📉 RSI Momentum (70=Pahalı, 30=Ucuz)")
+    st.plotly_chart(build_rsi_figure(df), use_container_width=True, config={'staticPlot': False, 'scrollZoom': False})
+
+def build_bollinger_figure(df):
+    """Bollinger Bantları + fiyat (bütçe uygulanmış)."""
+    fig_bb = go.Figure()
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Upper'], name='Üst Bant', line=dict(color='gray', width=1, dash='dot')))
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['BB_Lower'], name='Alt Bant', line=dict(color='gray', width=1, dash='dot'), fill='tonexty'))
+    fig_bb.add_trace(go.Scatter(x=df.index, y=df['Close'], name='Fiyat', line=dict(color='blue', width=2)))
+    fig_bb.update_layout(height=300, margin=dict(l=0,r=0,t=0,b=0))
+    return budget_figure(fig_bb)
+
+def build_macd_figure(df):
+    """MACD + sinyal çizgisi (bütçe uygulanmış)."""
+    fig_macd = go.Figure()
+    fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='green')))
+    fig_macd.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='Sinyal', line=dict(color='red')))
+    fig_macd.update_layout(height=200, margin=dict(l=0,r=0,t=0,b=0))
+    return budget_figure(fig_macd)
+
+def render_advanced_charts(df):
+    """Gelişmiş Teknik Analiz: Bollinger ve MACD (önceden app.py içindeydi)."""
+    # 1. Bollinger Grafiği
+    st.caption("Bollinger Bantları (Volatilite)")
+    st.plotly_chart(build_bollinger_figure(df), use_container_width=True)
+    
+    # 2. MACD Grafiği
+    st.caption("MACD (Trend Yönü)")
+    st.plotly_chart(build_macd_figure(df), use_container_width=True)
 
 def render_news_cards(news_list):
     """Haberleri sıkıcı liste yerine şık kartlar olarak gösterir."""
@@ -0,0 +1,171 @@
+"""
+NeuroQuant Tarayıcı (Screener) - Arayüzsüz, Çok Hisseli Karar Motoru.
+
+Bir hisse listesi dosyasındaki her hisse için uygulamadaki hattın aynısını çalıştırır:
+veri + indikatörler -> LSTM tahmini (predict_future) -> haber duygusu (score_news)
+-> karar (make_final_decision). İş, süreç havuzuna dağıtılır; modeller her işçi
+süreçte BİR KEZ yüklenir. Sonuçlar hisse başı aşama süreleriyle birlikte sütunlu
+bir dosyaya (Parquet, ya da uzantı .csv ise CSV) yazılır.
+
+Kullanım:
+    python screener.py tickers.txt -o screen.parquet
+    python screener.py tickers.txt -o screen.parquet --workers 8 --lstm-backend numpy --quiet
+    python screener.py tickers.txt --data-dir ./ohlcv --no-news   # çevrimdışı (yerel OHLCV dosyaları)
+
+Hisse listesi: satır başına (veya virgülle ayrılmış) hisse kodu, '#' sonrası yorumdur.
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from neuro_modules import ai_engine, market_data, news_scraper, data_cache
+
+STAGES = ('data', 'news', 'predict', 'sentiment', 'decision')
+
+# --- İŞÇİ SÜREÇ DURUMU (her süreçte bir kez kurulur) ---
+_brains = None
+_options = {}
+
+
+def _init_worker(options):
+    """İşçi başlatıcı: modelleri ve (varsa) yerel veri kaynağını bir kez kurar."""
+    global _brains, _options
+    _options = options
+    if options.get('quiet'):
+        sys.stdout = open(os.devnull, 'w')
+    if options.get('data_dir'):
+        # Yerel barlar paylaşılan önbelleğe (uygulamanınkine) karışmasın
+        data_cache.set_default_cache(data_cache.local_file_cache(options['data_dir']))
+    _brains = ai_engine.load_models(with_sentiment=options['max_news'] > 0)
+
+
+def screen_ticker(ticker):
+    """Tek hisse için tüm hattı çalıştırır; hata olursa satır 'error' alanıyla döner."""
+    model, scaler, sentiment_pipe = _brains
+    row = {'ticker': ticker, 'worker_pid': os.getpid(), 'error': None}
+    timings = {}
+    t_start = time.perf_counter()
+
+    def timed(stage, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[stage] = time.perf_counter() - t0
+
+    try:
+        if model is None or scaler is None:
+            raise RuntimeError("LSTM modeli / scaler yüklenemedi")
+
+        df = timed('data', market_data.get_rich_market_data, ticker, _options['period'])
+        news_list = timed('news', news_scraper.get_google_news, ticker, _options['max_news']) \
+            if _options['max_news'] > 0 else []
+        preds = timed('predict', ai_engine.predict_future, model, scaler, df)
+        # FinBERT yoksa score_news nötr döner (0, "Nötr", None)
+        avg_sentiment, sentiment_label, risky_news = timed('sentiment', ai_engine.score_news, sentiment_pipe, news_list)
+        current_rsi = float(df['RSI'].iloc[-1])
+        decision, color, reason = timed('decision', ai_engine.make_final_decision,
+                                        preds, avg_sentiment, risky_news, current_rsi)
+
+        row.update({
+            'date': df.index[-1],
+            'price': float(df['Close'].iloc[-1]),
+            'rsi': current_rsi,
+            'macd': float(df['MACD'].iloc[-1]),
+            'forecast_5d': float(preds[-1]),
+            'expected_change_pct': float((preds[-1] - preds[0]) / preds[0] * 100),
+            'news_count': len(news_list),
+            'sentiment_score': float(avg_sentiment),
+            'sentiment_label': sentiment_label,
+            'riskiest_news': risky_news['title'] if risky_news else None,
+            'decision': decision,
+            'color': color,
+            'reason': reason,
+        })
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    for stage in STAGES:
+        row[f't_{stage}'] = timings.get(stage)
+    row['t_total'] = time.perf_counter() - t_start
+    return row
+
+
+def run_screen(tickers, workers=None, period="1y", max_news=10, data_dir=None, quiet=False, progress=True):
+    """
+    Hisse listesini süreç havuzunda tarar.
+
+    Returns:
+        pd.DataFrame: Hisse başına bir satır (girdi sırasıyla)
+    """
+    workers = workers or min(len(tickers), os.cpu_count() or 1) or 1
+    options = {'period': period, 'max_news': max_news, 'data_dir': data_dir, 'quiet': quiet}
+    # 'spawn': TensorFlow / torch çatallanmış (fork) süreçlerde güvenli değildir
+    context = multiprocessing.get_context('spawn')
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(options,)) as pool:
+        for i, row in enumerate(pool.map(screen_ticker, tickers), 1):
+            rows.append(row)
+            if progress:
+                status = row['decision'] if row['error'] is None else f"⚠️ {row['error']}"
+                print(f"[{i}/{len(tickers)}] {row['ticker']:8} {status}  ({row['t_total']:.2f} sn)")
+    return pd.DataFrame(rows)
+
+
+def save_results(df, path):
+    """Sonuçları uzantıya göre Parquet (varsayılan) veya CSV olarak yazar."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.lower().endswith('.csv'):
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tickers", help="Hisse listesi dosyası")
+    parser.add_argument("-o", "--output", default="screen_results.parquet")
+    parser.add_argument("--workers", type=int, help="İşçi süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--max-news", type=int, default=10)
+    parser.add_argument("--no-news", action="store_true", help="Haber çekme ve duygu analizini atla")
+    parser.add_argument("--data-dir", help="OHLCV'yi ağ yerine bu klasördeki dosyalardan oku")
+    parser.add_argument("--lstm-backend", choices=["keras", "numpy"], help="LSTM motoru (varsayılan: ortam ayarı)")
+    parser.add_argument("--quiet", action="store_true", help="İşçi süreçlerin ayrıntılı çıktısını gizle")
+    args = parser.parse_args()
+
+    # İşçiler ortam değişkenlerini devralır (ai_engine import anında okur)
+    if args.lstm_backend:
+        os.environ["NEUROQUANT_LSTM_BACKEND"] = args.lstm_backend
+
+    tickers = market_data.read_tickers(args.tickers)
+    if not tickers:
+        sys.exit("🚨 Hisse listesi boş.")
+    print(f"🔎 Tarama başlıyor: {len(tickers)} hisse")
+
+    t0 = time.perf_counter()
+    results = run_screen(tickers, workers=args.workers, period=args.period,
+                         max_news=0 if args.no_news else args.max_news,
+                         data_dir=args.data_dir, quiet=args.quiet)
+    elapsed = time.perf_counter() - t0
+    save_results(results, args.output)
+
+    ok = results['error'].isna()
+    print("-" * 60)
+    print(f"✅ {ok.sum()}/{len(results)} hisse tarandı | Toplam: {elapsed:.1f} sn | Çıktı: {args.output}")
+    if ok.any():
+        print(results.loc[ok, 'decision'].value_counts().to_string())
+        stage_cols = [f't_{s}' for s in STAGES]
+        print("⏱️ Ortalama aşama süreleri (sn):")
+        print(results.loc[ok, stage_cols].mean().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,129 @@
 import os
-import joblib
+from neuro_modules.compact_forest import load_forest, preferred_model_path
 import yfinance as yf
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
 
 # --- AYARLAR ---
 TEST_TICKERS = ['NVDA', 'BTC-USD'] # Hem hisse hem kripto ile test edelim
 LOOKBACK = 60
+PREDICT_DAYS = 5
 MODEL_PATH = 'models/universal_rf.pkl'
+COMPACT_PATH = 'models/universal_rf_compact'  # Varsa ve .pkl'den eski değilse tercih edilir (bellek eşlemeli)
 
-def test_model():
-    if not os.path.exists(MODEL_PATH):
+def _clean_ohlcv(df, ticker):
+    """yfinance çıktısını tek seviyeli OHLCV tablosuna indirger."""
+    cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+    if isinstance(df.columns, pd.MultiIndex):
+        try: df = df.xs(ticker, axis=1, level=1)
+        except: pass
+    return df[[c for c in cols if c in df.columns]]
+
+def _download_many(tickers, period):
+    """Tüm hisseleri TEK bir yf.download çağrısıyla çeker."""
+    raw = yf.download(tickers, period=period, interval="1d", progress=False, group_by='column')
+    frames = {}
+    for ticker in tickers:
+        # Kripto hafta sonu da işlem gördüğü için hisselerde boş satırlar oluşur.
+        df = _clean_ohlcv(raw, ticker).dropna(subset=['Close'])
+        if len(df) > LOOKBACK + PREDICT_DAYS:
+            frames[ticker] = df
+    return frames
+
+def build_eval_windows(pct_changes):
+    """
+    Kayan pencereleri (Sliding Window) kopyasız bir görünüm olarak kurar.
+    Eski döngüdeki 'for i in range(LOOKBACK, len - 5)' ile birebir aynı satırlar:
+    X[j] = pct[j : j+60], gerçekleşen = pct[j+60].
+    """
+    n = len(pct_changes) - LOOKBACK - PREDICT_DAYS
+    if n <= 0:
+        return np.empty((0, LOOKBACK)), np.empty(0)
+    X = sliding_window_view(pct_changes, LOOKBACK)[:n]
+    actuals = pct_changes[LOOKBACK:LOOKBACK + n]
+    return X, actuals
+
+def evaluate_frames(model, frames):
+    """
+    Birden çok hisseyi TEK bir model.predict çağrısıyla değerlendirir.
+    Tüm pencereler üst üste dizilir, sonuçlar hisse bazında geri bölünür.
+
+    Returns:
+        dict: ticker -> {'dates', 'predictions', 'actuals', 'win_rate'}
+    """
+    blocks, layout = [], []
+    for ticker, df in frames.items():
+        pct_changes = df['Close'].pct_change().fillna(0).values
+        X, actuals = build_eval_windows(pct_changes)
+        if len(X) == 0: continue
+        blocks.append(X)
+        layout.append((ticker, df.index[LOOKBACK:LOOKBACK + len(X)], actuals))
+
+    if not blocks:
+        return {}
+
+    # Tek toplu tahmin (5 günlük vektör veriyor, biz ilk güne bakalım)
+    pred_day_1 = model.predict(np.concatenate(blocks))[:, 0]
+
+    results, start = {}, 0
+    for ticker, dates, actuals in layout:
+        predictions = pred_day_1[start:start + len(actuals)]
+        start += len(actuals)
+        # YÖN DOĞRULUĞU: İkisi de pozitif veya ikisi de negatifse bildi demektir.
+        win_rate = np.mean(np.sign(predictions) == np.sign(actuals)) * 100
+        results[ticker] = {'dates': dates, 'predictions': predictions,
+                           'actuals': actuals, 'win_rate': win_rate}
+    return results
+
+def test_model(tickers=TEST_TICKERS, period="6mo", plot=True):
+    """
+    Modeli güncel veride test eder.
+    Varsayılan: Son 6 ay, 2 hisse, grafikli. Çok yıllı / çok hisseli tarama için:
+        test_model(tickers=[...], period="5y", plot=False)
+    """
+    path = preferred_model_path(COMPACT_PATH, MODEL_PATH)
+    if not os.path.exists(path):
         print("🚨 HATA: Model dosyası bulunamadı!")
         return
 
-    print("🧠 Model yükleniyor...")
-    model = joblib.load(MODEL_PATH)
-    
-    for ticker in TEST_TICKERS:
-        print(f"\n🔎 {ticker} İÇİN TEST BAŞLIYOR...")
-        
-        # Son 6 ayın verisini çekelim (Test için taze veri)
-        df = yf.download(ticker, period="6mo", interval="1d", progress=False)
-        
-        cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-        if isinstance(df.columns, pd.MultiIndex):
-            try: df = df.xs(ticker, axis=1, level=1)
-            except: pass
-        df = df[[c for c in cols if c in df.columns]]
-        
-        # Veriyi Hazırla (% Değişim)
-        prices = df['Close'].values
-        pct_changes = df['Close'].pct_change().fillna(0).values
-        
-        predictions = []
-        actuals = []
-        dates = []
-        
-        # Simülasyon Döngüsü
-        # Geçmiş 60 günü alıp, bir sonraki günü tahmin ettireceğiz
-        print("   ⏳ Simülasyon çalışıyor...")
-        for i in range(LOOKBACK, len(pct_changes) - 5):
-            # Modelin Girdisi: Geçmiş 60 gün
-            input_feat = pct_changes[i-LOOKBACK:i].reshape(1, -1)
-            
-            # Model Tahmini (5 günlük vektör veriyor, biz ilk güne bakalım)
-            pred_vector = model.predict(input_feat)[0]
-            pred_day_1 = pred_vector[0] # Yarınki değişim tahmini
-            
-            # Gerçekleşen (Yarınki gerçek değişim)
-            actual_day_1 = pct_changes[i]
-            
-            predictions.append(pred_day_1)
-            actuals.append(actual_day_1)
-            dates.append(df.index[i])
-            
-        # --- SONUÇLARI HESAPLA ---
-        predictions = np.array(predictions)
-        actuals = np.array(actuals)
-        
-        # 1. YÖN DOĞRULUĞU (Directional Accuracy)
-        # Eğer ikisi de pozitifse veya ikisi de negatifse bildi demektir.
-        correct_direction = np.sign(predictions) == np.sign(actuals)
-        win_rate = np.mean(correct_direction) * 100
-        
-        # 2. KAR TABLOSU (Kümülatif Getiri)
+    print(f"🧠 Model yükleniyor: {path}")
+    model = load_forest(path)
+
+    print(f"📡 {len(tickers)} hisse için veri çekiliyor ({period})...")
+    frames = _download_many(list(tickers), period)
+
+    print("   ⏳ Simülasyon çalışıyor (toplu tahmin)...")
+    results = evaluate_frames(model, frames)
+
+    for ticker, res in results.items():
+        print(f"\n🔎 {ticker} SONUÇLARI")
+
+        # KAR TABLOSU (Kümülatif Getiri)
         # Model "Al" (Pozitif) dediyse o günkü gerçek değişimi kazanırız.
-        strategy_returns = np.cumsum(np.where(predictions > 0, actuals, 0))
-        buy_hold_returns = np.cumsum(actuals)
-        
-        print(f"   🎯 Yön Bilme Oranı: %{win_rate:.2f}")
-        
+        strategy_returns = np.cumsum(np.where(res['predictions'] > 0, res['actuals'], 0))
+        buy_hold_returns = np.cumsum(res['actuals'])
+
+        print(f"   🎯 Yön Bilme Oranı: %{res['win_rate']:.2f}")
+
+        if not plot: continue
+
         # Grafiği Çiz
         plt.figure(figsize=(10, 5))
-        plt.plot(dates, strategy_returns, label='AI Stratejisi (Model)', color='green')
-        plt.plot(dates, buy_hold_returns, label='Al-Tut (Piyasa)', color='gray', linestyle='--')
+        plt.plot(res['dates'], strategy_returns, label='AI Stratejisi (Model)', color='green')
+        plt.plot(res['dates'], buy_hold_returns, label='Al-Tut (Piyasa)', color='gray', linestyle='--')
         plt.title(f"{ticker} - Yapay Zeka vs. Piyasa")
         plt.legend()
         plt.grid(True, alpha=0.3)
         plt.show()
 
 if __name__ == "__main__":
-    test_model()
\ No newline at end of file
+    # Örn: python test_universal.py --tickers NVDA AAPL MSFT --period 5y --no-plot
+    import argparse
+    parser = argparse.ArgumentParser(description="Universal RF modelini güncel veride test eder.")
+    parser.add_argument("--tickers", nargs="+", default=TEST_TICKERS)
+    parser.add_argument("--period", default="6mo")
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+    test_model(tickers=args.tickers, period=args.period, plot=not args.no_plot)
@@ -1,10 +1,20 @@
 import os
-import yfinance as yf
+import sys
+import time
 import numpy as np
 import pandas as pd
 import joblib
+import tracemalloc
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.ensemble import RandomForestRegressor
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path: sys.path.insert(0, BASE_DIR)
+from neuro_modules.compact_forest import export_forest
+from neuro_modules import data_cache
+from neuro_modules.market_data import read_tickers
 
 # --- AYARLAR ---
 TICKERS = ['NVDA', 'AAPL', 'MSFT', 'BTC-USD', 'SPY', 'TSLA', 'AMZN', 'GOOGL']
@@ -16,56 +26,152 @@ PREDICT_DAYS = 5
 # O verileri "Test" için saklayacağız.
 TEST_DAYS = 90 
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# --- İNDİRME AYARLARI ---
+TRAIN_START = "2022-01-01"
+DOWNLOAD_WORKERS = 8   # Aynı anda en fazla bu kadar hisse indirilir
+DOWNLOAD_RETRIES = 2   # Geçici hatalarda hisse başına yeniden deneme
+
 MODEL_DIR = os.path.join(BASE_DIR, 'models')
 if not os.path.exists(MODEL_DIR): os.makedirs(MODEL_DIR)
 
-def get_honest_data():
-    print(f"📡 Dürüst Eğitim Başlıyor: Veriler çekiliyor...")
-    all_X, all_y = [], []
+def download_bars(tickers=TICKERS, start=TRAIN_START, end=None, cache=None,
+                  max_workers=DOWNLOAD_WORKERS, retries=DOWNLOAD_RETRIES):
+    """
+    Ham günlük barları EŞZAMANLI indirir (en fazla max_workers iş parçacığı).
+
+    Her hisse, disk önbelleğine (neuro_modules/data_cache) [start, end) kapsamıyla yazılır.
+    Yarıda kalan bir çalışma tekrarlandığında önbellekteki hisseler ağa çıkmaz; sadece
+    eksik hisseler veya eksik tarih aralıkları (örn. ileri kayan zaman duvarı) çekilir.
+    Kaynak, önbelleğin sağlayıcısıdır (yfinance ya da LocalFileProvider gibi bir yedek).
+
+    Returns:
+        (frames, failed): {ticker: DataFrame} ve {ticker: hata mesajı}
+    """
+    cache = cache or data_cache.get_default_cache()
+
+    def fetch(ticker):
+        for attempt in range(retries + 1):
+            try:
+                df = cache.get(ticker, interval="1d", start=start, end=end)
+                break
+            except Exception:
+                if attempt == retries: raise
+                time.sleep(2 ** attempt)  # Geçici ağ hatalarında kısa bekleme
+        # Boş sonuç kalıcıdır (geçersiz ticker); yeniden denenmez
+        if df.empty: raise ValueError("Boş veri (Ticker'ı kontrol et)")
+        return df
+
+    frames, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fetch, ticker): ticker for ticker in tickers}
+        for done, future in enumerate(as_completed(futures), 1):
+            ticker = futures[future]
+            try:
+                frames[ticker] = future.result()
+            except Exception as e:
+                failed[ticker] = str(e)
+            if done % 100 == 0 or done == len(futures):
+                print(f"   📥 {done}/{len(futures)} hisse ({len(failed)} hatalı)")
+
+    # Sonuçlar girdi sırasıyla (eğitim seti satır sırası sabit kalsın)
+    return {t: frames[t] for t in tickers if t in frames}, failed
+
+def download_honest_series(tickers=TICKERS, cache=None, max_workers=DOWNLOAD_WORKERS):
+    """
+    Her hisse için Zaman Duvarı öncesindeki % değişim serisini indirir.
+    Her seri tek, bitişik (contiguous) bir float32 tampondur; pencereler
+    daha sonra bu tamponun üzerine kopyasız görünüm olarak açılır.
+
+    Returns:
+        dict: ticker -> np.ndarray (float32, 1D)
+    """
+    print(f"📡 Dürüst Eğitim Başlıyor: Veriler çekiliyor ({len(tickers)} hisse, {max_workers} paralel)...")
+    series = {}
     
     # Bitiş tarihini ayarla (Bugün - 90 gün)
     cutoff_date = datetime.now() - timedelta(days=TEST_DAYS)
     cutoff_str = cutoff_date.strftime('%Y-%m-%d')
     print(f"🛑 ZAMAN DUVARI: {cutoff_str} tarihinden sonrası EĞİTİME ALINMAYACAK.")
 
-    for ticker in TICKERS:
-        try:
-            # Sadece Cutoff tarihine kadar olan veriyi indir
-            # end=cutoff_str diyerek geleceği gizliyoruz
-            df = yf.download(ticker, start="2022-01-01", end=cutoff_str, progress=False, threads=False)
-            
-            cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-            if isinstance(df.columns, pd.MultiIndex):
-                try: df = df.xs(ticker, axis=1, level=1)
-                except: pass
-            
-            df = df[[c for c in cols if c in df.columns]]
-            
-            # Veri yetersizse geç
-            if len(df) < LOOKBACK + PREDICT_DAYS: continue
+    # Sadece Cutoff tarihine kadar olan veriyi indir
+    # end=cutoff_str diyerek geleceği gizliyoruz
+    frames, failed = download_bars(tickers, start=TRAIN_START, end=cutoff_str, cache=cache, max_workers=max_workers)
+    for ticker, error in failed.items():
+        print(f"   ⚠️ Hata {ticker}: {error}")
 
-            # % DEĞİŞİM (Evrenselleştirme)
-            df_pct = df.pct_change().dropna().replace([np.inf, -np.inf], 0)
-            data = df_pct['Close'].values 
+    verbose = len(frames) <= 50
+    for ticker, df in frames.items():
+        cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+        df = df[[c for c in cols if c in df.columns]]
+        
+        # Veri yetersizse geç
+        if len(df) < LOOKBACK + PREDICT_DAYS: continue
+
+        # % DEĞİŞİM (Evrenselleştirme)
+        df_pct = df.pct_change().dropna().replace([np.inf, -np.inf], 0)
+        series[ticker] = np.ascontiguousarray(df_pct['Close'].values, dtype=np.float32)
             
-            # Eğitim Setini Oluştur
-            for i in range(LOOKBACK, len(data) - PREDICT_DAYS):
-                all_X.append(data[i-LOOKBACK:i])
-                all_y.append(data[i:i+PREDICT_DAYS])
-                
-            print(f"   ✅ {ticker}: {len(data)} gün eklendi (Gelecek gizlendi).")
-        except Exception as e:
-            print(f"   ⚠️ Hata {ticker}: {e}")
-
-    if not all_X: raise ValueError("Veri Yok!")
-    return np.array(all_X), np.array(all_y)
-
-def train():
+        if verbose: print(f"   ✅ {ticker}: {len(series[ticker])} gün eklendi (Gelecek gizlendi).")
+
+    print(f"✅ {len(series)}/{len(tickers)} hisse hazır. Önbellek: {data_cache_stats(cache)}")
+    return series
+
+def data_cache_stats(cache=None):
+    stats = (cache or data_cache.get_default_cache()).get_stats()
+    return (f"{stats['hits']} isabet, {stats['partial_hits']} kısmi, {stats['misses']} yeni, "
+            f"{stats['incremental_fetches']} artımlı çekim, {stats['refetches']} düzeltme sonrası yeniden indirme")
+
+def window_count(data):
+    """Bir seriden çıkan eğitim senaryosu sayısı (eski döngüyle aynı)."""
+    return max(len(data) - LOOKBACK - PREDICT_DAYS, 0)
+
+def build_windows(series):
+    """
+    Eğitim Setini Oluştur (Kopyasız Pencereleme).
+    Her seri üzerinde (LOOKBACK + PREDICT_DAYS) boyunda kayan bir görünüm açılır;
+    X ve y, önceden ayrılmış tek bir float32 matrise SADECE BİR KEZ yazılır.
+    Satırlar eski 'for i in range(LOOKBACK, len(data) - PREDICT_DAYS)' döngüsüyle aynıdır.
+
+    Returns:
+        (X, y): (n, LOOKBACK) ve (n, PREDICT_DAYS) float32 matrisler
+    """
+    span = LOOKBACK + PREDICT_DAYS
+    total = sum(window_count(data) for data in series.values())
+    if total == 0: raise ValueError("Veri Yok!")
+
+    X = np.empty((total, LOOKBACK), dtype=np.float32)
+    y = np.empty((total, PREDICT_DAYS), dtype=np.float32)
+
+    row = 0
+    for data in series.values():
+        n = window_count(data)
+        if n == 0: continue
+        windows = sliding_window_view(data, span)[:n]  # Görünüm, kopya değil
+        X[row:row + n] = windows[:, :LOOKBACK]
+        y[row:row + n] = windows[:, LOOKBACK:]
+        row += n
+    return X, y
+
+def get_honest_data(tickers=TICKERS, cache=None, max_workers=DOWNLOAD_WORKERS):
+    """Veriyi indirir, pencereleri kurar ve tepe bellek kullanımını raporlar."""
+    series = download_honest_series(tickers, cache, max_workers)
+    if not series: raise ValueError("Veri Yok!")
+
+    tracemalloc.start()
+    X, y = build_windows(series)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    raw_mb = sum(s.nbytes for s in series.values()) / 1e6
+    print(f"💾 Ham Seriler: {raw_mb:.2f} MB | X+y: {(X.nbytes + y.nbytes) / 1e6:.2f} MB | "
+          f"Pencereleme Tepe Bellek: {peak / 1e6:.2f} MB")
+    return X, y
+
+def train(tickers=TICKERS, cache=None, max_workers=DOWNLOAD_WORKERS):
     print("\n🌲 DÜRÜST RANDOM FOREST EĞİTİMİ...")
     
     # 1. Veriyi Al (Gelecekten arındırılmış)
-    X, y = get_honest_data()
+    X, y = get_honest_data(tickers, cache, max_workers)
     print(f"📊 Toplam Eğitim Senaryosu: {X.shape[0]}")
     
     # 2. Modeli Eğit
@@ -75,8 +181,20 @@ def train():
     
     # 3. Kaydet
     joblib.dump(model, os.path.join(MODEL_DIR, 'universal_rf.pkl'))
+    # Kompakt kopya: Düz düğüm dizileri, bellek eşlemeli açılır (hızlı yükleme, süreçler arası paylaşım)
+    export_forest(model, os.path.join(MODEL_DIR, 'universal_rf_compact'))
     print("✅ EĞİTİM BİTTİ (Ezbersiz Model Hazır)")
-    print(f"📂 Kayıt: {os.path.join(MODEL_DIR, 'universal_rf.pkl')}")
+    print(f"📂 Kayıt: {os.path.join(MODEL_DIR, 'universal_rf.pkl')} (+ universal_rf_compact/)")
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Universal RF eğitimi (zaman duvarlı)")
+    parser.add_argument("--tickers", nargs="+", default=TICKERS)
+    parser.add_argument("--tickers-file", help="Hisse listesi dosyası (binlerce hisse için)")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="Eşzamanlı indirme sayısı")
+    parser.add_argument("--data-dir", help="Barları yfinance yerine bu klasördeki dosyalardan oku")
+    args = parser.parse_args()
+
+    tickers = read_tickers(args.tickers_file) if args.tickers_file else args.tickers
+    cache = data_cache.local_file_cache(args.data_dir) if args.data_dir else None
+    train(tickers, cache, args.workers)
\ No newline at end of file
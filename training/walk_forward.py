@@ -0,0 +1,229 @@
+"""
+Walk-Forward (Kayan Zaman Duvarı) Doğrulaması.
+
+train_universal.py tek bir zaman duvarı (TEST_DAYS = 90) kullanır. Burada duvar
+geçmiş boyunca kaydırılır: Her katmanda (fold) model SADECE duvardan önceki veriyle
+eğitilir ve duvardan sonraki 'test_days' günlük dilimde test edilir.
+
+    |------ eğitim ------|== test 1 ==|
+    |---------- eğitim ----------|== test 2 ==|
+    |--------------- eğitim --------------|== test 3 ==|
+
+- Getiri serileri hisse başına BİR KEZ çekilir (disk önbelleği: neuro_modules/data_cache)
+  ve tüm katmanlarda yeniden kullanılır; katmanlar sadece bu dizilerin dilimlerini alır.
+- Her katmanın RandomForestRegressor'u ayrı bir çekirdekte eğitilir (joblib).
+- Metrikler test_universal.py ile aynıdır: 1. gün tahmininin yön doğruluğu ve
+  "Model pozitifse o günün getirisini al" stratejisinin toplam getirisi.
+
+Kullanım:
+    python training/walk_forward.py --folds 6 --test-days 90
+    python training/walk_forward.py --tickers NVDA AAPL --folds 4 --n-estimators 100 -o wf.csv
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.ensemble import RandomForestRegressor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path: sys.path.insert(0, BASE_DIR)
+
+from neuro_modules import data_cache
+try:
+    from training.train_universal import TICKERS, TRAIN_START, LOOKBACK, PREDICT_DAYS, build_windows
+except ImportError:
+    from train_universal import TICKERS, TRAIN_START, LOOKBACK, PREDICT_DAYS, build_windows
+
+# --- AYARLAR ---
+N_FOLDS = 6
+TEST_DAYS = 90          # Her katmanın test dilimi (takvim günü), train_universal ile aynı
+RF_PARAMS = {'n_estimators': 200, 'max_depth': 20, 'random_state': 42}
+
+
+def load_return_series(tickers=TICKERS, start=TRAIN_START, cache=None):
+    """
+    Hisse başına günlük % değişim serisini (Close) önbellekten bir kez yükler.
+
+    Returns:
+        dict: ticker -> (dates: datetime64[ns] dizisi, returns: float32 dizisi)
+    """
+    cache = cache or data_cache.get_default_cache()
+    series = {}
+    for ticker in tickers:
+        try:
+            df = cache.get(ticker, interval="1d", start=start)
+        except Exception as e:
+            print(f"   ⚠️ Hata {ticker}: {e}")
+            continue
+        close = df['Close'].dropna() if not df.empty else pd.Series(dtype=float)
+        if len(close) < LOOKBACK + PREDICT_DAYS + 1:
+            print(f"   ⚠️ {ticker}: Yetersiz veri, atlandı.")
+            continue
+        # train_universal ile aynı dönüşüm
+        pct = close.pct_change().dropna().replace([np.inf, -np.inf], 0)
+        index = pct.index.tz_localize(None) if pct.index.tz is not None else pct.index
+        series[ticker] = (index.normalize().values.astype('datetime64[ns]'),
+                          np.ascontiguousarray(pct.values, dtype=np.float32))
+        print(f"   ✅ {ticker}: {len(pct)} gün")
+    return series
+
+
+def make_folds(series, n_folds=N_FOLDS, test_days=TEST_DAYS):
+    """
+    Art arda, örtüşmeyen test dilimleri: Son dilim en güncel veriyle biter.
+
+    Returns:
+        list: [(cutoff, test_end), ...] (eskiden yeniye)
+    """
+    last = max(dates[-1] for dates, _ in series.values())
+    end = pd.Timestamp(last) + pd.Timedelta(days=1)
+    step = pd.Timedelta(days=test_days)
+    return [(end - (n_folds - k) * step, end - (n_folds - k - 1) * step) for k in range(n_folds)]
+
+
+def fold_train_set(series, cutoff, max_train_days=None):
+    """Duvardan ÖNCEKİ verilerden eğitim pencereleri (dilimler kopya değil, görünümdür)."""
+    cutoff = np.datetime64(cutoff, 'ns')
+    begin = None if max_train_days is None else cutoff - np.timedelta64(max_train_days, 'D')
+    parts = {}
+    for ticker, (dates, returns) in series.items():
+        stop = np.searchsorted(dates, cutoff)
+        first = 0 if begin is None else np.searchsorted(dates, begin)
+        parts[ticker] = returns[first:stop]
+    return build_windows(parts)
+
+
+def fold_test_set(series, cutoff, test_end):
+    """
+    Test pencereleri: Gerçekleşen gün [cutoff, test_end) aralığında olanlar.
+    Pencere tanımı test_universal ile aynı: X = pct[j : j+60], gerçekleşen = pct[j+60].
+    """
+    cutoff, test_end = np.datetime64(cutoff, 'ns'), np.datetime64(test_end, 'ns')
+    blocks, actuals, owners = [], [], []
+    for ticker, (dates, returns) in series.items():
+        # Gerçekleşen gün indeksi a: LOOKBACK <= a < len - PREDICT_DAYS
+        lo = max(np.searchsorted(dates, cutoff), LOOKBACK)
+        hi = min(np.searchsorted(dates, test_end), len(returns) - PREDICT_DAYS)
+        if hi <= lo: continue
+        blocks.append(sliding_window_view(returns, LOOKBACK)[lo - LOOKBACK:hi - LOOKBACK])
+        actuals.append(returns[lo:hi])
+        owners += [ticker] * (hi - lo)
+    if not blocks:
+        return np.empty((0, LOOKBACK), dtype=np.float32), np.empty(0, dtype=np.float32), []
+    return np.concatenate(blocks), np.concatenate(actuals), owners
+
+
+def run_fold(k, cutoff, test_end, series, rf_params=RF_PARAMS, max_train_days=None):
+    """Tek katman: eğit, test et, metrikleri döndür (işçi süreçte çalışır)."""
+    row = {'fold': k, 'cutoff': pd.Timestamp(cutoff).date(), 'test_end': pd.Timestamp(test_end).date()}
+    X_test, actuals, owners = fold_test_set(series, cutoff, test_end)
+    try:
+        X, y = fold_train_set(series, cutoff, max_train_days)
+    except ValueError:
+        X = y = None
+    row.update({'n_train': 0 if X is None else len(X), 'n_test': len(actuals)})
+    if X is None or len(actuals) == 0:
+        return row, None
+
+    t0 = time.perf_counter()
+    model = RandomForestRegressor(n_jobs=1, **rf_params)
+    model.fit(X, y)
+    row['fit_seconds'] = time.perf_counter() - t0
+
+    pred_day_1 = model.predict(X_test)[:, 0]
+    strategy = np.where(pred_day_1 > 0, actuals, 0)
+    row.update(summarize(pred_day_1, actuals, strategy))
+
+    per_ticker = pd.DataFrame({'ticker': owners, 'pred': pred_day_1, 'actual': actuals, 'strategy': strategy})
+    per_ticker = per_ticker.groupby('ticker').apply(
+        lambda g: pd.Series(summarize(g['pred'].values, g['actual'].values, g['strategy'].values)),
+        include_groups=False).reset_index()
+    per_ticker.insert(0, 'fold', k)
+    return row, per_ticker
+
+
+def summarize(predictions, actuals, strategy):
+    """Yön doğruluğu (%) ve toplam getiriler (test_universal'daki kümülatif toplam gibi)."""
+    strategy_return = float(np.sum(strategy))
+    buy_hold_return = float(np.sum(actuals))
+    return {
+        'directional_accuracy': float(np.mean(np.sign(predictions) == np.sign(actuals)) * 100),
+        'strategy_return': strategy_return,
+        'buy_hold_return': buy_hold_return,
+        'excess_return': strategy_return - buy_hold_return,
+        'exposure': float(np.mean(predictions > 0)),
+    }
+
+
+def walk_forward(series, n_folds=N_FOLDS, test_days=TEST_DAYS, rf_params=RF_PARAMS,
+                 max_train_days=None, n_jobs=-1):
+    """
+    Tüm katmanları paralel çalıştırır.
+
+    Returns:
+        (folds, per_ticker): Katman başına ve (katman, hisse) başına metrik tabloları
+    """
+    from joblib import Parallel, delayed
+
+    folds = make_folds(series, n_folds, test_days)
+    # Seriler işçilere bir kez gider (büyük diziler joblib tarafından bellek eşlenir)
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(run_fold)(k, cutoff, test_end, series, rf_params, max_train_days)
+        for k, (cutoff, test_end) in enumerate(folds))
+    fold_table = pd.DataFrame([row for row, _ in outputs])
+    tickers = [t for _, t in outputs if t is not None]
+    return fold_table, (pd.concat(tickers, ignore_index=True) if tickers else pd.DataFrame())
+
+
+def print_report(folds):
+    print("-" * 90)
+    cols = ['fold', 'cutoff', 'test_end', 'n_train', 'n_test', 'directional_accuracy',
+            'strategy_return', 'buy_hold_return', 'fit_seconds']
+    print(folds[[c for c in cols if c in folds.columns]].round(4).to_string(index=False))
+    print("-" * 90)
+    scored = folds.dropna(subset=['directional_accuracy']) if 'directional_accuracy' in folds else folds.iloc[0:0]
+    if scored.empty:
+        print("🚨 Hiçbir katman test edilemedi.")
+        return
+    acc = scored['directional_accuracy']
+    excess = scored['excess_return']
+    print(f"🎯 Yön Doğruluğu: ort. %{acc.mean():.2f} | std {acc.std(ddof=0):.2f} | "
+          f"min %{acc.min():.2f} | maks %{acc.max():.2f}")
+    print(f"💰 Strateji Getirisi: ort. {scored['strategy_return'].mean():+.4f} | "
+          f"Piyasayı geçen katman: {(excess > 0).sum()}/{len(scored)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Universal RF için walk-forward doğrulaması")
+    parser.add_argument("--tickers", nargs="+", default=TICKERS)
+    parser.add_argument("--start", default=TRAIN_START)
+    parser.add_argument("--folds", type=int, default=N_FOLDS)
+    parser.add_argument("--test-days", type=int, default=TEST_DAYS)
+    parser.add_argument("--max-train-days", type=int, help="Kayan eğitim penceresi (verilmezse genişleyen)")
+    parser.add_argument("--n-estimators", type=int, default=RF_PARAMS['n_estimators'])
+    parser.add_argument("--max-depth", type=int, default=RF_PARAMS['max_depth'])
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--data-dir", help="OHLCV'yi ağ yerine bu klasördeki dosyalardan oku")
+    parser.add_argument("-o", "--output", help="Katman tablosu (.csv / .parquet); hisse tablosu '_tickers' ekiyle")
+    args = parser.parse_args()
+
+    cache = data_cache.local_file_cache(args.data_dir) if args.data_dir else None
+    print(f"📡 Getiri serileri yükleniyor ({len(args.tickers)} hisse)...")
+    series = load_return_series(args.tickers, args.start, cache)
+    if not series: sys.exit("🚨 Veri Yok!")
+
+    rf_params = {**RF_PARAMS, 'n_estimators': args.n_estimators, 'max_depth': args.max_depth}
+    print(f"🌲 {args.folds} katman x {rf_params['n_estimators']} ağaç eğitiliyor (paralel)...")
+    t0 = time.perf_counter()
+    folds, per_ticker = walk_forward(series, args.folds, args.test_days, rf_params, args.max_train_days, args.n_jobs)
+    print(f"⏱️ Toplam: {time.perf_counter() - t0:.1f} sn")
+    print_report(folds)
+
+    if args.output:
+        stem, ext = os.path.splitext(args.output)
+        for table, path in ((folds, args.output), (per_ticker, f"{stem}_tickers{ext}")):
+            table.to_parquet(path, index=False) if ext == '.parquet' else table.to_csv(path, index=False)
+        print(f"📂 Kayıt: {args.output}")